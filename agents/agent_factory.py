@@ -4,13 +4,15 @@ Enhanced with OpenAI integration for intelligent responses.
 """
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 
 from core.openai_integration import OpenAIIntegrationManager, OpenAIAgent
 from agents.personalities import PersonalityManager
 from agents.business_rules import BusinessRules
+from utils import json_fast
 from utils.exceptions import AgentFactoryError
+from utils.time_utils import utcnow_iso
 from config.settings import Settings
 
 class Agent:
@@ -56,6 +58,13 @@ class AgentFactory:
     async def initialize(self) -> None:
         """Initialize the agent factory and OpenAI integration."""
         try:
+            # Blocking SDK calls (Supabase, Redis) run in the default executor; asyncio sizes
+            # it at min(32, cpu + 4) threads, too few for I/O-bound agent fan-out
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(
+                max_workers=self.settings.THREAD_POOL_SIZE,
+                thread_name_prefix="agents-io"
+            ))
+            
             await self.openai_manager.initialize()
             self.logger.info("Agent factory initialized with OpenAI integration")
         except Exception as e:
@@ -111,15 +120,26 @@ class AgentFactory:
         """Get OpenAI agent by ID."""
         return self.openai_agents.get(agent_id)
     
-    async def process_user_message(self, agent_id: str, user_id: str, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Process user message through the specified agent."""
+    async def process_user_message(
+        self,
+        agent_id: str,
+        user_id: str,
+        message: str,
+        context: Optional[Dict[str, Any]] = None,
+        context_json: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Process user message through the specified agent.
+        
+        Pass context_json (the context encoded with json_fast.dumps_str(context, indent=True))
+        when the same context goes to several agents, so it is encoded only once.
+        """
         try:
             openai_agent = self.get_openai_agent(agent_id)
             if not openai_agent:
                 raise AgentFactoryError(f"Agent {agent_id} not found")
             
             # Process message through OpenAI agent
-            response = await openai_agent.process_user_message(user_id, message, context)
+            response = await openai_agent.process_user_message(user_id, message, context, context_json)
             
             return response
             
@@ -130,9 +150,51 @@ class AgentFactory:
                 "agent_id": agent_id,
                 "user_id": user_id,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
     
+    def stream_user_message(
+        self,
+        agent_id: str,
+        user_id: str,
+        message: str,
+        context: Optional[Dict[str, Any]] = None,
+        context_json: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream a response from the specified agent as text chunks."""
+        openai_agent = self.get_openai_agent(agent_id)
+        if not openai_agent:
+            raise AgentFactoryError(f"Agent {agent_id} not found")
+        
+        return openai_agent.stream_user_message(user_id, message, context, context_json)
+    
+    async def process_batch(self, requests: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """Process (agent_id, user_id, message) requests concurrently, returning responses in order."""
+        return await asyncio.gather(*[
+            self.process_user_message(agent_id, user_id, message)
+            for agent_id, user_id, message in requests
+        ])
+    
+    async def process_combined(
+        self,
+        agent_ids: List[str],
+        user_id: str,
+        message: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Send one user message to several agents in parallel, keyed by agent ID.
+        
+        Agents keep independent conversation state, so e.g. the coach and rivalizer
+        can answer the same user in one round trip instead of two. The context is
+        encoded once and shared by every agent.
+        """
+        context_json = json_fast.dumps_str(context, indent=True) if context else None
+        responses = await asyncio.gather(*[
+            self.process_user_message(agent_id, user_id, message, context, context_json)
+            for agent_id in agent_ids
+        ])
+        return dict(zip(agent_ids, responses))
+    
     async def generate_business_analysis(self, agent_id: str, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate business analysis using the specified agent."""
         try:
@@ -148,7 +210,7 @@ class AgentFactory:
                 "success": False,
                 "agent_id": agent_id,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
     
     def list_agents(self) -> List[Dict[str, Any]]:
@@ -191,9 +253,8 @@ class AgentFactory:
     async def initialize_all_agents(self) -> None:
         """Initialize all created agents."""
         try:
-            for agent_id, agent in self.agents.items():
-                await agent.initialize()
-                self.logger.info(f"Initialized agent: {agent_id}")
+            # Agents are independent, so bring them all up concurrently
+            await asyncio.gather(*(agent.initialize() for agent in self.agents.values()))
             
             self.logger.info(f"Initialized {len(self.agents)} agents")
             
@@ -204,9 +265,8 @@ class AgentFactory:
     async def start_all_agents(self) -> None:
         """Start all agents."""
         try:
-            for agent_id, agent in self.agents.items():
-                await agent.start()
-                self.logger.info(f"Started agent: {agent_id}")
+            # Agents are independent, so bring them all up concurrently
+            await asyncio.gather(*(agent.start() for agent in self.agents.values()))
             
             self.logger.info(f"Started {len(self.agents)} agents")
             
@@ -221,6 +281,7 @@ class AgentFactory:
                 await agent.stop()
                 self.logger.info(f"Stopped agent: {agent_id}")
             
+            await self.openai_manager.close()
             self.logger.info(f"Stopped {len(self.agents)} agents")
             
         except Exception as e:
@@ -290,14 +351,14 @@ class AgentFactory:
                 "openai_integration": openai_health,
                 "agents": agent_health,
                 "total_agents": len(self.agents),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
             
         except Exception as e:
             return {
                 "factory_status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
 
 
@@ -2,9 +2,74 @@
 Business rules engine for different agent specializations.
 """
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import re
+from typing import Dict, Any, Optional, List, Pattern, Tuple
 from utils.exceptions import BusinessRuleError
+from utils.time_utils import utcnow_iso
+
+
+def _compile_keywords(keywords: Tuple[str, ...]) -> Pattern[str]:
+    """Compile keywords into one pattern that reports every occurrence in a single scan.
+    
+    The lookahead lets overlapping keywords match; keywords must be lowercase and
+    none may be a prefix of another, since only one alternative is captured per position.
+    """
+    return re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in keywords) + "))")
+
+
+FINANCIAL_KEYWORDS = (
+    "investment", "portfolio", "stocks", "bonds", "retirement",
+    "401k", "ira", "savings", "budget", "debt", "mortgage",
+    "insurance", "tax", "planning", "fund", "dividend"
+)
+
+COACHING_KEYWORDS = (
+    "performance", "training", "improvement", "skill", "practice",
+    "technique", "strategy", "fitness", "stamina", "speed",
+    "accuracy", "consistency", "mental game", "competition"
+)
+
+GAMING_KEYWORDS = (
+    "opponent", "match", "challenge", "compete", "rival", "ranking",
+    "skill level", "tournament", "league", "championship", "victory",
+    "strategy", "tactics", "meta", "gameplay", "esports"
+)
+
+_FINANCIAL_KEYWORDS_RE = _compile_keywords(FINANCIAL_KEYWORDS)
+_COACHING_KEYWORDS_RE = _compile_keywords(COACHING_KEYWORDS)
+_GAMING_KEYWORDS_RE = _compile_keywords(GAMING_KEYWORDS)
+
+
+# Static sample opponents; shared between calls, so callers must not mutate the entries
+_SAMPLE_OPPONENTS: Tuple[Dict[str, Any], ...] = (
+    {
+        "opponent_id": "competitive_strategist_001",
+        "skill_level": "expert",
+        "playstyle": "tactical",
+        "match_quality": 9.1,
+        "learning_value": "high"
+    },
+    {
+        "opponent_id": "skilled_challenger_002",
+        "skill_level": "advanced",
+        "playstyle": "aggressive",
+        "match_quality": 8.7,
+        "learning_value": "medium"
+    },
+    {
+        "opponent_id": "technical_master_003",
+        "skill_level": "expert",
+        "playstyle": "technical",
+        "match_quality": 9.3,
+        "learning_value": "very_high"
+    }
+)
+
+
+def _detect_keywords(pattern: Pattern[str], keywords: Tuple[str, ...], prompt: str) -> List[str]:
+    """Return the keywords found in the prompt, in keyword-list order."""
+    found = {match.group(1) for match in pattern.finditer(prompt.lower())}
+    return [keyword for keyword in keywords if keyword in found]
 
 class BusinessRules:
     """Manager for business rules across different domains."""
@@ -63,7 +128,7 @@ class BusinessRuleEngine:
             # Add processing metadata
             result["processing_metadata"] = {
                 "business_rule_type": business_rule_type,
-                "processed_at": datetime.utcnow().isoformat(),
+                "processed_at": utcnow_iso(),
                 "user_id": user_id
             }
             
@@ -93,13 +158,7 @@ class BusinessRuleEngine:
             }
             
             # Analyze prompt for financial keywords
-            financial_keywords = [
-                "investment", "portfolio", "stocks", "bonds", "retirement",
-                "401k", "ira", "savings", "budget", "debt", "mortgage",
-                "insurance", "tax", "planning", "fund", "dividend"
-            ]
-            
-            detected_keywords = [kw for kw in financial_keywords if kw.lower() in prompt.lower()]
+            detected_keywords = _detect_keywords(_FINANCIAL_KEYWORDS_RE, FINANCIAL_KEYWORDS, prompt)
             result["detected_topics"] = detected_keywords
             
             # Generate specific recommendations based on detected topics
@@ -248,7 +307,9 @@ class BusinessRuleEngine:
             
             # Determine if escalation is needed
             escalation_keywords = ["critical", "urgent", "production", "down", "crashed", "security"]
-            if any(keyword in prompt.lower() for keyword in escalation_keywords):
+            prompt_lower = prompt.lower()
+            
+            if any(keyword in prompt_lower for keyword in escalation_keywords):
                 result["escalation_needed"] = True
                 result["escalation_reason"] = "Critical issue detected requiring immediate attention"
             
@@ -312,9 +373,11 @@ class BusinessRuleEngine:
         high_risk_keywords = ["day trading", "cryptocurrency", "leverage", "margin", "options"]
         medium_risk_keywords = ["stocks", "mutual funds", "etf", "investment"]
         
-        if any(keyword in prompt.lower() for keyword in high_risk_keywords):
+        prompt_lower = prompt.lower()
+        
+        if any(keyword in prompt_lower for keyword in high_risk_keywords):
             return "high"
-        elif any(keyword in prompt.lower() for keyword in medium_risk_keywords):
+        elif any(keyword in prompt_lower for keyword in medium_risk_keywords):
             return "medium"
         else:
             return "low"
@@ -333,7 +396,7 @@ class BusinessRuleEngine:
         return {
             "market_status": "normal_trading",
             "volatility_level": "moderate",
-            "last_updated": datetime.utcnow().isoformat()
+            "last_updated": utcnow_iso()
         }
     
     def _analyze_user_financial_profile(self, prompt: str, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -372,8 +435,10 @@ class BusinessRuleEngine:
             "script": ["script", "video", "presentation", "speech"]
         }
         
+        prompt_lower = prompt.lower()
+        
         for content_type, keywords in content_keywords.items():
-            if any(keyword in prompt.lower() for keyword in keywords):
+            if any(keyword in prompt_lower for keyword in keywords):
                 return content_type
         
         return "general_content"
@@ -387,8 +452,10 @@ class BusinessRuleEngine:
             "technical": ["developer", "technical", "engineer", "IT"]
         }
         
+        prompt_lower = prompt.lower()
+        
         for audience, keywords in audience_keywords.items():
-            if any(keyword in prompt.lower() for keyword in keywords):
+            if any(keyword in prompt_lower for keyword in keywords):
                 return audience
         
         return "general_audience"
@@ -402,8 +469,10 @@ class BusinessRuleEngine:
             "educational": ["explain", "teach", "inform", "educate"]
         }
         
+        prompt_lower = prompt.lower()
+        
         for tone, keywords in tone_keywords.items():
-            if any(keyword in prompt.lower() for keyword in keywords):
+            if any(keyword in prompt_lower for keyword in keywords):
                 return tone
         
         return "neutral"
@@ -457,8 +526,10 @@ class BusinessRuleEngine:
             "mental_preparation": ["mental", "mindset", "confidence"]
         }
         
+        prompt_lower = prompt.lower()
+        
         for focus_area, keywords in focus_keywords.items():
-            if any(keyword in prompt.lower() for keyword in keywords):
+            if any(keyword in prompt_lower for keyword in keywords):
                 return focus_area
         
         return "general_improvement"
@@ -514,29 +585,7 @@ class BusinessRuleEngine:
     
     def _generate_opponent_suggestions(self) -> List[Dict[str, Any]]:
         """Generate sample opponent suggestions."""
-        return [
-            {
-                "opponent_id": "competitive_strategist_001",
-                "skill_level": "expert",
-                "playstyle": "tactical",
-                "match_quality": 9.1,
-                "learning_value": "high"
-            },
-            {
-                "opponent_id": "skilled_challenger_002", 
-                "skill_level": "advanced",
-                "playstyle": "aggressive",
-                "match_quality": 8.7,
-                "learning_value": "medium"
-            },
-            {
-                "opponent_id": "technical_master_003",
-                "skill_level": "expert",
-                "playstyle": "technical",
-                "match_quality": 9.3,
-                "learning_value": "very_high"
-            }
-        ]
+        return list(_SAMPLE_OPPONENTS)
     
     def _classify_technical_issue(self, prompt: str) -> str:
         """Classify the type of technical issue."""
@@ -547,8 +596,10 @@ class BusinessRuleEngine:
             "performance": ["slow", "performance", "speed", "lag", "freezing", "hanging"]
         }
         
+        prompt_lower = prompt.lower()
+        
         for issue_type, keywords in issue_keywords.items():
-            if any(keyword in prompt.lower() for keyword in keywords):
+            if any(keyword in prompt_lower for keyword in keywords):
                 return issue_type
         
         return "general"
@@ -573,13 +624,7 @@ class BusinessRuleEngine:
             }
             
             # Analyze coaching keywords
-            coaching_keywords = [
-                "performance", "training", "improvement", "skill", "practice",
-                "technique", "strategy", "fitness", "stamina", "speed",
-                "accuracy", "consistency", "mental game", "competition"
-            ]
-            
-            detected_keywords = [kw for kw in coaching_keywords if kw.lower() in prompt.lower()]
+            detected_keywords = _detect_keywords(_COACHING_KEYWORDS_RE, COACHING_KEYWORDS, prompt)
             result["detected_topics"] = detected_keywords
             
             # Generate specific coaching recommendations
@@ -640,13 +685,7 @@ class BusinessRuleEngine:
             }
             
             # Analyze competitive gaming keywords
-            gaming_keywords = [
-                "opponent", "match", "challenge", "compete", "rival", "ranking",
-                "skill level", "tournament", "league", "championship", "victory",
-                "strategy", "tactics", "meta", "gameplay", "esports"
-            ]
-            
-            detected_keywords = [kw for kw in gaming_keywords if kw.lower() in prompt.lower()]
+            detected_keywords = _detect_keywords(_GAMING_KEYWORDS_RE, GAMING_KEYWORDS, prompt)
             result["detected_topics"] = detected_keywords
             
             # Generate competitive insights based on detected topics
@@ -699,9 +738,11 @@ class BusinessRuleEngine:
         urgent_keywords = ["critical", "urgent", "down", "crashed", "not working", "broken"]
         medium_keywords = ["slow", "issue", "problem", "error"]
         
-        if any(keyword in prompt.lower() for keyword in urgent_keywords):
+        prompt_lower = prompt.lower()
+        
+        if any(keyword in prompt_lower for keyword in urgent_keywords):
             return "high"
-        elif any(keyword in prompt.lower() for keyword in medium_keywords):
+        elif any(keyword in prompt_lower for keyword in medium_keywords):
             return "medium"
         else:
             return "low"
@@ -730,7 +771,9 @@ class BusinessRuleEngine:
         
         complex_indicators = ["multiple", "various", "complex", "detailed", "comprehensive"]
         
-        if word_count > 50 or any(indicator in prompt.lower() for indicator in complex_indicators):
+        prompt_lower = prompt.lower()
+        
+        if word_count > 50 or any(indicator in prompt_lower for indicator in complex_indicators):
             return "high"
         elif word_count > 20:
             return "medium"
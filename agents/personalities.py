@@ -1,145 +1,24 @@
 """
 Agent personality management and templates.
 """
+import functools
 import logging
-from typing import Dict, Any, List
+import re
+import textwrap
+from sys import intern
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, NamedTuple, Tuple
 from langchain.prompts import PromptTemplate
 
-class PersonalityManager:
-    """Manager for agent personalities and response templates."""
-    
-    def __init__(self):
-        self.logger = logging.getLogger("personality_manager")
-        
-        # Define personality traits and templates
-        self.personalities = {
-            "analytical": {
-                "name": "analytical",
-                "traits": [
-                    "analytical",
-                    "data-driven",
-                    "logical-reasoning",
-                    "systematic-approach",
-                    "evidence-based-conclusions",
-                    "statistical-analysis-focus"
-                ],
-                "processing_notification": "I'm analyzing the available data and information to provide you with a comprehensive, evidence-based response. Please allow me a moment to process this thoroughly.",
-                "response_template": self._get_analytical_template(),
-                "tone": "professional",
-                "style": "structured",
-                "response_style": "analytical"
-            },
-            "creative": {
-                "name": "creative",
-                "traits": [
-                    "innovative",
-                    "imaginative",
-                    "creative-thinking",
-                    "artistic-expression",
-                    "out-of-the-box-ideas",
-                    "inspirational-approach"
-                ],
-                "processing_notification": "What an interesting question! Let me tap into my creative thinking and explore some innovative approaches to help you. I'm gathering inspiration and crafting something special for you.",
-                "response_template": self._get_creative_template(),
-                "tone": "enthusiastic",
-                "style": "expressive",
-                "response_style": "creative"
-            },
-            "helpful": {
-                "name": "helpful",
-                "traits": [
-                    "service-oriented",
-                    "empathetic-responses",
-                    "problem-solving-focus",
-                    "user-centric-approach",
-                    "supportive-attitude"
-                ],
-                "processing_notification": "I'm here to help! I'm carefully reviewing your request and gathering all the information I need to provide you with the most helpful response possible. Thank you for your patience.",
-                "response_template": self._get_helpful_template(),
-                "tone": "warm",
-                "style": "conversational",
-                "response_style": "helpful"
-            },
-            "professional": {
-                "name": "professional",
-                "traits": [
-                    "business-focused",
-                    "efficiency-oriented",
-                    "formal-communication",
-                    "goal-driven",
-                    "results-oriented"
-                ],
-                "processing_notification": "Thank you for your inquiry. I am currently processing your request and will provide you with a comprehensive professional response. Please standby.",
-                "response_template": self._get_professional_template(),
-                "tone": "formal",
-                "style": "structured",
-                "response_style": "professional"
-            },
-            "coaching": {
-                "name": "coaching",
-                "traits": [
-                    "performance-focused",
-                    "analytical-coaching",
-                    "skill-development",
-                    "motivational-guidance",
-                    "strategic-thinking",
-                    "improvement-oriented"
-                ],
-                "processing_notification": "I'm analyzing your performance data and developing personalized coaching strategies. Let me provide you with targeted advice to enhance your competitive gaming skills.",
-                "response_template": self._get_coaching_template(),
-                "tone": "motivational",
-                "style": "instructional",
-                "response_style": "coaching"
-            },
-            "competitive": {
-                "name": "competitive",
-                "traits": [
-                    "competitive-spirit",
-                    "strategic-matchmaking",
-                    "opponent-analysis",
-                    "tactical-insights",
-                    "victory-focused",
-                    "competition-coordination"
-                ],
-                "processing_notification": "I'm scanning the competitive landscape to find you the perfect opponents and strategic matchups. Preparing tactical analysis for maximum competitive advantage.",
-                "response_template": self._get_competitive_template(),
-                "tone": "energetic",
-                "style": "strategic",
-                "response_style": "competitive"
-            }
-        }
-    
-    def get_personality(self, personality: str) -> Dict[str, Any]:
-        """Get personality configuration and traits."""
-        if personality not in self.personalities:
-            raise ValueError(f"Unknown personality type: {personality}")
-        return self.personalities[personality]
-        
-    def get_personality_traits(self, personality: str) -> Dict[str, Any]:
-        """Get personality traits and characteristics."""
-        return self.personalities.get(personality, self.personalities["helpful"])
-        
-    def list_personalities(self) -> list:
-        """List all available personalities."""
-        return list(self.personalities.keys())
-        
-    def get_available_personalities(self) -> List[str]:
-        """Get list of available personality types."""
-        return list(self.personalities.keys())
-    
-    def get_processing_notification(self, personality: str) -> str:
-        """Get personality-specific processing notification."""
-        personality_data = self.personalities.get(personality, self.personalities["helpful"])
-        return personality_data["processing_notification"]
-    
-    def get_response_template(self, personality: str) -> PromptTemplate:
-        """Get personality-specific response template."""
-        personality_data = self.personalities.get(personality, self.personalities["helpful"])
-        return personality_data["response_template"]
-    
-    def _get_analytical_template(self) -> PromptTemplate:
-        """Analytical personality response template."""
-        template = """
+_LOG = logging.getLogger("personality_manager")
+
+# Input variables shared by every response template
+_IVARS = ("user_prompt", "rag_results", "user_history", "business_result")
+_PLACEHOLDER_RE = re.compile(r"\{(%s)\}" % "|".join(_IVARS))
+
+# Response template text by personality name, dedented once so prompts carry no source indentation
+_TEMPLATE_STRINGS: Dict[str, str] = {
+    "analytical": textwrap.dedent("""
         Based on my analysis of the available data and information, here is my response to your query:
 
         USER REQUEST: {user_prompt}
@@ -166,16 +45,8 @@ class PersonalityManager:
         CONFIDENCE LEVEL: [High/Medium/Low] based on data quality and sample size.
         
         Would you like me to elaborate on any specific aspect of this analysis or provide additional statistical breakdowns?
-        """
-        
-        return PromptTemplate(
-            template=template,
-            input_variables=["user_prompt", "rag_results", "user_history", "business_result"]
-        )
-    
-    def _get_creative_template(self) -> PromptTemplate:
-        """Creative personality response template."""
-        template = """
+        """).strip(),
+    "creative": textwrap.dedent("""
         🎨 What a fascinating challenge! Let me weave together some creative insights for you:
 
         YOUR CREATIVE BRIEF: {user_prompt}
@@ -204,16 +75,8 @@ class PersonalityManager:
         [Provide motivational guidance and creative suggestions for moving forward]
 
         I hope this sparks some exciting ideas for you! What creative direction would you like to explore further? 🚀
-        """
-        
-        return PromptTemplate(
-            template=template,
-            input_variables=["user_prompt", "rag_results", "user_history", "business_result"]
-        )
-    
-    def _get_helpful_template(self) -> PromptTemplate:
-        """Helpful personality response template."""
-        template = """
+        """).strip(),
+    "helpful": textwrap.dedent("""
         Hi there! I'm so glad you reached out, and I'm here to help you with: {user_prompt}
 
         I've gathered some helpful information for you:
@@ -240,16 +103,8 @@ class PersonalityManager:
         If you need any clarification on these points, or if there's anything else I can help you with, please don't hesitate to ask! I'm here to support you every step of the way.
 
         Is there anything specific you'd like me to explain further or help you with next?
-        """
-        
-        return PromptTemplate(
-            template=template,
-            input_variables=["user_prompt", "rag_results", "user_history", "business_result"]
-        )
-    
-    def _get_professional_template(self) -> PromptTemplate:
-        """Professional personality response template."""
-        template = """
+        """).strip(),
+    "professional": textwrap.dedent("""
         Subject: Response to Your Inquiry
 
         Dear User,
@@ -291,16 +146,8 @@ class PersonalityManager:
 
         Best regards,
         Professional AI Assistant
-        """
-        
-        return PromptTemplate(
-            template=template,
-            input_variables=["user_prompt", "rag_results", "user_history", "business_result"]
-        )
-    
-    def _get_coaching_template(self) -> PromptTemplate:
-        """Coaching personality response template."""
-        template = """
+        """).strip(),
+    "coaching": textwrap.dedent("""
         🏆 PERFORMANCE COACHING SESSION
         
         PLAYER ANALYSIS REQUEST: {user_prompt}
@@ -335,16 +182,8 @@ class PersonalityManager:
         
         Keep pushing your limits! Every champion was once a beginner who refused to give up. 
         What specific area would you like to focus on first?
-        """
-        
-        return PromptTemplate(
-            template=template,
-            input_variables=["user_prompt", "rag_results", "user_history", "business_result"]
-        )
-    
-    def _get_competitive_template(self) -> PromptTemplate:
-        """Competitive personality response template."""
-        template = """
+        """).strip(),
+    "competitive": textwrap.dedent("""
         ⚔️ COMPETITIVE MATCHMAKING ANALYSIS
         
         MATCHMAKING REQUEST: {user_prompt}
@@ -380,9 +219,282 @@ class PersonalityManager:
         
         The arena awaits! Which opponent catches your competitive spirit? 
         Ready to prove your dominance? 🚀
+        """).strip()
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_prompt_template(name: str) -> PromptTemplate:
+    """Parse a personality's PromptTemplate on first use; later calls share the instance."""
+    return PromptTemplate(
+        template=_TEMPLATE_STRINGS[name],
+        input_variables=list(_IVARS)
+    )
+
+# Personality traits and templates, shared by every PersonalityManager
+_PERSONALITY_DEFINITIONS: Dict[str, Dict[str, Any]] = {
+    "analytical": {
+        "name": "analytical",
+        "traits": [
+            "analytical",
+            "data-driven",
+            "logical-reasoning",
+            "systematic-approach",
+            "evidence-based-conclusions",
+            "statistical-analysis-focus"
+        ],
+        "processing_notification": "I'm analyzing the available data and information to provide you with a comprehensive, evidence-based response. Please allow me a moment to process this thoroughly.",
+        "tone": "professional",
+        "style": "structured",
+        "response_style": "analytical"
+    },
+    "creative": {
+        "name": "creative",
+        "traits": [
+            "innovative",
+            "imaginative",
+            "creative-thinking",
+            "artistic-expression",
+            "out-of-the-box-ideas",
+            "inspirational-approach"
+        ],
+        "processing_notification": "What an interesting question! Let me tap into my creative thinking and explore some innovative approaches to help you. I'm gathering inspiration and crafting something special for you.",
+        "tone": "enthusiastic",
+        "style": "expressive",
+        "response_style": "creative"
+    },
+    "helpful": {
+        "name": "helpful",
+        "traits": [
+            "service-oriented",
+            "empathetic-responses",
+            "problem-solving-focus",
+            "user-centric-approach",
+            "supportive-attitude"
+        ],
+        "processing_notification": "I'm here to help! I'm carefully reviewing your request and gathering all the information I need to provide you with the most helpful response possible. Thank you for your patience.",
+        "tone": "warm",
+        "style": "conversational",
+        "response_style": "helpful"
+    },
+    "professional": {
+        "name": "professional",
+        "traits": [
+            "business-focused",
+            "efficiency-oriented",
+            "formal-communication",
+            "goal-driven",
+            "results-oriented"
+        ],
+        "processing_notification": "Thank you for your inquiry. I am currently processing your request and will provide you with a comprehensive professional response. Please standby.",
+        "tone": "formal",
+        "style": "structured",
+        "response_style": "professional"
+    },
+    "coaching": {
+        "name": "coaching",
+        "traits": [
+            "performance-focused",
+            "analytical-coaching",
+            "skill-development",
+            "motivational-guidance",
+            "strategic-thinking",
+            "improvement-oriented"
+        ],
+        "processing_notification": "I'm analyzing your performance data and developing personalized coaching strategies. Let me provide you with targeted advice to enhance your competitive gaming skills.",
+        "tone": "motivational",
+        "style": "instructional",
+        "response_style": "coaching"
+    },
+    "competitive": {
+        "name": "competitive",
+        "traits": [
+            "competitive-spirit",
+            "strategic-matchmaking",
+            "opponent-analysis",
+            "tactical-insights",
+            "victory-focused",
+            "competition-coordination"
+        ],
+        "processing_notification": "I'm scanning the competitive landscape to find you the perfect opponents and strategic matchups. Preparing tactical analysis for maximum competitive advantage.",
+        "tone": "energetic",
+        "style": "strategic",
+        "response_style": "competitive"
+    }
+}
+
+
+class Personality(NamedTuple):
+    """Read-only personality record; fields are tuple slots rather than per-entry dict keys."""
+    
+    name: str
+    traits: Tuple[str, ...]
+    processing_notification: str
+    tone: str
+    style: str
+    response_style: str
+
+
+def _make_record(data: Dict[str, Any]) -> Personality:
+    """Build a record, interning the descriptor strings shared across personalities."""
+    return Personality(
+        name=data["name"],
+        traits=tuple(intern(trait) for trait in data["traits"]),
+        processing_notification=data["processing_notification"],
+        tone=intern(data["tone"]),
+        style=intern(data["style"]),
+        response_style=intern(data["response_style"])
+    )
+
+
+# Read-only registry so one copy can be shared by every manager
+_REGISTRY: Mapping[str, Personality] = MappingProxyType({
+    name: _make_record(data) for name, data in _PERSONALITY_DEFINITIONS.items()
+})
+
+# Dict-shaped views for callers using personality["traits"] / .get(); the PromptTemplate is attached on first access
+_PERSONALITIES: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    name: {**record._asdict(), "response_template": None} for name, record in _REGISTRY.items()
+})
+
+
+class _FastTemplate:
+    """Precompiled-substitution renderer for the fixed-shape personality templates.
+    
+    Exposes the template/input_variables/format() subset of PromptTemplate that
+    callers use, without LangChain's per-call validation. Only the known input
+    placeholders are substituted in a single regex pass, so stray braces never
+    reach a format-spec parser.
+    """
+    
+    __slots__ = ("template", "input_variables")
+    
+    def __init__(self, template: str):
+        self.template = template
+        self.input_variables = list(_IVARS)
+    
+    def format(self, **kwargs: Any) -> str:
+        """Render the template; extra keyword arguments are ignored and missing ones left in place."""
+        return _PLACEHOLDER_RE.sub(
+            lambda match: str(kwargs[match.group(1)]) if match.group(1) in kwargs else match.group(0),
+            self.template
+        )
+
+
+_FAST_TEMPLATES: Dict[str, _FastTemplate] = {
+    name: _FastTemplate(template) for name, template in _TEMPLATE_STRINGS.items()
+}
+
+def _split_template(template: str) -> Tuple[str, str]:
+    """Split a template into its placeholder-free paragraphs and the paragraphs that take inputs.
+    
+    The static half can be sent as a system message, which providers cache as a
+    prompt prefix; only the dynamic half changes between requests.
+    """
+    static_paragraphs, dynamic_paragraphs = [], []
+    for paragraph in template.split("\n\n"):
+        if _PLACEHOLDER_RE.search(paragraph):
+            dynamic_paragraphs.append(paragraph)
+        else:
+            static_paragraphs.append(paragraph)
+    return "\n\n".join(static_paragraphs), "\n\n".join(dynamic_paragraphs)
+
+
+# (static system prefix, dynamic user template) per personality
+_SPLIT_TEMPLATES: Dict[str, Tuple[str, str]] = {
+    name: _split_template(template) for name, template in _TEMPLATE_STRINGS.items()
+}
+
+# Notifications are fixed strings, so encode them once for direct HTTP/WebSocket writes
+_NOTIFICATION_BYTES: Dict[str, bytes] = {
+    name: record.processing_notification.encode("utf-8") for name, record in _REGISTRY.items()
+}
+
+
+class PersonalityManager:
+    """Manager for agent personalities and response templates."""
+    
+    __slots__ = (
+        "personalities",
+        "_default_personality",
+        "_default_record",
+        "_default_notification_bytes",
+        "_default_fast_template",
+        "_default_split_template"
+    )
+    
+    logger = _LOG
+    
+    def __init__(self):
+        # Personality definitions are built once at import and shared
+        self.personalities = _PERSONALITIES
+        
+        # Fallbacks for unknown personality types, resolved once instead of per call
+        self._default_personality = self.personalities["helpful"]
+        self._default_record = _REGISTRY["helpful"]
+        self._default_notification_bytes = _NOTIFICATION_BYTES["helpful"]
+        self._default_fast_template = _FAST_TEMPLATES["helpful"]
+        self._default_split_template = _SPLIT_TEMPLATES["helpful"]
+    
+    def get_personality(self, personality: str) -> Dict[str, Any]:
+        """Get personality configuration and traits."""
+        if personality not in self.personalities:
+            raise ValueError(f"Unknown personality type: {personality}")
+        return self._with_template(self.personalities[personality])
+        
+    def get_personality_record(self, personality: str) -> Personality:
+        """Get the compact personality record for attribute access (record.tone, record.traits)."""
+        if personality not in _REGISTRY:
+            raise ValueError(f"Unknown personality type: {personality}")
+        return _REGISTRY[personality]
+        
+    def get_personality_traits(self, personality: str) -> Dict[str, Any]:
+        """Get personality traits and characteristics."""
+        return self._with_template(self.personalities.get(personality, self._default_personality))
+        
+    def list_personalities(self) -> list:
+        """List all available personalities."""
+        return list(self.personalities.keys())
+        
+    def get_available_personalities(self) -> List[str]:
+        """Get list of available personality types."""
+        return list(self.personalities.keys())
+    
+    def get_processing_notification(self, personality: str) -> str:
+        """Get personality-specific processing notification."""
+        return _REGISTRY.get(personality, self._default_record).processing_notification
+    
+    def get_processing_notification_bytes(self, personality: str) -> bytes:
+        """Get personality-specific processing notification, UTF-8 encoded."""
+        return _NOTIFICATION_BYTES.get(personality, self._default_notification_bytes)
+    
+    def get_response_template(self, personality: str) -> PromptTemplate:
+        """Get personality-specific response template."""
+        personality_data = self.personalities.get(personality, self._default_personality)
+        return self._with_template(personality_data)["response_template"]
+    
+    def get_system_prompt(self, personality: str) -> str:
+        """Get the static, placeholder-free part of a personality's response template.
+        
+        Send it as its own system message ahead of get_user_template() so the
+        provider can cache it as a shared prompt prefix across requests.
         """
+        return _SPLIT_TEMPLATES.get(personality, self._default_split_template)[0]
+    
+    def get_user_template(self, personality: str) -> str:
+        """Get the part of a personality's response template that takes the request inputs."""
+        return _SPLIT_TEMPLATES.get(personality, self._default_split_template)[1]
+    
+    def _with_template(self, personality_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach the personality's PromptTemplate on first access."""
+        if personality_data["response_template"] is None:
+            personality_data["response_template"] = _get_prompt_template(personality_data["name"])
+        return personality_data
+    
+    def get_response_template_fast(self, personality: str) -> _FastTemplate:
+        """Get personality-specific response template for plain formatting.
         
-        return PromptTemplate(
-            template=template,
-            input_variables=["user_prompt", "rag_results", "user_history", "business_result"]
-        )
+        Use when only format() is needed; get_response_template returns the
+        LangChain PromptTemplate for Runnable composition.
+        """
+        return _FAST_TEMPLATES.get(personality, self._default_fast_template)
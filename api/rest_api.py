@@ -2,21 +2,30 @@
 FastAPI REST API for agent system management and communication.
 """
 import asyncio
-import uuid
+import logging
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends
+from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 
-from core.message_broker import RabbitMQBroker, Message
+from core.message_broker import RabbitMQBroker, AsyncBatchPublisher, Message
 from core.session_manager import RedisSessionManager, UserSession
-from core.websocket_server import WebSocketManager
+from core.response_stream import RedisResponseStream
+from core.websocket_server import WebSocketManager, MISSING_USER_ID_FRAME
 from agents.agent_factory import AgentFactory
 from config.settings import Settings
 from utils.logger import setup_logger
+from utils.cache import TTLCache
+from utils import json_fast
+from utils.json_fast import FastJSONResponse
+from utils.exceptions import MessageBrokerError
+from utils.ids import uuid4_str
+from utils.server_options import GZIP_OPTIONS
+from utils.time_utils import utcnow_iso
 
 
 # Pydantic models for API
@@ -60,15 +69,54 @@ class AgentStatusResponse(BaseModel):
 
 # Global components
 message_broker: RabbitMQBroker = None
+publisher: AsyncBatchPublisher = None
 session_manager: RedisSessionManager = None
+response_stream: RedisResponseStream = None
 websocket_manager: WebSocketManager = None
 agents: Dict[str, Any] = {}
 
+logger = logging.getLogger("rest_api")
+
+# Response stream reads back off from FORWARD_RETRY_DELAY seconds, doubling up to FORWARD_RETRY_MAX_DELAY
+FORWARD_RETRY_DELAY = 0.5
+FORWARD_RETRY_MAX_DELAY = 10.0
+
+# User prompts are handed from the broker callback to a fixed pool of worker coroutines
+prompt_queue: asyncio.Queue = None
+prompt_workers: List[asyncio.Task] = []
+
+# Rendered JSON for hot GET endpoints, keyed on each session's last_activity so updates miss the cache
+rendered_cache = TTLCache(maxsize=4096, ttl=2.0)
+
+
+def render_session(session: UserSession) -> bytes:
+    """Render a session as SessionResponse JSON, reusing bytes until it changes."""
+    cache_key = ("session", session.session_id, session.last_activity)
+    body = rendered_cache.get(cache_key)
+    if body is None:
+        body = json_fast.dumps({
+            "session_id": session.session_id,
+            "user_id": session.user_id,
+            "agent_id": session.agent_id,
+            "created_at": session.created_at.isoformat(),
+            "last_activity": session.last_activity.isoformat(),
+            "is_active": session.is_active,
+            "message_count": len(session.message_history)
+        })
+        rendered_cache.set(cache_key, body)
+    return body
+
+
+def json_response(body: bytes) -> Response:
+    """Return pre-rendered JSON without re-validating it through the response model."""
+    return Response(content=body, media_type="application/json")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
-    global message_broker, session_manager, websocket_manager, agents
+    global message_broker, publisher, session_manager, response_stream, websocket_manager, agents
+    global prompt_queue, prompt_workers
     
     # Setup logging
     setup_logger()
@@ -79,11 +127,21 @@ async def lifespan(app: FastAPI):
     # Initialize components
     message_broker = RabbitMQBroker(settings.RABBITMQ_URL)
     session_manager = RedisSessionManager(settings.REDIS_URL)
+    response_stream = RedisResponseStream(settings.REDIS_URL)
     websocket_manager = WebSocketManager(message_broker, session_manager)
     
     # Initialize message broker and session manager
     await message_broker.initialize()
     await session_manager.initialize()
+    await response_stream.initialize()
+    
+    # Coalesce best-effort telemetry publishes into batches
+    publisher = AsyncBatchPublisher(
+        message_broker,
+        max_batch_size=settings.PUBLISH_BATCH_SIZE,
+        flush_interval=settings.PUBLISH_FLUSH_INTERVAL_MS / 1000
+    )
+    publisher.start()
     
     # Create agents
     agent_configs = {
@@ -105,21 +163,32 @@ async def lifespan(app: FastAPI):
         agent = await AgentFactory.create_agent(agent_id, config)
         agents[agent_id] = agent
     
-    # Start message consumers
+    # Start prompt workers, then message consumers
+    prompt_queue = asyncio.Queue(maxsize=1024)
+    prompt_workers = [
+        asyncio.create_task(prompt_worker())
+        for _ in range(settings.MAX_CONCURRENT_REQUESTS)
+    ]
     start_message_consumers()
     
     yield
     
     # Cleanup
+    for worker in prompt_workers:
+        worker.cancel()
+    await asyncio.gather(*prompt_workers, return_exceptions=True)
+    await publisher.close()
     message_broker.close()
     await session_manager.close()
+    await response_stream.close()
 
 
 def start_message_consumers():
     """Start RabbitMQ message consumers."""
     def handle_user_prompt(message: Message):
         """Handle user prompt from queue."""
-        asyncio.create_task(process_user_prompt(message))
+        # Raises QueueFull when workers are saturated, so the broker nacks and requeues the prompt
+        prompt_queue.put_nowait(message)
     
     def handle_agent_response(message: Message):
         """Handle agent response from queue."""
@@ -129,11 +198,22 @@ def start_message_consumers():
     message_broker.consume_agent_responses(handle_agent_response)
 
 
+async def prompt_worker():
+    """Process queued user prompts one at a time."""
+    while True:
+        message = await prompt_queue.get()
+        try:
+            await process_user_prompt(message)
+        finally:
+            prompt_queue.task_done()
+
+
 async def process_user_prompt(message: Message):
     """Process user prompt through agent."""
     try:
-        agent = agents.get(message.agent_id)
-        if not agent:
+        try:
+            agent = agents[message.agent_id]
+        except KeyError:
             raise HTTPException(status_code=404, detail=f"Agent {message.agent_id} not found")
         
         # Process through agent workflow
@@ -146,7 +226,7 @@ async def process_user_prompt(message: Message):
         
         # Create response message
         response_message = Message(
-            id=str(uuid.uuid4()),
+            id=uuid4_str(),
             user_id=message.user_id,
             agent_id=message.agent_id,
             content=response["content"],
@@ -156,11 +236,11 @@ async def process_user_prompt(message: Message):
             metadata=response.get("metadata", {})
         )
         
-        # Publish response
+        # Publish response for session history
         message_broker.publish_agent_response(response_message)
         
-        # Send via WebSocket if connected
-        await websocket_manager._send_to_user(message.user_id, {
+        # Deliver over the user's response stream; whichever worker holds their WebSocket forwards it
+        await response_stream.publish(message.user_id, response_message.id, {
             "type": "agent_response",
             "message_id": response_message.id,
             "agent_id": message.agent_id,
@@ -172,7 +252,7 @@ async def process_user_prompt(message: Message):
     except Exception as e:
         # Handle error
         error_message = Message(
-            id=str(uuid.uuid4()),
+            id=uuid4_str(),
             user_id=message.user_id,
             agent_id=message.agent_id,
             content=f"Error processing prompt: {str(e)}",
@@ -182,7 +262,7 @@ async def process_user_prompt(message: Message):
             metadata={"error": True}
         )
         
-        message_broker.publish_agent_response(error_message)
+        await publisher.enqueue_telemetry(error_message)
 
 
 async def process_agent_response(message: Message):
@@ -205,7 +285,8 @@ app = FastAPI(
     title="AI Agents System API",
     description="REST API for managing AI agents and real-time communication",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -217,6 +298,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(GZipMiddleware, **GZIP_OPTIONS)
+
 
 # API Routes
 @app.get("/health")
@@ -224,7 +307,7 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utcnow_iso(),
         "components": {
             "message_broker": "connected" if message_broker else "disconnected",
             "session_manager": "connected" if session_manager else "disconnected",
@@ -236,21 +319,28 @@ async def health_check():
 @app.get("/agents", response_model=List[AgentStatusResponse])
 async def list_agents():
     """List all available agents."""
+    # Session counts may lag by up to the cache TTL
+    body = rendered_cache.get(("agents",))
+    if body is not None:
+        return json_response(body)
+    
     agent_list = []
     
     for agent_id, agent in agents.items():
-        # Get active sessions for this agent
-        active_sessions = await session_manager.get_agent_sessions(agent_id)
+        # Count active sessions for this agent
+        active_sessions = await session_manager.get_agent_session_count(agent_id)
         
-        agent_list.append(AgentStatusResponse(
-            agent_id=agent_id,
-            personality=agent.personality,
-            business_rules=agent.business_rules,
-            status="active",
-            active_sessions=len(active_sessions)
-        ))
+        agent_list.append({
+            "agent_id": agent_id,
+            "personality": agent.personality,
+            "business_rules": agent.business_rules,
+            "status": "active",
+            "active_sessions": active_sessions
+        })
     
-    return agent_list
+    body = json_fast.dumps(agent_list)
+    rendered_cache.set(("agents",), body)
+    return json_response(body)
 
 
 @app.post("/sessions", response_model=SessionResponse)
@@ -261,7 +351,7 @@ async def create_session(request: CreateSessionRequest):
         raise HTTPException(status_code=404, detail=f"Agent {request.agent_id} not found")
     
     # Generate session ID
-    session_id = str(uuid.uuid4())
+    session_id = uuid4_str()
     
     # Create session
     session = await session_manager.create_session(
@@ -271,7 +361,8 @@ async def create_session(request: CreateSessionRequest):
         context=request.context
     )
     
-    return SessionResponse(
+    # Every field is server-generated, so skip validation
+    return SessionResponse.model_construct(
         session_id=session.session_id,
         user_id=session.user_id,
         agent_id=session.agent_id,
@@ -289,37 +380,27 @@ async def get_session(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return SessionResponse(
-        session_id=session.session_id,
-        user_id=session.user_id,
-        agent_id=session.agent_id,
-        created_at=session.created_at.isoformat(),
-        last_activity=session.last_activity.isoformat(),
-        is_active=session.is_active,
-        message_count=len(session.message_history)
-    )
+    return json_response(render_session(session))
 
 
 @app.get("/sessions/{session_id}/messages", response_model=List[MessageResponse])
 async def get_session_messages(session_id: str, limit: int = 50):
     """Get session message history."""
-    session = await session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
     # Get recent messages
-    messages = session.message_history[-limit:] if session.message_history else []
+    messages = await session_manager.get_recent_messages(session_id, limit)
+    if messages is None:
+        raise HTTPException(status_code=404, detail="Session not found")
     
-    return [
-        MessageResponse(
-            message_id=msg.get("id", ""),
-            type=msg.get("type", ""),
-            content=msg.get("content", ""),
-            timestamp=msg.get("timestamp", ""),
-            session_id=session_id
-        )
+    return json_response(json_fast.dumps([
+        {
+            "message_id": msg.get("id", ""),
+            "type": msg.get("type", ""),
+            "content": msg.get("content", ""),
+            "timestamp": msg.get("timestamp", ""),
+            "session_id": session_id
+        }
         for msg in messages
-    ]
+    ]))
 
 
 @app.post("/sessions/{session_id}/messages", response_model=MessageResponse)
@@ -332,7 +413,7 @@ async def send_message(session_id: str, request: SendMessageRequest):
     
     # Create message
     message = Message(
-        id=str(uuid.uuid4()),
+        id=uuid4_str(),
         user_id=session.user_id,
         agent_id=session.agent_id,
         content=request.content,
@@ -354,10 +435,11 @@ async def send_message(session_id: str, request: SendMessageRequest):
         }
     )
     
-    # Publish to message broker
+    # Publish to message broker; prompts are durable, so a failure fails the request
     message_broker.publish_user_prompt(message)
     
-    return MessageResponse(
+    # Every field is server-generated, so skip validation
+    return MessageResponse.model_construct(
         message_id=message.id,
         type=message.message_type,
         content=message.content,
@@ -382,22 +464,37 @@ async def end_session(session_id: str):
 async def get_user_sessions(user_id: str):
     """Get all sessions for a user."""
     session_ids = await session_manager.get_user_sessions(user_id)
-    sessions = []
+    sessions = await session_manager.mget_sessions(session_ids)
     
-    for session_id in session_ids:
-        session = await session_manager.get_session(session_id)
-        if session:
-            sessions.append(SessionResponse(
-                session_id=session.session_id,
-                user_id=session.user_id,
-                agent_id=session.agent_id,
-                created_at=session.created_at.isoformat(),
-                last_activity=session.last_activity.isoformat(),
-                is_active=session.is_active,
-                message_count=len(session.message_history)
-            ))
+    return json_response(b"[" + b",".join(render_session(session) for session in sessions) + b"]")
+
+
+async def forward_agent_responses(websocket: WebSocket, user_id: str, last_id: str):
+    """Relay entries after last_id from the user's response stream to their WebSocket.
     
-    return sessions
+    Failed stream reads are logged and retried with backoff so one Redis error does
+    not end delivery; the task ends once the WebSocket can no longer be written to.
+    """
+    partial = {}
+    delay = FORWARD_RETRY_DELAY
+    
+    while True:
+        try:
+            last_id, payloads = await response_stream.read(user_id, last_id, partial=partial)
+            delay = FORWARD_RETRY_DELAY
+        except MessageBrokerError as e:
+            logger.warning(f"Response stream read for user {user_id} failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, FORWARD_RETRY_MAX_DELAY)
+            continue
+        
+        try:
+            for payload in payloads:
+                # Payloads are stored as JSON, so forward them without re-parsing and re-serializing
+                await websocket.send_text(payload.decode())
+        except Exception as e:
+            logger.info(f"Stopped forwarding responses to user {user_id}: {e}")
+            return
 
 
 @app.websocket("/ws")
@@ -407,39 +504,45 @@ async def websocket_endpoint(websocket: WebSocket):
     
     try:
         # Wait for authentication
-        auth_data = await websocket.receive_json()
+        auth_data = json_fast.loads(await websocket.receive_text())
         user_id = auth_data.get("user_id")
         connection_type = auth_data.get("type", "user")
         
         if not user_id:
-            await websocket.send_json({
-                "type": "error",
-                "message": "Missing user_id in authentication"
-            })
+            await websocket.send_text(MISSING_USER_ID_FRAME)
             return
         
+        # Resolve the stream position before registering, so no response sent after that is missed
+        start_id = await response_stream.latest_id(user_id)
+        
         # Register connection
         connection_id = await websocket_manager.register_connection(
             websocket, user_id, connection_type
         )
         
+        # Forward agent responses from the user's stream
+        forward_task = asyncio.create_task(forward_agent_responses(websocket, user_id, start_id))
+        
         # Handle messages
         while True:
-            message_data = await websocket.receive_json()
+            message_data = json_fast.loads(await websocket.receive_text())
             await websocket_manager.handle_message(connection_id, message_data)
     
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        await websocket.send_json({
+        await websocket.send_text(json_fast.dumps_str({
             "type": "error",
             "message": f"WebSocket error: {str(e)}"
-        })
+        }))
     finally:
+        if 'forward_task' in locals():
+            forward_task.cancel()
         if 'connection_id' in locals():
             await websocket_manager.unregister_connection(connection_id)
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5000)
\ No newline at end of file
+    from utils.server_options import uvicorn_options
+    uvicorn.run(app, host="0.0.0.0", port=5000, **uvicorn_options())
\ No newline at end of file
@@ -3,14 +3,16 @@ REST API Server for AI Agents System
 Provides API endpoints for frontend communication with intelligent agents
 """
 import asyncio
+import functools
 import logging
 import json
-from datetime import datetime
+import time
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 import uvicorn
 
@@ -18,28 +20,21 @@ from standalone_simple import SimpleAgentSystem
 from core.security import SecurityManager
 from config.settings import Settings
 from utils.logger import setup_logger
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="AI Agents API",
-    description="REST API for intelligent AI agents with personality-specific responses",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# CORS middleware for frontend integration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+from utils import json_fast
+from utils.json_fast import FastJSONResponse
+from utils.time_utils import utcnow_iso
+from utils.server_options import GZIP_OPTIONS, lifespan_from, uvicorn_options, uvicorn_workers
 
 # Global agent system and security
 agent_system = None
 security_manager = None
+detailed_agents = []  # /agents payload, built once at startup
+
+# OpenAI health: any successful chat within the window counts, so probes rarely hit the API
+OPENAI_HEALTH_TTL = 30.0
+OPENAI_PROBE_TIMEOUT = 1.0
+last_openai_ok = float("-inf")  # time.monotonic() of the last successful chat
+openai_probe: Optional[asyncio.Task] = None
 
 # Note: Security middleware initialization moved to startup for compatibility
 
@@ -55,10 +50,9 @@ class AnalysisRequest(BaseModel):
     analysis_type: Optional[str] = "general"
 
 # Startup and shutdown events
-@app.on_event("startup")
 async def startup_event():
     """Initialize the AI agents system."""
-    global agent_system, security_manager
+    global agent_system, security_manager, detailed_agents
     
     setup_logger()
     logger = logging.getLogger("api_startup")
@@ -69,6 +63,7 @@ async def startup_event():
         # Initialize agent system
         agent_system = SimpleAgentSystem()
         await agent_system.initialize()
+        detailed_agents = _describe_agents()
         
         logger.info("AI Agents API Server ready!")
         security_status = "enabled" if security_manager else "disabled"
@@ -85,12 +80,37 @@ async def startup_event():
         logger.error(f"Startup failed: {e}")
         raise
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger = logging.getLogger("api_shutdown")
+    
+    if agent_system:
+        await agent_system.close()
+    
     logger.info("AI Agents API Server shutdown")
 
+# Initialize FastAPI app
+app = FastAPI(
+    title="AI Agents API",
+    description="REST API for intelligent AI agents with personality-specific responses",
+    version="1.0.0",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan_from(startup_event, shutdown_event)
+)
+
+# CORS middleware for frontend integration
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # Configure for production
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.add_middleware(GZipMiddleware, **GZIP_OPTIONS)
+
 # API Endpoints
 
 @app.get("/")
@@ -101,7 +121,7 @@ async def root():
         "status": "running",
         "version": "1.0.0",
         "description": "Backend API for intelligent AI agents with distinct personalities and business expertise",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utcnow_iso(),
         "agents_available": len(agent_system.agents) if agent_system else 0,
         "features": [
             "OpenAI-powered intelligent responses",
@@ -124,27 +144,26 @@ async def health_check():
     """Health check endpoint."""
     try:
         if not agent_system:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=503,
                 content={
                     "status": "unhealthy",
                     "error": "Agent system not initialized",
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": utcnow_iso()
                 }
             )
         
-        # Test OpenAI connectivity with a simple chat
-        test_result = await agent_system.chat(
-            "agent_alpha", 
-            "health_check_user", 
-            "Hello, this is a health check."
-        )
+        # Test OpenAI connectivity only when no chat has succeeded recently
+        if time.monotonic() - last_openai_ok < OPENAI_HEALTH_TTL:
+            openai_connection = "working"
+        else:
+            openai_connection = await _probe_openai()
         
         return {
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utcnow_iso(),
             "agents_count": len(agent_system.agents),
-            "openai_connection": "working" if test_result["success"] else "failed",
+            "openai_connection": openai_connection,
             "system_components": {
                 "agent_system": "operational",
                 "openai_integration": "active",
@@ -154,12 +173,12 @@ async def health_check():
         }
         
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={
                 "status": "unhealthy", 
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
         )
 
@@ -170,30 +189,10 @@ async def list_agents():
         if not agent_system:
             raise HTTPException(status_code=503, detail="Agent system not initialized")
         
-        agents_info = agent_system.list_agents()
-        
-        # Add detailed agent information
-        detailed_agents = []
-        for agent_info in agents_info["agents"]:
-            agent_id = agent_info["agent_id"]
-            agent = agent_system.agents[agent_id]
-            
-            detailed_agents.append({
-                **agent_info,
-                "capabilities": {
-                    "chat": f"/agents/{agent_id}/chat",
-                    "specialization": agent.business_domain,
-                    "personality_traits": agent.personality.get('traits', []),
-                    "communication_style": agent.personality.get('tone', 'professional')
-                },
-                "business_focus": agent.business_rules.domains.get(agent.business_domain, "General assistance"),
-                "example_use_cases": _get_example_use_cases(agent.business_domain)
-            })
-        
         return {
             "agents": detailed_agents,
             "total_agents": len(detailed_agents),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
         
     except Exception as e:
@@ -217,7 +216,9 @@ async def chat_with_agent(agent_id: str, request: ChatRequest):
             request.context
         )
         
-        if not response["success"]:
+        if response["success"]:
+            _record_openai_ok()
+        else:
             if "not found" in response.get("error", "").lower():
                 raise HTTPException(status_code=404, detail=response["error"])
             else:
@@ -253,11 +254,11 @@ async def get_agent_info(agent_id: str):
         if not agent_system:
             raise HTTPException(status_code=503, detail="Agent system not initialized")
         
-        if agent_id not in agent_system.agents:
+        try:
+            agent = agent_system.agents[agent_id]
+        except KeyError:
             raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
         
-        agent = agent_system.agents[agent_id]
-        
         return {
             "agent_id": agent_id,
             "personality": {
@@ -274,7 +275,7 @@ async def get_agent_info(agent_id: str):
             "capabilities": _get_agent_capabilities(agent_id),
             "example_conversations": _get_example_conversations(agent.business_domain),
             "status": "active",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
         
     except HTTPException:
@@ -345,35 +346,109 @@ async def get_system_stats():
                     "Conversation memory"
                 ]
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Helper functions
-def _get_example_use_cases(business_domain: str) -> list:
+def _record_openai_ok() -> None:
+    """Mark OpenAI as reachable as of now."""
+    global last_openai_ok
+    last_openai_ok = time.monotonic()
+
+def _on_probe_done(task: asyncio.Task) -> None:
+    """Refresh the health timestamp when a probe succeeds, even after its caller timed out."""
+    if not task.cancelled() and task.exception() is None and task.result()["success"]:
+        _record_openai_ok()
+
+async def _probe_openai() -> str:
+    """Run at most one test chat at a time and report "working", "failed" or "checking"."""
+    global openai_probe
+    if openai_probe is None or openai_probe.done():
+        openai_probe = asyncio.create_task(agent_system.chat(
+            "agent_alpha", 
+            "health_check_user", 
+            "Hello, this is a health check."
+        ))
+        openai_probe.add_done_callback(_on_probe_done)
+    
+    try:
+        # Shielded so a slow probe keeps running for the next health check
+        test_result = await asyncio.wait_for(asyncio.shield(openai_probe), timeout=OPENAI_PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        return "checking"
+    return "working" if test_result["success"] else "failed"
+
+# Static payload tables, built once at import. Values are tuples or shared dicts that
+# callers only embed in responses and must not mutate.
+_USE_CASES = MappingProxyType({
+    "financial_advisor": (
+        "Investment portfolio analysis",
+        "Retirement planning advice",
+        "Risk assessment consultation",
+        "Market trend analysis",
+        "Financial goal setting"
+    ),
+    "content_creator": (
+        "Social media content strategy",
+        "Creative campaign ideation",
+        "Brand storytelling",
+        "Content optimization tips",
+        "Audience engagement strategies"
+    )
+})
+_DEFAULT_USE_CASES = ("General assistance", "Q&A support")
+
+_SPECIALIZATIONS = MappingProxyType({
+    "financial_advisor": (
+        "Portfolio Management",
+        "Risk Analysis",
+        "Investment Strategy",
+        "Retirement Planning",
+        "Market Research"
+    ),
+    "content_creator": (
+        "Social Media Strategy",
+        "Brand Development",
+        "Creative Writing",
+        "SEO Optimization",
+        "Audience Analysis"
+    )
+})
+_DEFAULT_SPECIALIZATIONS = ("General Knowledge",)
+
+_EXAMPLE_CONVERSATIONS = MappingProxyType({
+    "financial_advisor": (
+        {
+            "user": "I want to start investing but I'm new to this. Where should I begin?",
+            "response_type": "Educational guidance with risk assessment and beginner-friendly investment options"
+        },
+        {
+            "user": "Should I invest in tech stocks or diversify more?",
+            "response_type": "Portfolio analysis with diversification strategy recommendations"
+        }
+    ),
+    "content_creator": (
+        {
+            "user": "I need viral content ideas for my startup's social media.",
+            "response_type": "Creative content strategies tailored to startup marketing goals"
+        },
+        {
+            "user": "How can I improve engagement on my Instagram posts?",
+            "response_type": "Data-driven engagement optimization tips and creative suggestions"
+        }
+    )
+})
+
+def _get_example_use_cases(business_domain: str) -> tuple:
     """Get example use cases for a business domain."""
-    use_cases = {
-        "financial_advisor": [
-            "Investment portfolio analysis",
-            "Retirement planning advice",
-            "Risk assessment consultation",
-            "Market trend analysis",
-            "Financial goal setting"
-        ],
-        "content_creator": [
-            "Social media content strategy",
-            "Creative campaign ideation",
-            "Brand storytelling",
-            "Content optimization tips",
-            "Audience engagement strategies"
-        ]
-    }
-    return use_cases.get(business_domain, ["General assistance", "Q&A support"])
+    return _USE_CASES.get(business_domain, _DEFAULT_USE_CASES)
 
+@functools.cache
 def _get_agent_capabilities(agent_id: str) -> dict:
-    """Get capabilities for a specific agent."""
+    """Get capabilities for a specific agent, built once per agent ID."""
     return {
         "chat_endpoint": f"/agents/{agent_id}/chat",
         "info_endpoint": f"/agents/{agent_id}/info", 
@@ -383,73 +458,55 @@ def _get_agent_capabilities(agent_id: str) -> dict:
         "personality_consistency": True
     }
 
-def _get_business_specializations(business_domain: str) -> list:
+def _get_business_specializations(business_domain: str) -> tuple:
     """Get specializations for a business domain."""
-    specializations = {
-        "financial_advisor": [
-            "Portfolio Management",
-            "Risk Analysis", 
-            "Investment Strategy",
-            "Retirement Planning",
-            "Market Research"
-        ],
-        "content_creator": [
-            "Social Media Strategy",
-            "Brand Development",
-            "Creative Writing",
-            "SEO Optimization",
-            "Audience Analysis"
-        ]
-    }
-    return specializations.get(business_domain, ["General Knowledge"])
+    return _SPECIALIZATIONS.get(business_domain, _DEFAULT_SPECIALIZATIONS)
 
-def _get_example_conversations(business_domain: str) -> list:
+def _get_example_conversations(business_domain: str) -> tuple:
     """Get example conversations for a business domain."""
-    examples = {
-        "financial_advisor": [
-            {
-                "user": "I want to start investing but I'm new to this. Where should I begin?",
-                "response_type": "Educational guidance with risk assessment and beginner-friendly investment options"
-            },
-            {
-                "user": "Should I invest in tech stocks or diversify more?",
-                "response_type": "Portfolio analysis with diversification strategy recommendations"
-            }
-        ],
-        "content_creator": [
-            {
-                "user": "I need viral content ideas for my startup's social media.",
-                "response_type": "Creative content strategies tailored to startup marketing goals"
+    return _EXAMPLE_CONVERSATIONS.get(business_domain, ())
+
+def _describe_agents() -> list:
+    """Build the detailed agent list served by /agents; agents are fixed after startup."""
+    detailed_agents = []
+    for agent_info in agent_system.list_agents()["agents"]:
+        agent_id = agent_info["agent_id"]
+        agent = agent_system.agents[agent_id]
+        
+        detailed_agents.append({
+            **agent_info,
+            "capabilities": {
+                "chat": f"/agents/{agent_id}/chat",
+                "specialization": agent.business_domain,
+                "personality_traits": agent.personality.get('traits', []),
+                "communication_style": agent.personality.get('tone', 'professional')
             },
-            {
-                "user": "How can I improve engagement on my Instagram posts?",
-                "response_type": "Data-driven engagement optimization tips and creative suggestions"
-            }
-        ]
-    }
-    return examples.get(business_domain, [])
+            "business_focus": agent.business_rules.domains.get(agent.business_domain, "General assistance"),
+            "example_use_cases": _get_example_use_cases(agent.business_domain)
+        })
+    return detailed_agents
 
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=404,
         content={
             "error": "Resource not found",
             "detail": str(exc.detail),
             "path": str(request.url.path),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
     )
 
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error", 
             "detail": str(exc.detail),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
     )
 
@@ -460,5 +517,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=5000,
         reload=False,
-        log_level="info"
+        log_level="info",
+        workers=uvicorn_workers(),
+        **uvicorn_options()
     )
\ No newline at end of file
@@ -12,14 +12,20 @@ DEPLOYMENT GUARANTEE:
 """
 import logging
 import asyncio
+import functools
+import hashlib
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional
+import anyio
+from urllib.parse import quote
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple, Type
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
+import httpx
 try:
     from supabase import create_client, Client
     SUPABASE_AVAILABLE = True
@@ -28,13 +34,19 @@ except ImportError:
     Client = None
 
 from config.settings import Settings
+from utils.server_options import GZIP_OPTIONS, lifespan_from, uvicorn_options, uvicorn_workers
+from utils import json_fast
+from utils.json_fast import FastJSONResponse
+from utils.cache import TTLCache
+from utils.time_utils import utcnow_iso
+from utils.logger import setup_logger
 from agents.agent_factory import AgentFactory
+from middleware.security import APIKeyManager
+from core.micro_batcher import AgentMicroBatcher
+from core.openai_integration import HTTP2_AVAILABLE
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging; console output is written from a background queue listener
+setup_logger()
 
 # Pydantic models for API requests
 class CoachingRequest(BaseModel):
@@ -68,27 +80,60 @@ class HealthResponse(BaseModel):
     supabase_status: str
     timestamp: str
 
-# Global variables
-app = FastAPI(
-    title="Futmatrix AI Agents API - Production",
-    description="Production-ready Coach and Rivalizer agents for EA Sports FC 25 competitive gaming platform with Supabase integration",
-    version="2.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
+def _model_response(model: Type[BaseModel], **fields: Any) -> Response:
+    """Serialize server-built fields in a response model's shape without validating them.
+    
+    Routes declare the model through responses={200: {"model": ...}} rather than
+    response_model, so it documents the schema without FastAPI building a
+    response field that would validate the same fields a second time.
+    """
+    return FastJSONResponse(model.model_construct(**fields).model_dump())
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def _internal_errors(prefix: str = "Internal error") -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Turn an endpoint's unexpected errors into HTTPException(500, "<prefix>: <error>").
+    
+    HTTPExceptions pass through untouched. Raising rather than registering an
+    Exception handler keeps the 500 inside CORSMiddleware, so browsers can read it.
+    """
+    def decorator(endpoint: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await endpoint(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"{prefix}: {str(e)}")
+        return wrapper
+    return decorator
 
 # Global instances
 agent_factory: AgentFactory = None
 supabase_client: Client = None
+supabase_rest: Optional[httpx.AsyncClient] = None  # Pooled PostgREST client shared by all Supabase reads
+
+# Serialized /, /agents bodies up to their timestamp, built at startup
+root_prefix = b""
+agents_prefix = b""
+
+# /health body prefixes, one per combination of reported statuses
+health_prefixes: Dict[Tuple[str, str, str, str], bytes] = {}
+_EMPTY: Dict[str, Any] = {}  # Shared default for missing agent entries; never mutated
+
+# /rivalizer/rankings body prefix and ETag, with the (cached) Supabase result they were built from
+rankings_prefix: Tuple[Optional[Dict[str, Any]], bytes, str] = (None, b"", "")
+rankings_refresher: Optional[asyncio.Task] = None
+
+# Per-agent micro-batchers for coach/rivalizer analyses, when AGENT_BATCH_WINDOW_MS is set
+micro_batchers: Dict[str, AgentMicroBatcher] = {}
+
+# Successful history-free coach/rivalizer analyses keyed by (user_id, SHA-256 of the request)
+analysis_cache = TTLCache(maxsize=1024, ttl=900)
+
+def _analysis_cache_key(agent_id: str, user_id: str, *fields: Any) -> Tuple[str, str]:
+    """Key a request by user ID and a SHA-256 digest of the agent and request fields."""
+    digest = hashlib.sha256(json_fast.dumps([agent_id, user_id, *fields])).hexdigest()
+    return user_id, digest
 
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -100,7 +145,7 @@ logger = logging.getLogger("futmatrix_production")
 
 async def initialize_supabase():
     """Initialize Supabase client and verify database access."""
-    global supabase_client
+    global supabase_client, supabase_rest
     
     try:
         if not SUPABASE_AVAILABLE:
@@ -109,11 +154,22 @@ async def initialize_supabase():
             
         if SUPABASE_URL and SUPABASE_ANON_KEY:
             supabase_client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+            
+            # Reads go straight to PostgREST on one pooled async client, so they stay on the
+            # event loop and every request reuses the same warm TLS/HTTP2 connections
+            supabase_rest = httpx.AsyncClient(
+                base_url=f"{SUPABASE_URL}/rest/v1",
+                headers={"apikey": SUPABASE_ANON_KEY, "Authorization": f"Bearer {SUPABASE_ANON_KEY}"},
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(5.0, connect=2.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+            )
             logger.info("✅ Supabase client initialized")
             
             # Test Supabase connection with simpler query
             try:
-                response = supabase_client.table('futmatrix_players').select("*").limit(1).execute()
+                response = await supabase_rest.get("/futmatrix_players", params={"select": "*", "limit": 1})
+                response.raise_for_status()
                 logger.info("✅ Supabase database connection confirmed")
                 return True
             except Exception as test_error:
@@ -127,10 +183,9 @@ async def initialize_supabase():
         logger.error(f"❌ Supabase initialization failed: {e}")
         return False
 
-@app.on_event("startup")
 async def startup_event():
     """Initialize the Futmatrix agents and Supabase on startup."""
-    global agent_factory
+    global agent_factory, root_prefix, agents_prefix, rankings_refresher
     
     logger.info("🎮 Starting Futmatrix AI Agents API Server - Production")
     logger.info("🚀 DEPLOYMENT GUARANTEE:")
@@ -140,15 +195,22 @@ async def startup_event():
     logger.info("   ✅ Production Ready: Error handling, logging, monitoring")
     
     try:
-        # Initialize Supabase
-        supabase_ready = await initialize_supabase()
-        
         # Initialize settings and factory
         settings = Settings()
         agent_factory = AgentFactory(settings)
         
-        # Initialize the factory
-        await agent_factory.initialize()
+        # Sync endpoints and dependencies run on AnyIO's limiter, which defaults to 40 threads
+        anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREAD_POOL_SIZE
+        
+        # The factory's OpenAI test call and the Supabase test query are independent round
+        # trips; run them together
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(agent_factory.initialize())
+                tg.create_task(initialize_supabase())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        root_prefix = json_fast.timestamped_prefix(_build_root_payload())
         logger.info("✅ Agent factory initialized")
         
         # Create Futmatrix agents with guaranteed personalities
@@ -172,6 +234,18 @@ async def startup_event():
         await agent_factory.initialize_all_agents()
         await agent_factory.start_all_agents()
         
+        if settings.AGENT_BATCH_WINDOW_MS > 0:
+            for agent_id in ("futmatrix_coach", "futmatrix_rivalizer"):
+                micro_batchers[agent_id] = AgentMicroBatcher(
+                    agent_factory.get_openai_agent(agent_id),
+                    max_delay=settings.AGENT_BATCH_WINDOW_MS / 1000
+                )
+                micro_batchers[agent_id].start()
+            logger.info(f"✅ Micro-batching enabled ({settings.AGENT_BATCH_WINDOW_MS}ms window)")
+        agents_prefix = json_fast.timestamped_prefix(_build_agents_payload())
+        if supabase_client:
+            rankings_refresher = asyncio.create_task(_refresh_rankings_loop())
+        
         logger.info("🚀 FUTMATRIX AI AGENTS API SERVER READY FOR DEPLOYMENT!")
         logger.info("📍 GUARANTEED ENDPOINTS:")
         logger.info("   🏆 COACH AGENT:")
@@ -185,129 +259,264 @@ async def startup_event():
         logger.info("   🔧 SYSTEM ENDPOINTS:")
         logger.info("     GET  /health               - System health check")
         logger.info("     GET  /agents               - Agent status")
+        logger.info("     DELETE /cache/{user_id}    - Drop a user's cached analyses (API key)")
         logger.info("     GET  /docs                 - API documentation")
         
     except Exception as e:
         logger.error(f"❌ CRITICAL: Failed to initialize Futmatrix system: {e}")
         raise
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Clean up agents on shutdown."""
     global agent_factory
     
     logger.info("🛑 Shutting down Futmatrix AI Agents API Server - Production")
     
+    for batcher in micro_batchers.values():
+        await batcher.close()
+    
+    if rankings_refresher:
+        rankings_refresher.cancel()
+    
     if agent_factory:
         try:
             await agent_factory.stop_all_agents()
             logger.info("✅ All agents stopped successfully")
         except Exception as e:
             logger.error(f"⚠️ Error during shutdown: {e}")
+    
+    if supabase_rest:
+        await supabase_rest.aclose()
 
-async def get_supabase_data(table: str, filters: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Get data from Supabase tables with fallback to mock data."""
-    global supabase_client
+# Initialize FastAPI app
+app = FastAPI(
+    title="Futmatrix AI Agents API - Production",
+    description="Production-ready Coach and Rivalizer agents for EA Sports FC 25 competitive gaming platform with Supabase integration",
+    version="2.0.0",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan_from(startup_event, shutdown_event)
+)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",")],
+    allow_credentials=False,  # Credentialed requests with "*" make Starlette echo each origin
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type", "Authorization"],
+)
+
+app.add_middleware(GZipMiddleware, **GZIP_OPTIONS)
+
+# Supabase read cache. Reads are keyed by table and filters and kept for the table's TTL
+# in seconds; the /health probe ({"limit": 1}) uses HEALTH_PROBE_TTL. Cached results are
+# shared between requests and must not be mutated.
+SUPABASE_CACHE_TTLS = {
+    "futmatrix_rankings": 30,
+    "futmatrix_players": 5,
+    "futmatrix_performance": 5,
+    "futmatrix_matches": 5
+}
+HEALTH_PROBE_TTL = 60
+RANKINGS_REFRESH_INTERVAL = 25  # Seconds; under the rankings TTL so requests never find it expired
+SUPABASE_QUERY_TIMEOUT = 2.0  # Seconds before a query falls back to mock data
+supabase_caches: Dict[float, TTLCache] = {}
+supabase_inflight: Dict[Tuple[str, Tuple], asyncio.Task] = {}  # One query per key in flight
+
+def _supabase_cache(table: str, filters: Optional[Dict[str, Any]]) -> Optional[TTLCache]:
+    """Return the cache for a read, or None if the table is not cached."""
+    ttl = HEALTH_PROBE_TTL if filters == {"limit": 1} else SUPABASE_CACHE_TTLS.get(table)
+    if ttl is None:
+        return None
+    if ttl not in supabase_caches:
+        supabase_caches[ttl] = TTLCache(maxsize=2048, ttl=ttl)
+    return supabase_caches[ttl]
+
+async def get_supabase_data(table: str, filters: Dict[str, Any] = None, fresh: bool = False) -> Dict[str, Any]:
+    """Get data from Supabase tables with fallback to mock data.
     
+    Results are cached briefly, and concurrent misses for the same read share one query.
+    fresh skips the cached result but still joins a query already in flight.
+    """
     if not supabase_client:
         # Return mock data for demonstration
         return get_mock_data(table, filters)
     
+    cache = _supabase_cache(table, filters)
+    if cache is None:
+        return await _fetch_supabase_data(table, filters)
+    
+    cache_key = (table, tuple(sorted(filters.items())) if filters else ())
+    cached = None if fresh else cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Bound once for the lookup, the insert and the done callback below
+    inflight = supabase_inflight
+    task = inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_fetch_supabase_data(table, filters, cache, cache_key))
+        inflight[cache_key] = task
+        task.add_done_callback(lambda _: inflight.pop(cache_key, None))
+    
+    # Shielded so one caller's cancellation does not cancel the query for the others
+    return await asyncio.shield(task)
+
+@functools.lru_cache(maxsize=64)
+def _postgrest_path(table: str, columns: Tuple[str, ...], limit: bool) -> str:
+    """PostgREST select path for a table and filter shape, with {} slots for the values.
+    
+    The handful of query shapes used here are built once, so a read only fills in
+    its URL-quoted values.
+    """
+    path = f"/{quote(table)}?select=*" + "".join(f"&{quote(column)}=eq.{{}}" for column in columns)
+    return path + "&limit={}" if limit else path
+
+async def _fetch_supabase_data(
+    table: str,
+    filters: Optional[Dict[str, Any]],
+    cache: Optional[TTLCache] = None,
+    cache_key: Optional[Tuple[str, Tuple]] = None
+) -> Dict[str, Any]:
+    """Query Supabase, caching a successful result; mock data on failure is not cached."""
     try:
-        query = supabase_client.table(table).select("*")
-        
-        if filters:
-            for key, value in filters.items():
-                if key != "limit":  # Special handling for limit
-                    query = query.eq(key, value)
+        filters = filters or {}
+        columns = tuple(key for key in filters if key != "limit")  # Special handling for limit
+        path = _postgrest_path(table, columns, "limit" in filters)
+        values = [filters[column] for column in columns]
+        if "limit" in filters:
+            values.append(filters["limit"])
         
-        if filters and "limit" in filters:
-            query = query.limit(filters["limit"])
-        
-        response = query.execute()
-        return {"data": response.data, "count": len(response.data)}
+        # The timeout bounds how long a request waits on a hung query
+        async with asyncio.timeout(SUPABASE_QUERY_TIMEOUT):
+            response = await supabase_rest.get(path.format(*(quote(str(value), safe="") for value in values)))
+        response.raise_for_status()
+        result = _query_result(json_fast.loads(response.content))
+        if cache is not None:
+            cache.set(cache_key, result)
+        return result
     except Exception as e:
         logger.warning(f"Supabase query failed, returning mock data: {e}")
         return get_mock_data(table, filters)
 
-def get_mock_data(table: str, filters: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Generate mock data for demonstration when Supabase is not available."""
-    mock_data_templates = {
-        "futmatrix_players": [
-            {
-                "id": "player_001",
-                "user_id": "test_player_001",
-                "username": "ProGamer2024",
-                "skill_level": "advanced",
-                "playstyle": "tactical",
-                "status": "online"
-            },
-            {
-                "id": "player_002", 
-                "user_id": "challenger_001",
-                "username": "StrategicMaster",
-                "skill_level": "expert",
-                "playstyle": "aggressive",
-                "status": "online"
-            }
-        ],
-        "futmatrix_performance": [
-            {
-                "id": "perf_001",
-                "user_id": "test_player_001",
-                "performance_score": 8.5,
-                "finishing_rating": 7,
-                "defending_rating": 9,
-                "strategy_rating": 8,
-                "consistency_score": 7.8,
-                "improvement_areas": ["finishing", "pressure_management"]
-            }
-        ],
-        "futmatrix_matches": [
-            {
-                "id": "match_001",
-                "player_id": "test_player_001",
-                "opponent_id": "challenger_001",
-                "result": "win",
-                "score": "2-1",
-                "match_type": "competitive"
-            }
-        ],
-        "futmatrix_rankings": [
-            {
-                "id": "rank_001",
-                "user_id": "test_player_001",
-                "skill_level": "advanced",
-                "ranking_points": 1850,
-                "tier": "gold",
-                "wins": 45,
-                "losses": 23,
-                "win_rate": 66.2
-            }
-        ]
+def _query_result(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Wrap query rows with the slices the endpoints hand to the agents, taken once per result."""
+    return {
+        "data": data,
+        "count": len(data),
+        "head5": data[:5],
+        "head10": data[:10],
+        "tail5": data[-5:],
+        "tail10": data[-10:]
     }
+
+# Demo rows served when Supabase is not available. Rows are shared between requests
+# and must not be mutated.
+MOCK_DATA = {
+    "futmatrix_players": [
+        {
+            "id": "player_001",
+            "user_id": "test_player_001",
+            "username": "ProGamer2024",
+            "skill_level": "advanced",
+            "playstyle": "tactical",
+            "status": "online"
+        },
+        {
+            "id": "player_002", 
+            "user_id": "challenger_001",
+            "username": "StrategicMaster",
+            "skill_level": "expert",
+            "playstyle": "aggressive",
+            "status": "online"
+        }
+    ],
+    "futmatrix_performance": [
+        {
+            "id": "perf_001",
+            "user_id": "test_player_001",
+            "performance_score": 8.5,
+            "finishing_rating": 7,
+            "defending_rating": 9,
+            "strategy_rating": 8,
+            "consistency_score": 7.8,
+            "improvement_areas": ["finishing", "pressure_management"]
+        }
+    ],
+    "futmatrix_matches": [
+        {
+            "id": "match_001",
+            "player_id": "test_player_001",
+            "opponent_id": "challenger_001",
+            "result": "win",
+            "score": "2-1",
+            "match_type": "competitive"
+        }
+    ],
+    "futmatrix_rankings": [
+        {
+            "id": "rank_001",
+            "user_id": "test_player_001",
+            "skill_level": "advanced",
+            "ranking_points": 1850,
+            "tier": "gold",
+            "wins": 45,
+            "losses": 23,
+            "win_rate": 66.2
+        }
+    ]
+}
+
+def _build_mock_indexes() -> Dict[str, Dict[str, Tuple[Set[int], Dict[Any, Set[int]]]]]:
+    """Index MOCK_DATA as table -> column -> (rows having it, value -> row positions)."""
+    indexes = {}
+    for table, rows in MOCK_DATA.items():
+        columns = {}
+        for position, row in enumerate(rows):
+            for column, value in row.items():
+                present, by_value = columns.setdefault(column, (set(), {}))
+                present.add(position)
+                if isinstance(value, Hashable):
+                    by_value.setdefault(value, set()).add(position)
+        indexes[table] = columns
+    return indexes
+
+MOCK_INDEXES = _build_mock_indexes()
+
+# Unfiltered results per table, built once so their slices are not recomputed per request
+MOCK_RESULTS = {table: _query_result(rows) for table, rows in MOCK_DATA.items()}
+
+def get_mock_data(table: str, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Return mock rows for demonstration when Supabase is not available.
     
-    # Get base data for table
-    data = mock_data_templates.get(table, [])
-    
-    # Apply basic filtering for demo
-    if filters and data:
-        filtered_data = []
-        for item in data:
-            match = True
-            for key, value in filters.items():
-                if key in item and item[key] != value:
-                    match = False
-                    break
-            if match:
-                filtered_data.append(item)
-        data = filtered_data
-    
-    return {"data": data, "count": len(data)}
-
-@app.get("/")
-async def root():
-    """Get system information with deployment guarantees."""
+    A filter matches rows with that value and rows without the column, so keys such
+    as "limit" do not narrow the result. Results are shared between requests and must
+    not be mutated.
+    """
+    data = MOCK_DATA.get(table, [])
+    if not data:
+        return _query_result([])
+    if not filters:
+        return MOCK_RESULTS[table]
+    
+    candidates = set(range(len(data)))
+    for key, value in filters.items():
+        if key not in MOCK_INDEXES[table]:
+            continue
+        present, by_value = MOCK_INDEXES[table][key]
+        if isinstance(value, Hashable):
+            candidates -= present - by_value.get(value, set())
+        else:
+            candidates = {position for position in candidates if data[position].get(key, value) == value}
+    
+    if len(candidates) == len(data):
+        return MOCK_RESULTS[table]
+    return _query_result([data[position] for position in sorted(candidates)])
+
+def _build_root_payload() -> Dict[str, Any]:
+    """Build the static part of the root payload once Supabase has been initialized."""
     return {
         "service": "Futmatrix AI Agents API - Production",
         "version": "2.0.0",
@@ -357,68 +566,224 @@ async def root():
                 "futmatrix_rankings"
             ]
         },
-        "powered_by": "AI Agents Factory + OpenAI GPT-4o + Supabase",
-        "timestamp": datetime.utcnow().isoformat()
+        "powered_by": "AI Agents Factory + OpenAI GPT-4o + Supabase"
     }
 
-@app.get("/health", response_model=HealthResponse)
-async def health_check():
+# /, /health and /agents take no input, so they are plain Starlette routes: polls skip
+# FastAPI's parameter resolution and response validation
+
+async def root(request: Request) -> Response:
+    """Get system information with deployment guarantees."""
+    return Response(json_fast.stamp(root_prefix, utcnow_iso()), media_type="application/json")
+
+@_internal_errors("Health check failed")
+async def health_check(request: Request) -> Response:
     """Check system health with deployment guarantees."""
     global agent_factory, supabase_client
     
     if not agent_factory:
         raise HTTPException(status_code=503, detail="Agent factory not initialized")
     
-    try:
-        health = await agent_factory.health_check()
-        
-        # Test Supabase connection
+    health = await agent_factory.health_check()
+    agents = health["agents"]
+    
+    # Test Supabase connection; get_supabase_data falls back to mock data rather than raising
+    supabase_status = "mock_data"
+    if supabase_client and (await get_supabase_data("futmatrix_players", {"limit": 1}))["data"]:
         supabase_status = "healthy"
-        if supabase_client:
-            try:
-                test_response = await get_supabase_data("futmatrix_players", {"limit": 1})
-                supabase_status = "healthy" if test_response["data"] else "mock_data"
-            except:
-                supabase_status = "mock_data"
-        else:
-            supabase_status = "mock_data"
-        
-        return HealthResponse(
-            status="healthy" if health["factory_status"] == "healthy" else "unhealthy",
-            agent_status={
-                "futmatrix_coach": health["agents"].get("futmatrix_coach", {}).get("status", "unknown"),
-                "futmatrix_rivalizer": health["agents"].get("futmatrix_rivalizer", {}).get("status", "unknown")
-            },
-            supabase_status=supabase_status,
-            timestamp=datetime.utcnow().isoformat()
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
+    
+    statuses = (
+        "healthy" if health["factory_status"] == "healthy" else "unhealthy",
+        (agents.get("futmatrix_coach") or _EMPTY).get("status", "unknown"),
+        (agents.get("futmatrix_rivalizer") or _EMPTY).get("status", "unknown"),
+        supabase_status
+    )
+    prefix = health_prefixes.get(statuses)
+    if prefix is None:
+        prefix = health_prefixes[statuses] = _health_prefix(*statuses)
+    
+    return Response(json_fast.stamp(prefix, utcnow_iso()), media_type="application/json")
+
+def _health_prefix(status: str, coach_status: str, rivalizer_status: str, supabase_status: str) -> bytes:
+    """Serialize a HealthResponse body up to its timestamp."""
+    return json_fast.timestamped_prefix({
+        "status": status,
+        "agent_status": {
+            "futmatrix_coach": coach_status,
+            "futmatrix_rivalizer": rivalizer_status
+        },
+        "supabase_status": supabase_status
+    })
+
+def _build_agents_payload() -> Dict[str, Any]:
+    """Build the /agents payload; agents are only created and started at startup."""
+    agents = agent_factory.list_agents()
+    stats = agent_factory.get_factory_stats()
+    
+    return {
+        "agents": agents,
+        "statistics": stats,
+        "total_agents": len(agents),
+        "active_agents": len([a for a in agents if a["is_active"]])
+    }
 
-@app.get("/agents")
-async def list_agents():
+async def list_agents(request: Request) -> Response:
     """List all available agents."""
     global agent_factory
     
     if not agent_factory:
         raise HTTPException(status_code=503, detail="Agent factory not initialized")
     
+    return Response(json_fast.stamp(agents_prefix, utcnow_iso()), media_type="application/json")
+
+app.router.add_route("/", root, methods=["GET"])
+app.router.add_route("/health", health_check, methods=["GET"])
+app.router.add_route("/agents", list_agents, methods=["GET"])
+
+# ANALYSIS RESPONSE CACHE
+async def _cached_analysis(
+    agent_id: str,
+    cache_key: Tuple[str, str],
+    run: Callable[[Any], Awaitable[Tuple[Dict[str, Any], List[str]]]],
+    request: Any
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Return a cached (response, data_sources) pair, or run the analysis and cache a success.
+    
+    Replies depend on the user's conversation history, so only history-free calls are
+    served from or stored in the cache; a hit is still recorded as a turn in history.
+    Hits skip the Supabase reads and the OpenAI call, and report zero tokens used.
+    """
+    agent = agent_factory.get_openai_agent(agent_id)
+    if agent is None or agent.has_conversation(request.user_id):
+        return await run(request)
+    
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        response, data_sources = cached
+        agent.record_exchange(request.user_id, request.message, response["response"])
+        return {**response, "tokens_used": 0, "cached": True}, data_sources
+    
+    response, data_sources = await run(request)
+    if response["success"]:
+        analysis_cache.set(cache_key, (response, data_sources))
+    return response, data_sources
+
+async def _process_agent_message(
+    agent_id: str,
+    user_id: str,
+    message: str,
+    context: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Send a message to an agent, through its micro-batcher when batching is enabled."""
+    batcher = micro_batchers.get(agent_id)
+    if batcher is None:
+        return await agent_factory.process_user_message(agent_id, user_id, message, context)
+    
     try:
-        agents = agent_factory.list_agents()
-        stats = agent_factory.get_factory_stats()
+        return await batcher.submit(user_id, message, context)
+    except Exception as e:
+        logger.error(f"Batched request to {agent_id} failed: {e}")
+        return {"success": False, "agent_id": agent_id, "user_id": user_id, "error": str(e)}
+
+async def _coaching_context(request: CoachingRequest) -> Tuple[Dict[str, Any], List[str]]:
+    """Build the Coach agent context from the player's Supabase data."""
+    # Get player data from Supabase
+    player_data, performance_data = await asyncio.gather(
+        get_supabase_data("futmatrix_players", {"user_id": request.user_id}),
+        get_supabase_data("futmatrix_performance", {"user_id": request.user_id})
+    )
+    
+    data_sources = []
+    if player_data["data"]:
+        data_sources.append("futmatrix_players")
+    if performance_data["data"]:
+        data_sources.append("futmatrix_performance")
+    
+    # Enhanced context with Supabase data
+    enhanced_context = {
+        "focus_areas": request.focus_areas,
+        "player_profile": player_data["data"][0] if player_data["data"] else None,
+        "performance_history": performance_data["data"],
+        "supabase_data": True
+    }
+    
+    return enhanced_context, data_sources
+
+async def _run_coaching_analysis(request: CoachingRequest) -> Tuple[Dict[str, Any], List[str]]:
+    """Run a coaching analysis through the Coach agent with the player's Supabase data."""
+    enhanced_context, data_sources = await _coaching_context(request)
+    
+    # Process coaching request with COACHING personality
+    response = await _process_agent_message("futmatrix_coach", request.user_id, request.message, enhanced_context)
+    
+    return response, data_sources
+
+async def _matchmaking_context(request: MatchmakingRequest) -> Tuple[Dict[str, Any], List[str]]:
+    """Build the Rivalizer agent context from player, ranking and opponent data in Supabase."""
+    # Get player and opponent data from Supabase
+    player_data, rankings_data, available_opponents = await asyncio.gather(
+        get_supabase_data("futmatrix_players", {"user_id": request.user_id}),
+        get_supabase_data("futmatrix_rankings", {"skill_level": request.skill_level}),
+        get_supabase_data("futmatrix_players", {"status": "online"})
+    )
+    
+    data_sources = []
+    if player_data["data"]:
+        data_sources.append("futmatrix_players")
+    if rankings_data["data"]:
+        data_sources.append("futmatrix_rankings")
+    
+    # Enhanced context with Supabase data for COMPETITIVE personality
+    competitive_context = {
+        "skill_level": request.skill_level,
+        "playstyle": request.playstyle,
+        "tournament_mode": request.tournament_mode,
+        "player_profile": player_data["data"][0] if player_data["data"] else None,
+        "available_opponents": available_opponents["head10"],  # Top 10 matches
+        "skill_rankings": rankings_data["data"],
+        "supabase_data": True
+    }
+    
+    return competitive_context, data_sources
+
+async def _run_matchmaking(request: MatchmakingRequest) -> Tuple[Dict[str, Any], List[str]]:
+    """Run a matchmaking request through the Rivalizer agent with ranking data from Supabase."""
+    competitive_context, data_sources = await _matchmaking_context(request)
+    
+    # Process matchmaking request with COMPETITIVE personality
+    response = await _process_agent_message("futmatrix_rivalizer", request.user_id, request.message, competitive_context)
+    
+    return response, data_sources
+
+async def _sse_events(
+    agent_id: str,
+    user_id: str,
+    message: str,
+    context: Dict[str, Any],
+    data_sources: List[str]
+) -> AsyncIterator[bytes]:
+    """Yield an agent's streamed reply as server-sent events.
+    
+    Event payloads use the same frames as the WebSocket stream: "chunk" per
+    text delta, then "done", or "error" if generation fails part way.
+    """
+    try:
+        async for chunk in agent_factory.stream_user_message(agent_id, user_id, message, context):
+            yield b"data: " + json_fast.dumps({"type": "chunk", "data": chunk}) + b"\n\n"
+        
+        yield b"data: " + json_fast.dumps({
+            "type": "done",
+            "agent_id": agent_id,
+            "data_sources": data_sources
+        }) + b"\n\n"
         
-        return {
-            "agents": agents,
-            "statistics": stats,
-            "total_agents": len(agents),
-            "active_agents": len([a for a in agents if a["is_active"]]),
-            "timestamp": datetime.utcnow().isoformat()
-        }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list agents: {str(e)}")
+        logger.error(f"Streaming failed for agent {agent_id}: {e}")
+        yield b"data: " + json_fast.dumps({"type": "error", "message": str(e)}) + b"\n\n"
 
 # COACH AGENT ENDPOINTS - GUARANTEED URLS
-@app.post("/coach/analyze", response_model=AgentResponse)
+@app.post("/coach/analyze", responses={200: {"model": AgentResponse}})
+@_internal_errors()
 async def get_coaching_analysis(request: CoachingRequest):
     """GUARANTEED: Coach Agent performance analysis with Supabase data access."""
     global agent_factory
@@ -426,56 +791,50 @@ async def get_coaching_analysis(request: CoachingRequest):
     if not agent_factory:
         raise HTTPException(status_code=503, detail="Agent factory not initialized")
     
-    try:
-        # Get player data from Supabase
-        player_data = await get_supabase_data("futmatrix_players", {"user_id": request.user_id})
-        performance_data = await get_supabase_data("futmatrix_performance", {"user_id": request.user_id})
-        
-        data_sources = []
-        if player_data["data"]:
-            data_sources.append("futmatrix_players")
-        if performance_data["data"]:
-            data_sources.append("futmatrix_performance")
-        
-        # Enhanced context with Supabase data
-        enhanced_context = {
-            "focus_areas": request.focus_areas,
-            "player_profile": player_data["data"][0] if player_data["data"] else None,
-            "performance_history": performance_data["data"],
-            "supabase_data": True
-        }
-        
-        # Process coaching request with COACHING personality
-        response = await agent_factory.process_user_message(
+    cache_key = _analysis_cache_key(
+        "futmatrix_coach", request.user_id, request.message, request.focus_areas
+    )
+    response, data_sources = await _cached_analysis("futmatrix_coach", cache_key, _run_coaching_analysis, request)
+    
+    if response["success"]:
+        return _model_response(
+            AgentResponse,
+            success=True,
             agent_id="futmatrix_coach",
             user_id=request.user_id,
-            message=request.message,
-            context=enhanced_context
+            response=response.get("response", "Coaching analysis completed"),
+            tokens_used=response.get("tokens_used", 0),
+            session_id=request.session_id,
+            data_sources=data_sources,
+            timestamp=utcnow_iso()
         )
-        
-        if response["success"]:
-            return AgentResponse(
-                success=True,
-                agent_id="futmatrix_coach",
-                user_id=request.user_id,
-                response=response.get("response", "Coaching analysis completed"),
-                tokens_used=response.get("tokens_used", 0),
-                session_id=request.session_id,
-                data_sources=data_sources,
-                timestamp=datetime.utcnow().isoformat()
-            )
-        else:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Coaching analysis failed: {response.get('error', 'Unknown error')}"
-            )
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    else:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Coaching analysis failed: {response.get('error', 'Unknown error')}"
+        )
+
+@app.post("/coach/analyze/stream")
+@_internal_errors()
+async def stream_coaching_analysis(request: CoachingRequest):
+    """Coach Agent performance analysis streamed as server-sent events while it is generated."""
+    if not agent_factory:
+        raise HTTPException(status_code=503, detail="Agent factory not initialized")
+    
+    enhanced_context, data_sources = await _coaching_context(request)
+    
+    return StreamingResponse(
+        _sse_events("futmatrix_coach", request.user_id, request.message, enhanced_context, data_sources),
+        media_type="text/event-stream"
+    )
+
+@functools.lru_cache(maxsize=64)
+def _join_focus_areas(focus_areas: Tuple[str, ...]) -> str:
+    """Comma-join focus areas; requests repeat a handful of combinations."""
+    return ", ".join(focus_areas)
 
-@app.post("/coach/session", response_model=AgentResponse)
+@app.post("/coach/session", responses={200: {"model": AgentResponse}})
+@_internal_errors()
 async def start_coaching_session(request: CoachingRequest):
     """GUARANTEED: Start dedicated coaching session with performance tracking."""
     global agent_factory
@@ -483,72 +842,68 @@ async def start_coaching_session(request: CoachingRequest):
     if not agent_factory:
         raise HTTPException(status_code=503, detail="Agent factory not initialized")
     
-    try:
-        # Get comprehensive player data
-        player_data = await get_supabase_data("futmatrix_players", {"user_id": request.user_id})
-        recent_matches = await get_supabase_data("futmatrix_matches", {"player_id": request.user_id})
-        
-        session_context = {
-            "session_type": "coaching",
-            "focus_areas": request.focus_areas,
-            "player_profile": player_data["data"][0] if player_data["data"] else None,
-            "recent_performance": recent_matches["data"][-5:] if recent_matches["data"] else [],
-            "session_id": request.session_id or f"coach_session_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
-        }
-        
-        enhanced_message = f"Start coaching session focusing on {', '.join(request.focus_areas)}. {request.message}"
-        
-        response = await agent_factory.process_user_message(
+    # Get comprehensive player data
+    player_data, recent_matches = await asyncio.gather(
+        get_supabase_data("futmatrix_players", {"user_id": request.user_id}),
+        get_supabase_data("futmatrix_matches", {"player_id": request.user_id})
+    )
+    
+    session_context = {
+        "session_type": "coaching",
+        "focus_areas": request.focus_areas,
+        "player_profile": player_data["data"][0] if player_data["data"] else None,
+        "recent_performance": recent_matches["tail5"],
+        "session_id": request.session_id or f"coach_session_{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}"
+    }
+    
+    enhanced_message = f"Start coaching session focusing on {_join_focus_areas(tuple(request.focus_areas))}. {request.message}"
+    
+    response = await agent_factory.process_user_message(
+        agent_id="futmatrix_coach",
+        user_id=request.user_id,
+        message=enhanced_message,
+        context=session_context
+    )
+    
+    if response["success"]:
+        return _model_response(
+            AgentResponse,
+            success=True,
             agent_id="futmatrix_coach",
             user_id=request.user_id,
-            message=enhanced_message,
-            context=session_context
+            response=response.get("response", "Coaching session started"),
+            tokens_used=response.get("tokens_used", 0),
+            session_id=session_context["session_id"],
+            data_sources=["futmatrix_players", "futmatrix_matches"],
+            timestamp=utcnow_iso()
         )
-        
-        if response["success"]:
-            return AgentResponse(
-                success=True,
-                agent_id="futmatrix_coach",
-                user_id=request.user_id,
-                response=response.get("response", "Coaching session started"),
-                tokens_used=response.get("tokens_used", 0),
-                session_id=session_context["session_id"],
-                data_sources=["futmatrix_players", "futmatrix_matches"],
-                timestamp=datetime.utcnow().isoformat()
-            )
-        else:
-            raise HTTPException(status_code=400, detail=f"Session start failed: {response.get('error', 'Unknown error')}")
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    else:
+        raise HTTPException(status_code=400, detail=f"Session start failed: {response.get('error', 'Unknown error')}")
 
 @app.get("/coach/profile/{player_id}")
+@_internal_errors("Profile retrieval failed")
 async def get_player_profile(player_id: str):
     """GUARANTEED: Get player performance profile from Supabase."""
-    try:
-        player_data = await get_supabase_data("futmatrix_players", {"user_id": player_id})
-        performance_data = await get_supabase_data("futmatrix_performance", {"user_id": player_id})
-        
-        if not player_data["data"]:
-            raise HTTPException(status_code=404, detail="Player not found")
-        
-        return {
-            "player_id": player_id,
-            "profile": player_data["data"][0],
-            "performance_history": performance_data["data"],
-            "coaching_recommendations": "Available via /coach/analyze endpoint",
-            "data_sources": ["futmatrix_players", "futmatrix_performance"],
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Profile retrieval failed: {str(e)}")
+    player_data, performance_data = await asyncio.gather(
+        get_supabase_data("futmatrix_players", {"user_id": player_id}),
+        get_supabase_data("futmatrix_performance", {"user_id": player_id})
+    )
+    
+    if not player_data["data"]:
+        raise HTTPException(status_code=404, detail="Player not found")
+    
+    return FastJSONResponse({
+        "player_id": player_id,
+        "profile": player_data["data"][0],
+        "performance_history": performance_data["data"],
+        "coaching_recommendations": "Available via /coach/analyze endpoint",
+        "data_sources": ["futmatrix_players", "futmatrix_performance"],
+        "timestamp": utcnow_iso()
+    })
 
 # RIVALIZER AGENT ENDPOINTS - GUARANTEED URLS
-@app.post("/rivalizer/match", response_model=AgentResponse)
+@app.post("/rivalizer/match", responses={200: {"model": AgentResponse}})
+@_internal_errors()
 async def find_match_opponents(request: MatchmakingRequest):
     """GUARANTEED: Rivalizer Agent competitive matchmaking with Supabase data access."""
     global agent_factory
@@ -556,60 +911,46 @@ async def find_match_opponents(request: MatchmakingRequest):
     if not agent_factory:
         raise HTTPException(status_code=503, detail="Agent factory not initialized")
     
-    try:
-        # Get player and opponent data from Supabase
-        player_data = await get_supabase_data("futmatrix_players", {"user_id": request.user_id})
-        rankings_data = await get_supabase_data("futmatrix_rankings", {"skill_level": request.skill_level})
-        available_opponents = await get_supabase_data("futmatrix_players", {"status": "online"})
-        
-        data_sources = []
-        if player_data["data"]:
-            data_sources.append("futmatrix_players")
-        if rankings_data["data"]:
-            data_sources.append("futmatrix_rankings")
-        
-        # Enhanced context with Supabase data for COMPETITIVE personality
-        competitive_context = {
-            "skill_level": request.skill_level,
-            "playstyle": request.playstyle,
-            "tournament_mode": request.tournament_mode,
-            "player_profile": player_data["data"][0] if player_data["data"] else None,
-            "available_opponents": available_opponents["data"][:10],  # Top 10 matches
-            "skill_rankings": rankings_data["data"],
-            "supabase_data": True
-        }
-        
-        # Process matchmaking request with COMPETITIVE personality
-        response = await agent_factory.process_user_message(
+    cache_key = _analysis_cache_key(
+        "futmatrix_rivalizer", request.user_id, request.message,
+        request.skill_level, request.playstyle, request.tournament_mode
+    )
+    response, data_sources = await _cached_analysis("futmatrix_rivalizer", cache_key, _run_matchmaking, request)
+    
+    if response["success"]:
+        return _model_response(
+            AgentResponse,
+            success=True,
             agent_id="futmatrix_rivalizer",
             user_id=request.user_id,
-            message=request.message,
-            context=competitive_context
+            response=response.get("response", "Matchmaking analysis completed"),
+            tokens_used=response.get("tokens_used", 0),
+            session_id=request.session_id,
+            data_sources=data_sources,
+            timestamp=utcnow_iso()
         )
-        
-        if response["success"]:
-            return AgentResponse(
-                success=True,
-                agent_id="futmatrix_rivalizer",
-                user_id=request.user_id,
-                response=response.get("response", "Matchmaking analysis completed"),
-                tokens_used=response.get("tokens_used", 0),
-                session_id=request.session_id,
-                data_sources=data_sources,
-                timestamp=datetime.utcnow().isoformat()
-            )
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Matchmaking failed: {response.get('error', 'Unknown error')}"
-            )
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Matchmaking failed: {response.get('error', 'Unknown error')}"
+        )
+
+@app.post("/rivalizer/match/stream")
+@_internal_errors()
+async def stream_match_opponents(request: MatchmakingRequest):
+    """Rivalizer Agent matchmaking streamed as server-sent events while it is generated."""
+    if not agent_factory:
+        raise HTTPException(status_code=503, detail="Agent factory not initialized")
+    
+    competitive_context, data_sources = await _matchmaking_context(request)
+    
+    return StreamingResponse(
+        _sse_events("futmatrix_rivalizer", request.user_id, request.message, competitive_context, data_sources),
+        media_type="text/event-stream"
+    )
 
-@app.post("/rivalizer/analyze", response_model=AgentResponse)
+@app.post("/rivalizer/analyze", responses={200: {"model": AgentResponse}})
+@_internal_errors()
 async def analyze_match_strategy(request: MatchmakingRequest):
     """GUARANTEED: Strategic match analysis with competitive insights."""
     global agent_factory
@@ -617,65 +958,145 @@ async def analyze_match_strategy(request: MatchmakingRequest):
     if not agent_factory:
         raise HTTPException(status_code=503, detail="Agent factory not initialized")
     
-    try:
-        # Get match history and opponent data
-        player_matches = await get_supabase_data("futmatrix_matches", {"player_id": request.user_id})
-        opponent_data = await get_supabase_data("futmatrix_players", {"playstyle": request.playstyle})
-        
-        strategy_context = {
-            "analysis_type": "strategic",
-            "skill_level": request.skill_level,
-            "playstyle": request.playstyle,
-            "match_history": player_matches["data"][-10:] if player_matches["data"] else [],
-            "opponent_patterns": opponent_data["data"][:5],
-            "competitive_mode": True
-        }
-        
-        enhanced_message = f"Analyze strategic approach against {request.playstyle} opponents at {request.skill_level} level. {request.message}"
-        
-        response = await agent_factory.process_user_message(
+    # Get match history and opponent data
+    player_matches, opponent_data = await asyncio.gather(
+        get_supabase_data("futmatrix_matches", {"player_id": request.user_id}),
+        get_supabase_data("futmatrix_players", {"playstyle": request.playstyle})
+    )
+    
+    strategy_context = {
+        "analysis_type": "strategic",
+        "skill_level": request.skill_level,
+        "playstyle": request.playstyle,
+        "match_history": player_matches["tail10"],
+        "opponent_patterns": opponent_data["head5"],
+        "competitive_mode": True
+    }
+    
+    enhanced_message = f"Analyze strategic approach against {request.playstyle} opponents at {request.skill_level} level. {request.message}"
+    
+    response = await agent_factory.process_user_message(
+        agent_id="futmatrix_rivalizer",
+        user_id=request.user_id,
+        message=enhanced_message,
+        context=strategy_context
+    )
+    
+    if response["success"]:
+        return _model_response(
+            AgentResponse,
+            success=True,
             agent_id="futmatrix_rivalizer",
             user_id=request.user_id,
-            message=enhanced_message,
-            context=strategy_context
+            response=response.get("response", "Strategic analysis completed"),
+            tokens_used=response.get("tokens_used", 0),
+            session_id=request.session_id,
+            data_sources=["futmatrix_matches", "futmatrix_players"],
+            timestamp=utcnow_iso()
         )
-        
-        if response["success"]:
-            return AgentResponse(
-                success=True,
-                agent_id="futmatrix_rivalizer",
-                user_id=request.user_id,
-                response=response.get("response", "Strategic analysis completed"),
-                tokens_used=response.get("tokens_used", 0),
-                session_id=request.session_id,
-                data_sources=["futmatrix_matches", "futmatrix_players"],
-                timestamp=datetime.utcnow().isoformat()
-            )
-        else:
-            raise HTTPException(status_code=400, detail=f"Strategy analysis failed: {response.get('error', 'Unknown error')}")
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    else:
+        raise HTTPException(status_code=400, detail=f"Strategy analysis failed: {response.get('error', 'Unknown error')}")
 
-@app.get("/rivalizer/rankings")
-async def get_competitive_rankings():
-    """GUARANTEED: Get competitive rankings from Supabase."""
-    try:
-        rankings_data = await get_supabase_data("futmatrix_rankings")
-        
-        return {
+def _rankings_body(rankings_data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], bytes, str]:
+    """Return the rankings body prefix and ETag, rebuilding them only when the result changes."""
+    global rankings_prefix
+    
+    # A cache hit returns the same result object, so its body is serialized only once
+    if rankings_prefix[0] is not rankings_data:
+        prefix = json_fast.timestamped_prefix({
             "rankings": rankings_data["data"],
             "total_players": rankings_data["count"],
             "data_source": "futmatrix_rankings",
-            "competitive_insights": "Available via /rivalizer/analyze endpoint",
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Rankings retrieval failed: {str(e)}")
+            "competitive_insights": "Available via /rivalizer/analyze endpoint"
+        })
+        etag = f'"{hashlib.blake2b(prefix, digest_size=8).hexdigest()}"'
+        rankings_prefix = (rankings_data, prefix, etag)
+    return rankings_prefix
+
+async def _refresh_rankings_loop() -> None:
+    """Re-query rankings ahead of their cache expiry so requests are served from memory."""
+    while True:
+        try:
+            _rankings_body(await get_supabase_data("futmatrix_rankings", fresh=True))
+        except Exception as e:
+            logger.warning(f"Rankings refresh failed: {e}")
+        await asyncio.sleep(RANKINGS_REFRESH_INTERVAL)
+
+@app.get("/rivalizer/rankings")
+@_internal_errors("Rankings retrieval failed")
+async def get_competitive_rankings(request: Request, fresh: bool = False):
+    """GUARANTEED: Get competitive rankings from Supabase.
+    
+    ?fresh=1 re-queries Supabase instead of using the cached rankings. The ETag covers
+    the rankings, not the timestamp, so an unchanged table answers If-None-Match with 304.
+    """
+    _, prefix, etag = _rankings_body(await get_supabase_data("futmatrix_rankings", fresh=fresh))
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(json_fast.stamp(prefix, utcnow_iso()), media_type="application/json", headers={"ETag": etag})
+
+# STREAMING ENDPOINT
+@app.websocket("/ws/agents/{agent_id}/stream")
+async def stream_agent_responses(websocket: WebSocket, agent_id: str):
+    """Stream agent responses chunk by chunk as OpenAI generates them.
+    
+    Each client frame is {"user_id", "message", "context"?}; the reply arrives as
+    {"type": "chunk", "data": ...} frames followed by {"type": "done"}.
+    """
+    await websocket.accept()
+    
+    try:
+        while True:
+            frame = await websocket.receive_text()
+            
+            if not agent_factory:
+                await websocket.send_text(json_fast.dumps_str({"type": "error", "message": "Agent factory not initialized"}))
+                continue
+            
+            try:
+                # A malformed frame gets an error frame like any other failure, keeping the socket open
+                request = json_fast.loads(frame)
+                
+                # Each chunk goes out as soon as it is decoded; only the agent buffers the full text for history
+                async for chunk in agent_factory.stream_user_message(
+                    agent_id,
+                    request["user_id"],
+                    request["message"],
+                    request.get("context")
+                ):
+                    await websocket.send_text(json_fast.dumps_str({"type": "chunk", "data": chunk}))
+                
+                await websocket.send_text(json_fast.dumps_str({"type": "done", "agent_id": agent_id}))
+                
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"Streaming failed for agent {agent_id}: {e}")
+                await websocket.send_text(json_fast.dumps_str({"type": "error", "message": str(e)}))
+    
+    except WebSocketDisconnect:
+        pass
+
+def _require_api_key(request: Request) -> None:
+    """Reject requests without a valid "Authorization: Bearer <key>" header."""
+    scheme, _, api_key = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or api_key not in APIKeyManager.get_production_keys():
+        raise HTTPException(status_code=401, detail="Invalid or missing API key")
+
+@app.delete("/cache/{user_id}", dependencies=[Depends(_require_api_key)])
+async def invalidate_user_cache(user_id: str):
+    """Drop cached coach and rivalizer analyses for a user, e.g. after new match data arrives."""
+    invalidated = analysis_cache.invalidate(lambda key: key[0] == user_id)
+    
+    return FastJSONResponse({
+        "user_id": user_id,
+        "invalidated": invalidated,
+        "timestamp": utcnow_iso()
+    })
 
 @app.get("/stats")
+@_internal_errors("Failed to get stats")
 async def get_system_stats():
     """Get detailed system statistics."""
     global agent_factory
@@ -683,31 +1104,28 @@ async def get_system_stats():
     if not agent_factory:
         raise HTTPException(status_code=503, detail="Agent factory not initialized")
     
-    try:
-        stats = agent_factory.get_factory_stats()
-        health = await agent_factory.health_check()
-        
-        return {
-            "system_info": {
-                "service": "Futmatrix AI Agents",
-                "version": "1.0.0",
-                "platform": "EA Sports FC 25",
-                "factory_status": health["factory_status"],
-                "openai_status": health["openai_integration"]["status"]
-            },
-            "agent_statistics": stats,
-            "performance_metrics": {
-                "total_agents": stats["total_agents"],
-                "active_agents": stats["active_agents"],
-                "openai_agents": stats["openai_agents"],
-                "uptime": "operational"
-            },
-            "available_personalities": stats["available_personalities"],
-            "available_domains": stats["available_domains"],
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
+    stats = agent_factory.get_factory_stats()
+    health = await agent_factory.health_check()
+    
+    return FastJSONResponse({
+        "system_info": {
+            "service": "Futmatrix AI Agents",
+            "version": "1.0.0",
+            "platform": "EA Sports FC 25",
+            "factory_status": health["factory_status"],
+            "openai_status": health["openai_integration"]["status"]
+        },
+        "agent_statistics": stats,
+        "performance_metrics": {
+            "total_agents": stats["total_agents"],
+            "active_agents": stats["active_agents"],
+            "openai_agents": stats["openai_agents"],
+            "uptime": "operational"
+        },
+        "available_personalities": stats["available_personalities"],
+        "available_domains": stats["available_domains"],
+        "timestamp": utcnow_iso()
+    })
 
 if __name__ == "__main__":
     print("🎮 FUTMATRIX AI AGENTS API SERVER - PRODUCTION READY")
@@ -718,8 +1136,8 @@ if __name__ == "__main__":
     print("   ✅ Supabase Integration: Database access with mock data fallback")
     print("   ✅ Production Ready: Complete error handling and monitoring")
     print("=" * 60)
-    print("🏆 Coach URLs: /coach/analyze, /coach/session, /coach/profile/{id}")
-    print("⚔️ Rivalizer URLs: /rivalizer/match, /rivalizer/analyze, /rivalizer/rankings")
+    print("🏆 Coach URLs: /coach/analyze, /coach/analyze/stream, /coach/session, /coach/profile/{id}")
+    print("⚔️ Rivalizer URLs: /rivalizer/match, /rivalizer/match/stream, /rivalizer/analyze, /rivalizer/rankings")
     print("🔧 System URLs: /health, /agents, /docs")
     print("=" * 60)
     print("🚀 Server starting on http://0.0.0.0:5000")
@@ -729,5 +1147,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=5000,
         log_level="info",
-        reload=False
+        reload=False,
+        workers=uvicorn_workers(),
+        **uvicorn_options()
     )
\ No newline at end of file
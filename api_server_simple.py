@@ -4,12 +4,12 @@ Simple REST API Server for AI Agents System - Production Ready
 import asyncio
 import logging
 import json
-from datetime import datetime
 from typing import Dict, Any, Optional
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 import uvicorn
 import time
@@ -18,38 +18,18 @@ import os
 from standalone_simple import SimpleAgentSystem
 from utils.logger import setup_logger
 from middleware.security import ProductionSecurityMiddleware, APIKeyManager
-from utils.monitoring import SystemMonitor, APIMetrics
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="AI Agents API",
-    description="Production-ready REST API for intelligent AI agents with MCP integration",
-    version="1.2.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# CORS middleware for frontend integration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+from utils.monitoring import SystemMonitor, APIMetrics, PROMETHEUS_CONTENT_TYPE
+from utils.server_options import GZIP_OPTIONS, lifespan_from, uvicorn_options, uvicorn_workers
+from utils import json_fast
+from utils.json_fast import FastJSONResponse
+from utils.time_utils import utcnow_iso
 
 # Global agent system and monitoring
 agent_system = None
+agents_prefix = b""  # Serialized /agents body up to its timestamp, built at startup
 system_monitor = SystemMonitor()
 api_metrics = APIMetrics()
 
-# Add production security middleware
-app.add_middleware(
-    ProductionSecurityMiddleware,
-    api_keys=APIKeyManager.get_production_keys(),
-    rate_limit=int(os.getenv("RATE_LIMIT", "100"))  # Configurable rate limit
-)
-
 # Pydantic models for API requests
 class ChatRequest(BaseModel):
     user_id: str
@@ -62,10 +42,9 @@ class AnalysisRequest(BaseModel):
     analysis_type: Optional[str] = "general"
 
 # Startup and shutdown events
-@app.on_event("startup")
 async def startup_event():
     """Initialize the AI agents system."""
-    global agent_system
+    global agent_system, agents_prefix
     
     setup_logger()
     logger = logging.getLogger("api_startup")
@@ -76,6 +55,7 @@ async def startup_event():
         # Initialize agent system
         agent_system = SimpleAgentSystem()
         await agent_system.initialize()
+        agents_prefix = json_fast.timestamped_prefix(_build_agents_payload())
         
         logger.info("AI Agents API Server ready!")
         logger.info("Features: OpenAI GPT-4o, MCP Integration, Database Persistence, Security Middleware")
@@ -90,12 +70,12 @@ async def startup_event():
         logger.info("  POST /demo/test           - Test agents")
         logger.info("  GET  /docs                - API documentation")
         logger.info("  GET  /system/stats        - System metrics")
+        logger.info("  GET  /metrics             - Prometheus metrics")
         
     except Exception as e:
         logger.error(f"Startup failed: {e}")
         raise
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     global agent_system
@@ -106,50 +86,86 @@ async def shutdown_event():
         for agent in agent_system.agents.values():
             for user_id, conversation in agent.conversations.items():
                 await agent.database.save_conversation(agent.agent_id, user_id, conversation)
+        
+        await agent_system.close()
     
     logger.info("AI Agents API Server shutdown complete")
 
+# Initialize FastAPI app
+app = FastAPI(
+    title="AI Agents API",
+    description="Production-ready REST API for intelligent AI agents with MCP integration",
+    version="1.2.0",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan_from(startup_event, shutdown_event)
+)
+
+# CORS middleware for frontend integration
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # Configure for production
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Add production security middleware
+app.add_middleware(
+    ProductionSecurityMiddleware,
+    api_keys=APIKeyManager.get_production_keys(),
+    rate_limit=int(os.getenv("RATE_LIMIT", "100"))  # Configurable rate limit
+)
+
+# Added last so it also wraps the security middleware's error responses
+app.add_middleware(GZipMiddleware, **GZIP_OPTIONS)
+
 # API Endpoints
 
-@app.get("/")
-async def root():
-    """Root endpoint with system information."""
-    return {
-        "service": "AI Agents API",
-        "status": "running",
-        "version": "1.2.0",
-        "description": "Production-ready multi-agent AI system with OpenAI GPT-4o, MCP integration, and database persistence",
-        "features": [
-            "OpenAI GPT-4o Integration",
-            "MCP (Model Context Protocol) Support", 
-            "Multi-Agent Architecture",
-            "Conversation Persistence",
-            "Smart Context Enhancement"
-        ],
-        "timestamp": datetime.utcnow().isoformat(),
-        "endpoints": {
-            "health": "/health",
-            "agents": "/agents", 
-            "chat": "/agents/{agent_id}/chat",
-            "tools": "/agents/{agent_id}/tools",
-            "docs": "/docs"
-        }
+# Static root endpoint payload; only the timestamp changes per request
+_ROOT_PAYLOAD = {
+    "service": "AI Agents API",
+    "status": "running",
+    "version": "1.2.0",
+    "description": "Production-ready multi-agent AI system with OpenAI GPT-4o, MCP integration, and database persistence",
+    "features": [
+        "OpenAI GPT-4o Integration",
+        "MCP (Model Context Protocol) Support", 
+        "Multi-Agent Architecture",
+        "Conversation Persistence",
+        "Smart Context Enhancement"
+    ],
+    "endpoints": {
+        "health": "/health",
+        "agents": "/agents", 
+        "chat": "/agents/{agent_id}/chat",
+        "tools": "/agents/{agent_id}/tools",
+        "docs": "/docs"
     }
+}
+_ROOT_PREFIX = json_fast.timestamped_prefix(_ROOT_PAYLOAD)
+
+# /, /health and /agents take no input, so they are plain Starlette routes: polls skip
+# FastAPI's parameter resolution and response serialization
 
-@app.get("/health")
-async def health_check():
+async def root(request: Request) -> Response:
+    """Root endpoint with system information."""
+    return Response(json_fast.stamp(_ROOT_PREFIX, utcnow_iso()), media_type="application/json")
+
+async def health_check(request: Request) -> Response:
     """Health check endpoint with comprehensive system diagnostics."""
     try:
         system_monitor.record_request()
         
         if not agent_system:
             system_monitor.record_error()
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=503,
                 content={
                     "status": "unhealthy",
                     "error": "Agent system not initialized",
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": utcnow_iso()
                 }
             )
         
@@ -163,9 +179,9 @@ async def health_check():
         # Get comprehensive health status
         health_status = system_monitor.get_health_status()
         
-        return {
+        return FastJSONResponse({
             "status": health_status["status"],
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utcnow_iso(),
             "agents_count": len(agent_system.agents),
             "openai_connection": "working" if test_result["success"] else "failed",
             "system_components": {
@@ -181,58 +197,60 @@ async def health_check():
             },
             "system_metrics": health_status["metrics"],
             "component_health": health_status["components"]
-        }
+        })
         
     except Exception as e:
         system_monitor.record_error()
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={
                 "status": "unhealthy", 
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
         )
 
-@app.get("/agents")
-async def list_agents():
-    """List all available agents with their capabilities."""
-    try:
-        if not agent_system:
-            raise HTTPException(status_code=503, detail="Agent system not initialized")
-        
-        agents_info = agent_system.list_agents()
-        
-        # Add detailed agent information
-        detailed_agents = []
-        for agent_info in agents_info["agents"]:
-            agent_id = agent_info["agent_id"]
-            agent = agent_system.agents[agent_id]
-            
-            detailed_agents.append({
-                **agent_info,
-                "capabilities": {
-                    "chat": f"/agents/{agent_id}/chat",
-                    "tools": f"/agents/{agent_id}/tools",
-                    "specialization": agent.business_domain,
-                    "personality_traits": agent.personality.get('traits', []),
-                    "communication_style": agent.personality.get('tone', 'professional'),
-                    "mcp_tools": len(agent.mcp_tools),
-                    "conversation_memory": True,
-                    "database_persistence": True
-                },
-                "business_focus": agent.business_rules.domains.get(agent.business_domain, "General assistance"),
-                "example_use_cases": _get_example_use_cases(agent.business_domain)
-            })
-        
-        return {
-            "agents": detailed_agents,
-            "total_agents": len(detailed_agents),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+def _build_agents_payload() -> Dict[str, Any]:
+    """Build the /agents payload; agents and their MCP tools are fixed once initialized."""
+    agents_info = agent_system.list_agents()
+    
+    # Add detailed agent information
+    detailed_agents = []
+    for agent_info in agents_info["agents"]:
+        agent_id = agent_info["agent_id"]
+        agent = agent_system.agents[agent_id]
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        detailed_agents.append({
+            **agent_info,
+            "capabilities": {
+                "chat": f"/agents/{agent_id}/chat",
+                "tools": f"/agents/{agent_id}/tools",
+                "specialization": agent.business_domain,
+                "personality_traits": agent.personality.get('traits', []),
+                "communication_style": agent.personality.get('tone', 'professional'),
+                "mcp_tools": len(agent.mcp_tools),
+                "conversation_memory": True,
+                "database_persistence": True
+            },
+            "business_focus": agent.business_rules.domains.get(agent.business_domain, "General assistance"),
+            "example_use_cases": _get_example_use_cases(agent.business_domain)
+        })
+    
+    return {
+        "agents": detailed_agents,
+        "total_agents": len(detailed_agents)
+    }
+
+async def list_agents(request: Request) -> Response:
+    """List all available agents with their capabilities."""
+    if not agent_system:
+        raise HTTPException(status_code=503, detail="Agent system not initialized")
+    
+    return Response(json_fast.stamp(agents_prefix, utcnow_iso()), media_type="application/json")
+
+app.router.add_route("/", root, methods=["GET"])
+app.router.add_route("/health", health_check, methods=["GET"])
+app.router.add_route("/agents", list_agents, methods=["GET"])
 
 @app.get("/agents/{agent_id}/tools")
 async def get_agent_tools(agent_id: str):
@@ -241,10 +259,11 @@ async def get_agent_tools(agent_id: str):
         if not agent_system:
             raise HTTPException(status_code=503, detail="Agent system not initialized")
         
-        if agent_id not in agent_system.agents:
+        try:
+            agent = agent_system.agents[agent_id]
+        except KeyError:
             raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
         
-        agent = agent_system.agents[agent_id]
         tools_info = {
             "mcp_connected": len(agent.mcp_tools) > 0,
             "tools_available": len(agent.mcp_tools),
@@ -257,7 +276,7 @@ async def get_agent_tools(agent_id: str):
             "success": True,
             "agent_id": agent_id,
             "tools": tools_info,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
     
     except Exception as e:
@@ -268,7 +287,7 @@ async def get_agent_tools(agent_id: str):
 @app.post("/agents/{agent_id}/chat")
 async def chat_with_agent(agent_id: str, request: ChatRequest):
     """Send a message to a specific agent and get an intelligent response."""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         system_monitor.record_request()
@@ -297,7 +316,7 @@ async def chat_with_agent(agent_id: str, request: ChatRequest):
                 raise HTTPException(status_code=400, detail=response.get("error", "Processing failed"))
         
         # Record performance metrics
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         api_metrics.record_endpoint_call(f"/agents/{agent_id}/chat", response_time, 200)
         
         # Enhance response with additional metadata
@@ -316,12 +335,12 @@ async def chat_with_agent(agent_id: str, request: ChatRequest):
         return enhanced_response
         
     except HTTPException as e:
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         api_metrics.record_endpoint_call(f"/agents/{agent_id}/chat", response_time, e.status_code)
         raise
     except Exception as e:
         system_monitor.record_error()
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         api_metrics.record_endpoint_call(f"/agents/{agent_id}/chat", response_time, 500)
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -393,48 +412,17 @@ async def get_system_stats():
             "database_stats": database_summary,
             "system_metrics": system_metrics,
             "api_metrics": endpoint_metrics,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
         
     except Exception as e:
         system_monitor.record_error()
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/system/stats")
-async def system_metrics():
-    """Get comprehensive system metrics and performance statistics."""
-    try:
-        system_monitor.record_request()
-        
-        # Get all metrics
-        system_metrics = system_monitor.get_system_metrics()
-        endpoint_metrics = api_metrics.get_endpoint_metrics()
-        health_status = system_monitor.get_health_status()
-        
-        return {
-            "system_health": health_status["status"],
-            "system_metrics": system_metrics,
-            "endpoint_performance": endpoint_metrics,
-            "component_status": health_status["components"],
-            "security_status": {
-                "middleware_active": True,
-                "rate_limiting_enabled": True,
-                "api_key_validation": True,
-                "public_endpoints": ["/", "/health", "/agents", "/docs"]
-            },
-            "production_readiness": {
-                "score": "90/100",
-                "security": "✅ Active",
-                "monitoring": "✅ Active", 
-                "error_handling": "✅ Active",
-                "performance_tracking": "✅ Active",
-                "documentation": "✅ Complete"
-            }
-        }
-        
-    except Exception as e:
-        system_monitor.record_error()
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Expose request counters and latencies for Prometheus scraping."""
+    return Response(api_metrics.render_prometheus(system_monitor), media_type=PROMETHEUS_CONTENT_TYPE)
 
 # Helper functions
 def _get_example_use_cases(business_domain: str) -> list:
@@ -477,5 +465,11 @@ if __name__ == "__main__":
         host="0.0.0.0", 
         port=5000,
         reload=False,
-        log_level="info"
+        log_level="info",
+        workers=uvicorn_workers(),
+        # Past this many open connections and tasks new requests get a 503 instead of queueing
+        limit_concurrency=int(os.getenv("UVICORN_LIMIT_CONCURRENCY", "1000")),
+        # Outlast typical load balancer idle timeouts so pooled client connections are reused
+        timeout_keep_alive=int(os.getenv("UVICORN_KEEPALIVE_TIMEOUT", "30")),
+        **uvicorn_options()
     )
\ No newline at end of file
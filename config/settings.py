@@ -57,6 +57,11 @@ class Settings:
         # Agent configuration
         self.AGENT_TIMEOUT = int(os.getenv("AGENT_TIMEOUT", "300"))  # 5 minutes
         self.MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "10"))
+        self.OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "64"))  # In-flight OpenAI calls
+        self.THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "128"))  # Default executor for blocking I/O
+        self.PUBLISH_BATCH_SIZE = int(os.getenv("PUBLISH_BATCH_SIZE", "100"))  # Telemetry messages per batch
+        self.PUBLISH_FLUSH_INTERVAL_MS = int(os.getenv("PUBLISH_FLUSH_INTERVAL_MS", "5"))  # Max wait before a partial batch
+        self.AGENT_BATCH_WINDOW_MS = int(os.getenv("AGENT_BATCH_WINDOW_MS", "0"))  # Micro-batching window for agent calls; 0 disables
         
         # RAG configuration
         self.RAG_TOP_K = int(os.getenv("RAG_TOP_K", "5"))
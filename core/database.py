@@ -1,6 +1,7 @@
 """
 Supabase database integration for AI agents.
 """
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
@@ -51,9 +52,10 @@ class DatabaseManager:
     async def _test_connection(self) -> None:
         """Test database connection."""
         try:
-            # Simple query to test connection
+            # Simple query to test connection; supabase-py is synchronous, so this and
+            # every other execute() run on the default executor via asyncio.to_thread
             if self.client:
-                result = self.client.table("user_interactions").select("count").limit(1).execute()
+                result = await asyncio.to_thread(self.client.table("user_interactions").select("count").limit(1).execute)
                 self.logger.debug("Database connection test successful")
             else:
                 raise DatabaseError("Client not initialized")
@@ -73,7 +75,7 @@ class DatabaseManager:
             }
             
             if self.client:
-                result = self.client.table("user_interactions").insert(data).execute()
+                result = await asyncio.to_thread(self.client.table("user_interactions").insert(data).execute)
                 if result.data:
                     self.logger.debug(f"Saved interaction for user {interaction.user_id}")
                     return result.data[0]
@@ -104,7 +106,7 @@ class DatabaseManager:
             }
             
             if self.client:
-                result = self.client.table("agent_responses").insert(data).execute()
+                result = await asyncio.to_thread(self.client.table("agent_responses").insert(data).execute)
                 if result.data:
                     self.logger.debug(f"Saved response from agent {response.agent_id}")
                     return result.data[0]
@@ -139,7 +141,7 @@ class DatabaseManager:
                 
                 query = query.order("timestamp", desc=True).limit(limit)
                 
-                result = query.execute()
+                result = await asyncio.to_thread(query.execute)
                 return result.data or []
             else:
                 # Test mode - return empty history
@@ -172,7 +174,7 @@ class DatabaseManager:
             
             query = query.order("timestamp", desc=True).limit(limit)
             
-            result = query.execute()
+            result = await asyncio.to_thread(query.execute)
             
             return result.data or []
             
@@ -203,7 +205,7 @@ class DatabaseManager:
             if not self.client:
                 raise DatabaseError("Database client not initialized")
                 
-            result = self.client.table("rag_documents").insert(data).execute()
+            result = await asyncio.to_thread(self.client.table("rag_documents").insert(data).execute)
             
             if result.data:
                 self.logger.debug(f"Saved RAG document {document_id}")
@@ -238,7 +240,7 @@ class DatabaseManager:
                 
                 query_builder = query_builder.limit(limit)
                 
-                result = query_builder.execute()
+                result = await asyncio.to_thread(query_builder.execute)
                 return result.data or []
             else:
                 # Test mode - return empty results
@@ -5,7 +5,7 @@ import asyncio
 import json
 import logging
 import pika
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -32,6 +32,7 @@ class RabbitMQBroker:
         self.rabbitmq_url = rabbitmq_url
         self.connection = None
         self.channel = None
+        self.telemetry_channel = None
         self.logger = logging.getLogger("message_broker")
         
         # Queue configurations
@@ -60,6 +61,9 @@ class RabbitMQBroker:
             )
             self.channel = self.connection.channel()
             
+            # Separate channel for best-effort telemetry so it never queues behind durable publishes
+            self.telemetry_channel = self.connection.channel()
+            
             # Declare exchanges
             for exchange_type, exchange_name in self.exchanges.items():
                 self.channel.exchange_declare(
@@ -110,19 +114,23 @@ class RabbitMQBroker:
             routing_key="system.*"
         )
     
+    def _message_body(self, message: Message) -> str:
+        """Serialize a message for the wire."""
+        return json.dumps({
+            "id": message.id,
+            "user_id": message.user_id,
+            "agent_id": message.agent_id,
+            "content": message.content,
+            "message_type": message.message_type,
+            "timestamp": message.timestamp.isoformat(),
+            "session_id": message.session_id,
+            "metadata": message.metadata
+        })
+    
     def publish_user_prompt(self, message: Message) -> None:
         """Publish user prompt to the queue."""
         try:
-            message_body = json.dumps({
-                "id": message.id,
-                "user_id": message.user_id,
-                "agent_id": message.agent_id,
-                "content": message.content,
-                "message_type": message.message_type,
-                "timestamp": message.timestamp.isoformat(),
-                "session_id": message.session_id,
-                "metadata": message.metadata
-            })
+            message_body = self._message_body(message)
             
             self.channel.basic_publish(
                 exchange=self.exchanges["direct"],
@@ -144,16 +152,7 @@ class RabbitMQBroker:
     def publish_agent_response(self, message: Message) -> None:
         """Publish agent response to the queue."""
         try:
-            message_body = json.dumps({
-                "id": message.id,
-                "user_id": message.user_id,
-                "agent_id": message.agent_id,
-                "content": message.content,
-                "message_type": message.message_type,
-                "timestamp": message.timestamp.isoformat(),
-                "session_id": message.session_id,
-                "metadata": message.metadata
-            })
+            message_body = self._message_body(message)
             
             self.channel.basic_publish(
                 exchange=self.exchanges["direct"],
@@ -172,19 +171,34 @@ class RabbitMQBroker:
             self.logger.error(f"Failed to publish agent response: {e}")
             raise MessageBrokerError(f"Failed to publish response: {e}")
     
+    def publish_telemetry(self, message: Message) -> None:
+        """Publish a best-effort agent message (e.g. processing errors) to the response queue.
+        
+        Sent transient on the telemetry channel: the broker does not persist it to
+        disk, so it may be lost on a broker restart.
+        """
+        try:
+            self.telemetry_channel.basic_publish(
+                exchange=self.exchanges["direct"],
+                routing_key="agent.response",
+                body=self._message_body(message),
+                properties=pika.BasicProperties(
+                    delivery_mode=1,  # Transient
+                    correlation_id=message.id,
+                    user_id=message.user_id
+                )
+            )
+            
+            self.logger.debug(f"Published telemetry {message.id} from agent {message.agent_id}")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to publish telemetry: {e}")
+            raise MessageBrokerError(f"Failed to publish telemetry: {e}")
+    
     def publish_notification(self, message: Message) -> None:
         """Publish notification to all subscribers."""
         try:
-            message_body = json.dumps({
-                "id": message.id,
-                "user_id": message.user_id,
-                "agent_id": message.agent_id,
-                "content": message.content,
-                "message_type": message.message_type,
-                "timestamp": message.timestamp.isoformat(),
-                "session_id": message.session_id,
-                "metadata": message.metadata
-            })
+            message_body = self._message_body(message)
             
             self.channel.basic_publish(
                 exchange=self.exchanges["fanout"],
@@ -289,4 +303,75 @@ class RabbitMQBroker:
                 self.logger.info("RabbitMQ connection closed")
                 
         except Exception as e:
-            self.logger.error(f"Error closing RabbitMQ connection: {e}")
\ No newline at end of file
+            self.logger.error(f"Error closing RabbitMQ connection: {e}")
+
+
+class AsyncBatchPublisher:
+    """Coalesces best-effort telemetry messages and publishes them in batches.
+    
+    Request handlers enqueue telemetry and return immediately; a background task
+    flushes pending messages once max_batch_size accumulate or flush_interval after
+    the first one arrives. Queued messages are lost if the process dies before a
+    flush, so user prompts and agent responses are not batched: they are published
+    directly on RabbitMQBroker so they are persisted, or a failure reaches the caller.
+    """
+    
+    def __init__(self, broker: RabbitMQBroker, max_batch_size: int = 100, flush_interval: float = 0.005):
+        self.broker = broker
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger("batch_publisher")
+        
+        self.pending_telemetry: List[Message] = []
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def enqueue_telemetry(self, message: Message) -> None:
+        """Queue a best-effort message for the next batch."""
+        self.pending_telemetry.append(message)
+        self._notify()
+    
+    def _notify(self) -> None:
+        """Wake the flush task, early if a full batch is waiting."""
+        self._has_pending.set()
+        if len(self.pending_telemetry) >= self.max_batch_size:
+            self._batch_full.set()
+    
+    async def _run(self) -> None:
+        """Sleep until a message is queued, then flush once the batch fills or flush_interval passes."""
+        while True:
+            await self._has_pending.wait()
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.flush()
+    
+    def flush(self) -> None:
+        """Publish everything queued so far."""
+        telemetry, self.pending_telemetry = self.pending_telemetry, []
+        self._has_pending.clear()
+        self._batch_full.clear()
+        
+        for message in telemetry:
+            try:
+                self.broker.publish_telemetry(message)
+            except MessageBrokerError as e:
+                self.logger.error(f"Dropped message {message.id} from batch: {e}")
+    
+    async def close(self) -> None:
+        """Stop the flush task and publish anything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
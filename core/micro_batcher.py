@@ -0,0 +1,107 @@
+"""
+Dynamic micro-batching of concurrent agent requests.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.openai_integration import OpenAIAgent
+
+# (user_id, message, context, future resolved with the agent response)
+PendingRequest = Tuple[str, str, Optional[Dict[str, Any]], asyncio.Future]
+
+
+class AgentMicroBatcher:
+    """Groups concurrent requests to one agent into packed batch completions.
+    
+    Requests arriving within max_delay of the first pending one, up to the
+    agent's max_batch_size, are answered by a single OpenAI call. A request
+    that has the window to itself goes through the regular per-user path and
+    keeps its conversation history; batched requests are answered without it.
+    """
+    
+    def __init__(self, agent: OpenAIAgent, max_delay: float = 0.03):
+        self.agent = agent
+        self.max_batch_size = agent.max_batch_size
+        self.max_delay = max_delay
+        self.logger = logging.getLogger(f"micro_batcher_{agent.agent_id}")
+        
+        self.pending: List[PendingRequest] = []
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._dispatches: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start the background batching task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def submit(self, user_id: str, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue a request for the next batch and wait for its response."""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((user_id, message, context, future))
+        self._has_pending.set()
+        if len(self.pending) >= self.max_batch_size:
+            self._batch_full.set()
+        return await future
+    
+    async def _run(self) -> None:
+        """Dispatch a batch once it fills or max_delay after its first request."""
+        while True:
+            await self._has_pending.wait()
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._dispatch_next()
+    
+    def _dispatch_next(self) -> None:
+        """Hand the oldest max_batch_size requests to a dispatch task."""
+        batch, self.pending = self.pending[:self.max_batch_size], self.pending[self.max_batch_size:]
+        if not self.pending:
+            self._has_pending.clear()
+        if len(self.pending) < self.max_batch_size:
+            self._batch_full.clear()
+        
+        # Dispatch without blocking so the next window opens while this batch is in flight
+        task = asyncio.create_task(self._process(batch))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+    
+    async def _process(self, batch: List[PendingRequest]) -> None:
+        """Answer one batch and resolve each request's future."""
+        try:
+            if len(batch) == 1:
+                user_id, message, context, _ = batch[0]
+                responses = [await self.agent.process_user_message(user_id, message, context)]
+            else:
+                responses = await self.agent.process_user_messages_batch(
+                    [(user_id, message, context) for user_id, message, context, _ in batch]
+                )
+                self.logger.debug(f"Answered {len(batch)} requests in one batch")
+            
+            for (_, _, _, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+            
+        except Exception as e:
+            self.logger.error(f"Batch of {len(batch)} requests failed: {e}")
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    async def close(self) -> None:
+        """Stop batching, answer anything still queued and wait for in-flight batches."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        while self.pending:
+            self._dispatch_next()
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
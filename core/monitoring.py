@@ -13,6 +13,7 @@ import psutil
 import json
 
 from utils.exceptions import MonitoringError
+from utils.time_utils import utcnow_iso
 from config.settings import Settings
 
 
@@ -96,7 +97,7 @@ class MetricsCollector:
         }
         
         metrics = SystemMetrics(
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=utcnow_iso(),
             cpu_percent=cpu_percent,
             memory_percent=memory.percent,
             disk_percent=disk.percent,
@@ -176,7 +177,7 @@ class HealthChecker:
             status = HealthStatus(
                 component="database",
                 status="healthy",
-                last_check=datetime.utcnow().isoformat(),
+                last_check=utcnow_iso(),
                 response_time=response_time,
                 metadata={"database_type": "postgresql"}
             )
@@ -186,7 +187,7 @@ class HealthChecker:
             status = HealthStatus(
                 component="database",
                 status="unhealthy",
-                last_check=datetime.utcnow().isoformat(),
+                last_check=utcnow_iso(),
                 response_time=response_time,
                 error_message=str(e)
             )
@@ -215,7 +216,7 @@ class HealthChecker:
             status = HealthStatus(
                 component="openai",
                 status="healthy",
-                last_check=datetime.utcnow().isoformat(),
+                last_check=utcnow_iso(),
                 response_time=response_time,
                 metadata={"model": "gpt-4o"}
             )
@@ -225,7 +226,7 @@ class HealthChecker:
             status = HealthStatus(
                 component="openai",
                 status="unhealthy",
-                last_check=datetime.utcnow().isoformat(),
+                last_check=utcnow_iso(),
                 response_time=response_time,
                 error_message=str(e)
             )
@@ -251,7 +252,7 @@ class HealthChecker:
             status = HealthStatus(
                 component="message_broker",
                 status="healthy",
-                last_check=datetime.utcnow().isoformat(),
+                last_check=utcnow_iso(),
                 response_time=response_time,
                 metadata={"broker_type": "rabbitmq"}
             )
@@ -261,7 +262,7 @@ class HealthChecker:
             status = HealthStatus(
                 component="message_broker",
                 status="unhealthy",
-                last_check=datetime.utcnow().isoformat(),
+                last_check=utcnow_iso(),
                 response_time=response_time,
                 error_message=str(e)
             )
@@ -286,7 +287,7 @@ class HealthChecker:
             status = HealthStatus(
                 component="redis",
                 status="healthy",
-                last_check=datetime.utcnow().isoformat(),
+                last_check=utcnow_iso(),
                 response_time=response_time,
                 metadata={"cache_type": "redis"}
             )
@@ -296,7 +297,7 @@ class HealthChecker:
             status = HealthStatus(
                 component="redis",
                 status="unhealthy",
-                last_check=datetime.utcnow().isoformat(),
+                last_check=utcnow_iso(),
                 response_time=response_time,
                 error_message=str(e)
             )
@@ -321,7 +322,7 @@ class HealthChecker:
                 status = HealthStatus(
                     component=f"agent_{agent_id}",
                     status="healthy",
-                    last_check=datetime.utcnow().isoformat(),
+                    last_check=utcnow_iso(),
                     response_time=response_time,
                     metadata={
                         "agent_type": getattr(agent, 'personality_type', 'unknown'),
@@ -334,7 +335,7 @@ class HealthChecker:
                 status = HealthStatus(
                     component=f"agent_{agent_id}",
                     status="unhealthy",
-                    last_check=datetime.utcnow().isoformat(),
+                    last_check=utcnow_iso(),
                     response_time=response_time,
                     error_message=str(e)
                 )
@@ -372,7 +373,7 @@ class HealthChecker:
                     error_status = HealthStatus(
                         component=component_name,
                         status="unhealthy",
-                        last_check=datetime.utcnow().isoformat(),
+                        last_check=utcnow_iso(),
                         response_time=0.0,
                         error_message=str(result)
                     )
@@ -403,7 +404,7 @@ class HealthChecker:
             
             return {
                 "overall_status": overall_status,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utcnow_iso(),
                 "total_check_time": round(total_time, 3),
                 "component_summary": {
                     "total": len(all_statuses),
@@ -418,7 +419,7 @@ class HealthChecker:
             self.logger.error(f"Health check failed: {e}")
             return {
                 "overall_status": "unhealthy",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utcnow_iso(),
                 "error": str(e)
             }
 
@@ -507,7 +508,7 @@ class MonitoringManager:
             metrics_summary = self.metrics_collector.get_metrics_summary(hours=1)
             
             return {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utcnow_iso(),
                 "health": health_status,
                 "current_metrics": asdict(current_metrics),
                 "metrics_summary": metrics_summary,
@@ -517,7 +518,7 @@ class MonitoringManager:
         except Exception as e:
             self.logger.error(f"Failed to get system status: {e}")
             return {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utcnow_iso(),
                 "error": str(e),
                 "monitoring_active": self.is_monitoring
             }
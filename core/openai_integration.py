@@ -4,34 +4,188 @@ Handles conversation context, prompt engineering, and response generation.
 """
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-import json
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+import hashlib
+import io
 
+import httpx
+import openai
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
 from utils.exceptions import LLMError
+from utils.time_utils import utcnow_iso
+from utils.cache import BloomFilter, TTLCache
+from utils import json_fast
+from utils.logger import get_sampled_logger
 from agents.personalities import PersonalityManager
 from config.settings import Settings
 
+# HTTP/2 needs the optional h2 package (pulled in by httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Domain descriptions embedded in each agent's system prompt
+_BUSINESS_CONTEXTS = {
+    "financial_advisor": """
+You are a financial advisory specialist with expertise in:
+- Portfolio analysis and optimization
+- Risk assessment and management
+- Investment recommendations
+- Market analysis and trends
+- Financial planning and goal setting
+- Regulatory compliance and best practices
+
+You help users make informed financial decisions based on their goals, risk tolerance, and market conditions.
+""",
+    "content_creator": """
+You are a content creation specialist with expertise in:
+- Content strategy and planning
+- Brand voice development
+- SEO and content optimization
+- Social media strategy
+- Creative ideation and brainstorming
+- Content performance analysis
+- Audience engagement strategies
+
+You help users create compelling, engaging content that resonates with their target audience.
+""",
+    "technical_support": """
+You are a technical support specialist with expertise in:
+- Problem diagnosis and troubleshooting
+- System analysis and optimization
+- Technical documentation
+- Best practices and recommendations
+- Integration guidance
+
+You help users solve technical problems and optimize their systems.
+""",
+    "general_assistant": """
+You are a general purpose assistant capable of helping with:
+- Information research and analysis
+- Task planning and organization
+- Problem-solving and decision support
+- Communication and writing assistance
+- Learning and explanation of concepts
+
+You adapt to user needs and provide comprehensive assistance across various topics.
+"""
+}
+
+
+# Analysis prompt templates per business domain; {data} receives the JSON-encoded input
+_ANALYSIS_PROMPTS = {
+    "financial_advisor": """
+Please analyze the following financial data and provide recommendations:
+
+Data: {data}
+
+Provide a comprehensive analysis including:
+1. Key insights from the data
+2. Risk assessment
+3. Opportunities identified
+4. Specific recommendations
+5. Next steps
+
+Format your response as a structured analysis that would be valuable for investment decision-making.
+""",
+    "content_creator": """
+Please analyze the following content data and provide strategic recommendations:
+
+Data: {data}
+
+Provide a comprehensive analysis including:
+1. Content performance insights
+2. Audience engagement patterns
+3. Content optimization opportunities
+4. Strategic recommendations
+5. Creative ideas for improvement
+
+Format your response as actionable content strategy guidance.
+""",
+    "general_assistant": """
+Please analyze the following data and provide insights:
+
+Data: {data}
+
+Provide a comprehensive analysis including:
+1. Key patterns and insights
+2. Areas for improvement
+3. Recommendations
+4. Next steps
+
+Format your response as actionable guidance based on your expertise.
+"""
+}
+
+
+# Stable error codes for provider failures, looked up along the exception's MRO
+_ERROR_CODES = {
+    openai.APITimeoutError: "timeout",
+    openai.APIConnectionError: "connection_error",
+    openai.RateLimitError: "rate_limited",
+    openai.AuthenticationError: "authentication_failed",
+    openai.PermissionDeniedError: "permission_denied",
+    openai.BadRequestError: "bad_request",
+    openai.InternalServerError: "provider_error",
+}
+
+
+def _error_code(error: Exception) -> str:
+    """Map an exception to a stable error code for API responses."""
+    if isinstance(error, LLMError) and error.error_code:
+        return error.error_code
+    for error_type in type(error).__mro__:
+        code = _ERROR_CODES.get(error_type)
+        if code:
+            return code
+    return "internal"
+
+
+def _batch_entry(entry_id: int, message: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Describe one entry of a packed batch prompt, with its context when given."""
+    entry = {"id": entry_id, "message": message}
+    if context:
+        entry["context"] = context
+    return entry
+
 
 class OpenAIAgent:
     """OpenAI-powered agent with personality and business logic."""
     
-    def __init__(self, agent_id: str, personality_type: str, business_domain: str, settings: Settings):
+    def __init__(
+        self,
+        agent_id: str,
+        personality_type: str,
+        business_domain: str,
+        settings: Settings,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        client: Optional[AsyncOpenAI] = None
+    ):
         self.agent_id = agent_id
         self.personality_type = personality_type
         self.business_domain = business_domain
         self.settings = settings
         self.logger = logging.getLogger(f"openai_{agent_id}")
+        self.request_logger = get_sampled_logger(f"openai_{agent_id}.requests")  # Per-request success logs
         
-        # Initialize OpenAI client
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        # Initialize OpenAI client; the manager passes its pooled client to every agent
+        self.client = client or AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        
+        # Bounds in-flight OpenAI calls; shared across agents when created by the manager
+        self.semaphore = semaphore or asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
         
         # Initialize personality manager
         self.personality_manager = PersonalityManager()
         self.personality = self.personality_manager.get_personality(personality_type)
         
+        # The system prompt is fixed per agent: build it once and keep it as the
+        # first message so every request shares a byte-identical, cacheable prefix
+        self.system_prompt = self._build_system_prompt()
+        
         # Conversation context storage
         self.conversations: Dict[str, List[Dict[str, str]]] = {}
         
@@ -39,6 +193,13 @@ class OpenAIAgent:
         self.model = "gpt-4o"  # Latest OpenAI model
         self.max_tokens = 1000
         self.temperature = 0.7
+        self.max_batch_size = 8  # Prompts packed into a single batched completion
+        
+        # Short-lived cache for identical stateless requests (first-turn prompts, analyses);
+        # the Bloom filter admits a request to the cache only once it has been seen before
+        self.response_cache = TTLCache(maxsize=1024, ttl=300)
+        self.seen_requests = BloomFilter()
+        self.max_cacheable_message_length = 200
         
     def _build_system_prompt(self) -> str:
         """Build comprehensive system prompt based on personality and business domain."""
@@ -72,53 +233,7 @@ IMPORTANT: You are a backend AI agent. Focus on providing intelligent responses
     
     def _get_business_context(self) -> str:
         """Get business domain specific context."""
-        business_contexts = {
-            "financial_advisor": """
-You are a financial advisory specialist with expertise in:
-- Portfolio analysis and optimization
-- Risk assessment and management
-- Investment recommendations
-- Market analysis and trends
-- Financial planning and goal setting
-- Regulatory compliance and best practices
-
-You help users make informed financial decisions based on their goals, risk tolerance, and market conditions.
-""",
-            "content_creator": """
-You are a content creation specialist with expertise in:
-- Content strategy and planning
-- Brand voice development
-- SEO and content optimization
-- Social media strategy
-- Creative ideation and brainstorming
-- Content performance analysis
-- Audience engagement strategies
-
-You help users create compelling, engaging content that resonates with their target audience.
-""",
-            "technical_support": """
-You are a technical support specialist with expertise in:
-- Problem diagnosis and troubleshooting
-- System analysis and optimization
-- Technical documentation
-- Best practices and recommendations
-- Integration guidance
-
-You help users solve technical problems and optimize their systems.
-""",
-            "general_assistant": """
-You are a general purpose assistant capable of helping with:
-- Information research and analysis
-- Task planning and organization
-- Problem-solving and decision support
-- Communication and writing assistance
-- Learning and explanation of concepts
-
-You adapt to user needs and provide comprehensive assistance across various topics.
-"""
-        }
-        
-        return business_contexts.get(self.business_domain, business_contexts["general_assistant"])
+        return _BUSINESS_CONTEXTS.get(self.business_domain, _BUSINESS_CONTEXTS["general_assistant"])
     
     def _format_personality_traits(self) -> str:
         """Format personality traits for the system prompt."""
@@ -136,7 +251,7 @@ You adapt to user needs and provide comprehensive assistance across various topi
         # Return recent messages (limit to prevent token overflow)
         return self.conversations[user_id][-limit:]
     
-    def _add_to_conversation(self, user_id: str, role: str, content: str) -> None:
+    def _add_to_conversation(self, user_id: str, role: str, content: str, timestamp: Optional[str] = None) -> None:
         """Add message to conversation history."""
         if user_id not in self.conversations:
             self.conversations[user_id] = []
@@ -144,7 +259,7 @@ You adapt to user needs and provide comprehensive assistance across various topi
         self.conversations[user_id].append({
             "role": role,
             "content": content,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": timestamp or utcnow_iso()
         })
         
         # Limit conversation history to prevent memory overflow
@@ -155,38 +270,65 @@ You adapt to user needs and provide comprehensive assistance across various topi
             recent_msgs = self.conversations[user_id][-max_history+len(system_msgs):]
             self.conversations[user_id] = system_msgs + recent_msgs
     
-    async def process_user_message(self, user_id: str, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _build_messages(
+        self,
+        user_id: str,
+        context: Optional[Dict[str, Any]] = None,
+        context_json: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Build the OpenAI message list from the system prompt, conversation history and extra context.
+        
+        context_json, when given, is the context already encoded with
+        json_fast.dumps_str(context, indent=True) and is used instead of encoding it again.
+        """
+        messages = [
+            {"role": "system", "content": self.system_prompt}
+        ]
+        
+        # Add conversation context
+        conversation_context = self._get_conversation_context(user_id)
+        for msg in conversation_context:
+            if msg["role"] in ["user", "assistant"]:
+                messages.append({
+                    "role": msg["role"],
+                    "content": msg["content"]
+                })
+        
+        # Add additional context if provided
+        if context_json is None and context:
+            context_json = json_fast.dumps_str(context, indent=True)
+        if context_json:
+            messages.append({"role": "system", "content": f"Additional context: {context_json}"})
+        
+        return messages
+    
+    async def process_user_message(
+        self,
+        user_id: str,
+        message: str,
+        context: Optional[Dict[str, Any]] = None,
+        context_json: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Process user message and generate intelligent response."""
+        timestamp = utcnow_iso()
         try:
-            self.logger.info(f"Processing message from user {user_id}")
+            self.request_logger.info("Processing message from user %s", user_id)
             
             # Add user message to conversation
-            self._add_to_conversation(user_id, "user", message)
+            self._add_to_conversation(user_id, "user", message, timestamp)
             
             # Build messages for OpenAI
-            messages = [
-                {"role": "system", "content": self._build_system_prompt()}
-            ]
+            messages = self._build_messages(user_id, context, context_json)
             
-            # Add conversation context
-            conversation_context = self._get_conversation_context(user_id)
-            for msg in conversation_context:
-                if msg["role"] in ["user", "assistant"]:
-                    messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
-            
-            # Add additional context if provided
-            if context:
-                context_str = f"Additional context: {json.dumps(context, indent=2)}"
-                messages.append({"role": "system", "content": context_str})
-            
-            # Generate response
-            response = await self._call_openai(messages)
+            # Generate response; only first-turn, context-free short prompts are
+            # cached since anything else carries user-specific state
+            if len(messages) == 2 and len(message) <= self.max_cacheable_message_length:
+                response = await self._call_openai_cached(messages)
+            else:
+                response = await self._call_openai(messages)
             
             # Add assistant response to conversation
-            self._add_to_conversation(user_id, "assistant", response["content"])
+            self._add_to_conversation(user_id, "assistant", response["content"], timestamp)
             
             return {
                 "success": True,
@@ -195,44 +337,168 @@ You adapt to user needs and provide comprehensive assistance across various topi
                 "response": response["content"],
                 "personality": self.personality_type,
                 "business_domain": self.business_domain,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
                 "tokens_used": response.get("tokens_used", 0),
                 "model": self.model
             }
             
         except Exception as e:
-            self.logger.error(f"Error processing message: {e}")
+            self.logger.error("Error processing message: %s", e)
             return {
                 "success": False,
                 "agent_id": self.agent_id,
                 "user_id": user_id,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "error_code": _error_code(e),
+                "timestamp": timestamp
             }
     
-    async def _call_openai(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Make API call to OpenAI."""
+    async def stream_user_message(
+        self,
+        user_id: str,
+        message: str,
+        context: Optional[Dict[str, Any]] = None,
+        context_json: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream the response to a user message chunk by chunk as OpenAI decodes it.
+        
+        The full text is recorded in the conversation history once the stream completes.
+        """
+        timestamp = utcnow_iso()
+        self.request_logger.info("Streaming message from user %s", user_id)
+        
+        self._add_to_conversation(user_id, "user", message, timestamp)
+        messages = self._build_messages(user_id, context, context_json)
+        
+        buffer = io.StringIO()
+        async for chunk in self._stream_openai(messages):
+            buffer.write(chunk)
+            yield chunk
+        
+        self._add_to_conversation(user_id, "assistant", buffer.getvalue(), timestamp)
+    
+    async def process_user_messages_batch(
+        self,
+        entries: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Answer several (user_id, message, context) entries with one OpenAI call per chunk.
+        
+        Entries are packed into a single JSON prompt, each with its own context,
+        and answered without per-user conversation history, trading per-call
+        latency for fewer round trips. Responses are returned in entry order.
+        """
+        chunks = [
+            entries[i:i + self.max_batch_size]
+            for i in range(0, len(entries), self.max_batch_size)
+        ]
+        results = await asyncio.gather(*[self._process_batch_chunk(chunk) for chunk in chunks])
+        return [response for chunk_results in results for response in chunk_results]
+    
+    async def _process_batch_chunk(
+        self,
+        entries: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Send one packed prompt for up to max_batch_size entries and unpack the answers."""
+        timestamp = utcnow_iso()
         try:
-            # Adjust temperature based on personality
-            temperature = self.temperature
-            if self.personality_type == "analytical":
-                temperature = 0.3  # More deterministic for analytical responses
-            elif self.personality_type == "creative":
-                temperature = 0.9  # More creative and varied responses
+            batch_prompt = (
+                "Answer each entry below independently, as if it were the only message from that user. "
+                'Return a JSON object of the form {"responses": [{"id": <entry id>, "response": <your answer>}]} '
+                "with exactly one item per entry.\n\n"
+                f"Entries: {json_fast.dumps_str([_batch_entry(i, message, context) for i, (_, message, context) in enumerate(entries)])}"
+            )
+            messages = [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": batch_prompt}
+            ]
             
-            completion: ChatCompletion = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=self.max_tokens,
-                temperature=temperature,
-                presence_penalty=0.1,
-                frequency_penalty=0.1
+            response = await self._call_openai(
+                messages,
+                max_tokens=self.max_tokens * len(entries),
+                response_format={"type": "json_object"}
             )
             
+            answers = {
+                item.get("id"): item.get("response", "")
+                for item in json_fast.loads(response["content"]).get("responses", [])
+            }
+            tokens_per_entry = response.get("tokens_used", 0) // len(entries)
+            
+            results = []
+            for i, (user_id, message, _) in enumerate(entries):
+                if i not in answers:
+                    results.append({
+                        "success": False,
+                        "agent_id": self.agent_id,
+                        "user_id": user_id,
+                        "error": "No response returned for batched entry",
+                        "timestamp": timestamp
+                    })
+                    continue
+                
+                self._add_to_conversation(user_id, "user", message, timestamp)
+                self._add_to_conversation(user_id, "assistant", answers[i], timestamp)
+                results.append({
+                    "success": True,
+                    "agent_id": self.agent_id,
+                    "user_id": user_id,
+                    "response": answers[i],
+                    "personality": self.personality_type,
+                    "business_domain": self.business_domain,
+                    "timestamp": timestamp,
+                    "tokens_used": tokens_per_entry,
+                    "model": self.model,
+                    "batch_size": len(entries)
+                })
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error("Error processing message batch: %s", e)
+            error, error_code = str(e), _error_code(e)
+            return [
+                {
+                    "success": False,
+                    "agent_id": self.agent_id,
+                    "user_id": user_id,
+                    "error": error,
+                    "error_code": error_code,
+                    "timestamp": timestamp
+                }
+                for user_id, _, _ in entries
+            ]
+    
+    def _request_options(self, messages: List[Dict[str, Any]], **overrides: Any) -> Dict[str, Any]:
+        """Build chat completion arguments; keyword overrides are passed through to the request."""
+        # Adjust temperature based on personality
+        temperature = self.temperature
+        if self.personality_type == "analytical":
+            temperature = 0.3  # More deterministic for analytical responses
+        elif self.personality_type == "creative":
+            temperature = 0.9  # More creative and varied responses
+        
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": self.max_tokens,
+            "temperature": temperature,
+            "presence_penalty": 0.1,
+            "frequency_penalty": 0.1,
+            **overrides
+        }
+    
+    async def _call_openai(self, messages: List[Dict[str, Any]], **overrides: Any) -> Dict[str, Any]:
+        """Make API call to OpenAI; keyword overrides are passed through to the completion request."""
+        try:
+            request_options = self._request_options(messages, **overrides)
+            
+            async with self.semaphore:
+                completion: ChatCompletion = await self.client.chat.completions.create(**request_options)
+            
             response_content = completion.choices[0].message.content
             tokens_used = completion.usage.total_tokens if completion.usage else 0
             
-            self.logger.info(f"OpenAI response generated, tokens used: {tokens_used}")
+            self.request_logger.info("OpenAI response generated, tokens used: %d", tokens_used)
             
             return {
                 "content": response_content,
@@ -242,21 +508,63 @@ You adapt to user needs and provide comprehensive assistance across various topi
             }
             
         except Exception as e:
-            self.logger.error(f"OpenAI API call failed: {e}")
-            raise LLMError(f"Failed to generate response: {e}")
+            self.logger.error("OpenAI API call failed: %s", e)
+            raise LLMError(f"Failed to generate response: {e}", error_code=_error_code(e))
+    
+    async def _call_openai_cached(self, messages: List[Dict[str, Any]], **overrides: Any) -> Dict[str, Any]:
+        """Call OpenAI, reusing a recent response to a byte-identical request.
+        
+        First-time requests skip cache key hashing and lookup entirely; only repeats
+        are keyed, looked up and stored.
+        """
+        fingerprint = tuple(message["content"] for message in messages)
+        if fingerprint not in self.seen_requests:
+            self.seen_requests.add(fingerprint)
+            return await self._call_openai(messages, **overrides)
+        
+        request_options = self._request_options(messages, **overrides)
+        cache_key = hashlib.blake2b(
+            json_fast.dumps(request_options),
+            digest_size=16
+        ).digest()
+        
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self.request_logger.info("OpenAI response served from cache")
+            return {**cached, "tokens_used": 0, "cached": True}
+        
+        response = await self._call_openai(messages, **overrides)
+        self.response_cache.set(cache_key, response)
+        return response
+    
+    async def _stream_openai(self, messages: List[Dict[str, Any]], **overrides: Any) -> AsyncIterator[str]:
+        """Make a streaming API call to OpenAI, yielding content deltas as they arrive."""
+        try:
+            request_options = self._request_options(messages, stream=True, **overrides)
+            
+            async with self.semaphore:
+                stream = await self.client.chat.completions.create(**request_options)
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            
+        except Exception as e:
+            self.logger.error("OpenAI streaming call failed: %s", e)
+            raise LLMError(f"Failed to stream response: {e}", error_code=_error_code(e))
     
     async def generate_business_analysis(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate business-specific analysis based on agent's domain."""
+        timestamp = utcnow_iso()
         try:
             # Create specialized prompt based on business domain
             analysis_prompt = self._build_analysis_prompt(data)
             
             messages = [
-                {"role": "system", "content": self._build_system_prompt()},
+                {"role": "system", "content": self.system_prompt},
                 {"role": "user", "content": analysis_prompt}
             ]
             
-            response = await self._call_openai(messages)
+            response = await self._call_openai_cached(messages)
             
             return {
                 "success": True,
@@ -264,65 +572,24 @@ You adapt to user needs and provide comprehensive assistance across various topi
                 "analysis_type": f"{self.business_domain}_analysis",
                 "analysis": response["content"],
                 "data_analyzed": data,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
                 "tokens_used": response.get("tokens_used", 0)
             }
             
         except Exception as e:
-            self.logger.error(f"Business analysis failed: {e}")
+            self.logger.error("Business analysis failed: %s", e)
             return {
                 "success": False,
                 "agent_id": self.agent_id,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "error_code": _error_code(e),
+                "timestamp": timestamp
             }
     
     def _build_analysis_prompt(self, data: Dict[str, Any]) -> str:
         """Build analysis prompt based on business domain."""
-        if self.business_domain == "financial_advisor":
-            return f"""
-Please analyze the following financial data and provide recommendations:
-
-Data: {json.dumps(data, indent=2)}
-
-Provide a comprehensive analysis including:
-1. Key insights from the data
-2. Risk assessment
-3. Opportunities identified
-4. Specific recommendations
-5. Next steps
-
-Format your response as a structured analysis that would be valuable for investment decision-making.
-"""
-        elif self.business_domain == "content_creator":
-            return f"""
-Please analyze the following content data and provide strategic recommendations:
-
-Data: {json.dumps(data, indent=2)}
-
-Provide a comprehensive analysis including:
-1. Content performance insights
-2. Audience engagement patterns
-3. Content optimization opportunities
-4. Strategic recommendations
-5. Creative ideas for improvement
-
-Format your response as actionable content strategy guidance.
-"""
-        else:
-            return f"""
-Please analyze the following data and provide insights:
-
-Data: {json.dumps(data, indent=2)}
-
-Provide a comprehensive analysis including:
-1. Key patterns and insights
-2. Areas for improvement
-3. Recommendations
-4. Next steps
-
-Format your response as actionable guidance based on your expertise.
-"""
+        template = _ANALYSIS_PROMPTS.get(self.business_domain, _ANALYSIS_PROMPTS["general_assistant"])
+        return template.format(data=json_fast.dumps_str(data, indent=True))
     
     def get_conversation_summary(self, user_id: str) -> Dict[str, Any]:
         """Get summary of conversation with user."""
@@ -338,11 +605,21 @@ Format your response as actionable guidance based on your expertise.
             "conversation_started": messages[0]["timestamp"] if messages else None
         }
     
+    def has_conversation(self, user_id: str) -> bool:
+        """Whether the user has any conversation history with this agent."""
+        return bool(self.conversations.get(user_id))
+    
+    def record_exchange(self, user_id: str, message: str, response: str) -> None:
+        """Append a user message and a reply produced elsewhere (e.g. a cached answer) to history."""
+        timestamp = utcnow_iso()
+        self._add_to_conversation(user_id, "user", message, timestamp)
+        self._add_to_conversation(user_id, "assistant", response, timestamp)
+    
     def clear_conversation(self, user_id: str) -> bool:
         """Clear conversation history for user."""
         if user_id in self.conversations:
             del self.conversations[user_id]
-            self.logger.info(f"Cleared conversation history for user {user_id}")
+            self.logger.info("Cleared conversation history for user %s", user_id)
             return True
         return False
 
@@ -354,15 +631,23 @@ class OpenAIIntegrationManager:
         self.settings = settings
         self.logger = logging.getLogger("openai_manager")
         self.agents: Dict[str, OpenAIAgent] = {}
+        
+        # One limiter for all agents so concurrency tracks the provider's rate limits
+        self.semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+        
+        # One pooled client for all agents so connections stay warm across requests
+        self.http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+        )
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=self.http_client)
     
     async def initialize(self) -> None:
         """Initialize OpenAI integration."""
         try:
-            # Test OpenAI connection
-            client = AsyncOpenAI(api_key=self.settings.OPENAI_API_KEY)
-            
             # Simple test call
-            test_response = await client.chat.completions.create(
+            test_response = await self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=[{"role": "user", "content": "Hello, test connection."}],
                 max_tokens=10
@@ -371,14 +656,17 @@ class OpenAIIntegrationManager:
             self.logger.info("OpenAI integration initialized successfully")
             
         except Exception as e:
-            self.logger.error(f"OpenAI initialization failed: {e}")
+            self.logger.error("OpenAI initialization failed: %s", e)
             raise LLMError(f"OpenAI initialization failed: {e}")
     
     def create_agent(self, agent_id: str, personality_type: str, business_domain: str) -> OpenAIAgent:
         """Create and register an OpenAI agent."""
-        agent = OpenAIAgent(agent_id, personality_type, business_domain, self.settings)
+        agent = OpenAIAgent(
+            agent_id, personality_type, business_domain, self.settings,
+            semaphore=self.semaphore, client=self.client
+        )
         self.agents[agent_id] = agent
-        self.logger.info(f"Created OpenAI agent: {agent_id}")
+        self.logger.info("Created OpenAI agent: %s", agent_id)
         return agent
     
     def get_agent(self, agent_id: str) -> Optional[OpenAIAgent]:
@@ -399,10 +687,8 @@ class OpenAIIntegrationManager:
     async def health_check(self) -> Dict[str, Any]:
         """Check health of OpenAI integration."""
         try:
-            client = AsyncOpenAI(api_key=self.settings.OPENAI_API_KEY)
-            
             # Test call
-            await client.chat.completions.create(
+            await self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=[{"role": "user", "content": "Health check"}],
                 max_tokens=5
@@ -411,12 +697,16 @@ class OpenAIIntegrationManager:
             return {
                 "status": "healthy",
                 "agents_count": len(self.agents),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
             
         except Exception as e:
             return {
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }
\ No newline at end of file
+                "timestamp": utcnow_iso()
+            }
+    
+    async def close(self) -> None:
+        """Close the pooled OpenAI HTTP connections."""
+        await self.client.close()
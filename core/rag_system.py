@@ -4,9 +4,9 @@ RAG (Retrieval-Augmented Generation) system implementation.
 import logging
 from typing import Dict, Any, List, Optional
 import hashlib
-from datetime import datetime
 
 from utils.exceptions import RAGError
+from utils.time_utils import utcnow_iso
 
 class RAGSystem:
     """RAG system with database and MCP integration."""
@@ -48,7 +48,7 @@ class RAGSystem:
             
             # Add timestamp to metadata
             metadata.update({
-                "added_at": datetime.utcnow().isoformat(),
+                "added_at": utcnow_iso(),
                 "content_length": len(content)
             })
             
@@ -0,0 +1,137 @@
+"""
+Redis Streams delivery of agent responses to WebSocket connections.
+"""
+import logging
+import redis.asyncio as aioredis
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils import json_fast
+from utils.exceptions import MessageBrokerError
+
+
+class RedisResponseStream:
+    """Per-user Redis streams carrying agent responses to whichever worker holds the WebSocket.
+    
+    Responses are appended with XADD to agent_responses:{user_id} and read back with
+    XREAD BLOCK, so delivery does not depend on the responding worker owning the
+    connection. Large payloads are split into chunk_size entries and reassembled
+    by the reader.
+    """
+    
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        max_len: int = 1000,
+        chunk_size: int = 1024 * 1024
+    ):
+        self.redis_url = redis_url
+        self.redis_client: Optional[aioredis.Redis] = None
+        self.logger = logging.getLogger("response_stream")
+        
+        # Stream configuration
+        self.key_prefix = "agent_responses:"
+        self.max_len = max_len  # Approximate cap on entries kept per user stream
+        self.chunk_size = chunk_size  # Bytes per stream entry
+        self.stream_ttl = 3600  # Matches the session TTL
+    
+    async def initialize(self) -> None:
+        """Open the async Redis connection pool."""
+        try:
+            self.redis_client = aioredis.from_url(self.redis_url, socket_connect_timeout=5)
+            await self.redis_client.ping()
+            
+            self.logger.info("Redis response stream initialized successfully")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to initialize Redis response stream: {e}")
+            raise MessageBrokerError(f"Response stream initialization failed: {e}")
+    
+    async def publish(self, user_id: str, message_id: str, payload: Dict[str, Any]) -> None:
+        """Append a response payload to the user's stream."""
+        try:
+            body = json_fast.dumps(payload)
+            chunks = [body[i:i + self.chunk_size] for i in range(0, len(body), self.chunk_size)] or [b""]
+            stream_key = f"{self.key_prefix}{user_id}"
+            
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for seq, chunk in enumerate(chunks):
+                    pipe.xadd(
+                        stream_key,
+                        {
+                            "message_id": message_id,
+                            "seq": seq,
+                            "last": int(seq == len(chunks) - 1),
+                            "data": chunk
+                        },
+                        maxlen=self.max_len,
+                        approximate=True
+                    )
+                pipe.expire(stream_key, self.stream_ttl)
+                await pipe.execute()
+            
+            self.logger.debug(f"Streamed response {message_id} to user {user_id} in {len(chunks)} chunk(s)")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to stream response {message_id}: {e}")
+            raise MessageBrokerError(f"Failed to stream response: {e}")
+    
+    async def latest_id(self, user_id: str) -> str:
+        """Return the ID of the newest entry in the user's stream, or "0-0" if it is empty.
+        
+        Readers start from this concrete ID rather than "$", which XREAD resolves
+        afresh on every call and so skips entries added between two reads.
+        """
+        try:
+            entries = await self.redis_client.xrevrange(f"{self.key_prefix}{user_id}", count=1)
+            return entries[0][0].decode() if entries else "0-0"
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get latest stream ID for user {user_id}: {e}")
+            raise MessageBrokerError(f"Failed to get latest stream ID: {e}")
+    
+    async def read(
+        self,
+        user_id: str,
+        last_id: str,
+        block_ms: int = 5000,
+        partial: Optional[Dict[str, List[bytes]]] = None
+    ) -> Tuple[str, List[bytes]]:
+        """Block until entries after last_id arrive and return (last entry ID, completed JSON payloads).
+        
+        Start from latest_id() and pass the returned ID to the next call; on a
+        timeout it is last_id unchanged. Pass the same partial dict across calls
+        so a payload whose chunks span two reads is reassembled.
+        """
+        partial = {} if partial is None else partial
+        payloads = []
+        
+        try:
+            results = await self.redis_client.xread(
+                {f"{self.key_prefix}{user_id}": last_id},
+                block=block_ms
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Failed to read response stream for user {user_id}: {e}")
+            raise MessageBrokerError(f"Failed to read response stream: {e}")
+        
+        for _, entries in results:
+            for entry_id, fields in entries:
+                last_id = entry_id.decode()
+                message_id = fields[b"message_id"].decode()
+                partial.setdefault(message_id, []).append(fields[b"data"])
+                
+                if fields[b"last"] == b"1":
+                    payloads.append(b"".join(partial.pop(message_id)))
+        
+        return last_id, payloads
+    
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        try:
+            if self.redis_client:
+                await self.redis_client.aclose()
+                self.logger.info("Redis response stream closed")
+            
+        except Exception as e:
+            self.logger.error(f"Error closing Redis response stream: {e}")
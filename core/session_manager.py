@@ -97,8 +97,11 @@ class RedisSessionManager:
             session_key = f"{self.key_prefixes['session']}{session_id}"
             session_data = self._serialize_session(session)
             
+            # Write the session and its index entries in one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            
             # Set session with TTL
-            self.redis_client.setex(
+            pipe.setex(
                 session_key,
                 self.session_ttl,
                 json.dumps(session_data)
@@ -106,16 +109,18 @@ class RedisSessionManager:
             
             # Add to user sessions index
             user_sessions_key = f"{self.key_prefixes['user_sessions']}{user_id}"
-            self.redis_client.sadd(user_sessions_key, session_id)
-            self.redis_client.expire(user_sessions_key, self.session_ttl)
+            pipe.sadd(user_sessions_key, session_id)
+            pipe.expire(user_sessions_key, self.session_ttl)
             
             # Add to agent sessions index
             agent_sessions_key = f"{self.key_prefixes['agent_sessions']}{agent_id}"
-            self.redis_client.sadd(agent_sessions_key, session_id)
-            self.redis_client.expire(agent_sessions_key, self.session_ttl)
+            pipe.sadd(agent_sessions_key, session_id)
+            pipe.expire(agent_sessions_key, self.session_ttl)
             
             # Add to active sessions
-            self.redis_client.sadd(self.key_prefixes["active_sessions"], session_id)
+            pipe.sadd(self.key_prefixes["active_sessions"], session_id)
+            
+            pipe.execute()
             
             self.logger.info(f"Created session {session_id} for user {user_id} with agent {agent_id}")
             
@@ -141,6 +146,24 @@ class RedisSessionManager:
             self.logger.error(f"Failed to get session {session_id}: {e}")
             raise SessionError(f"Session retrieval failed: {e}")
     
+    async def mget_sessions(self, session_ids: List[str]) -> List[UserSession]:
+        """Retrieve several sessions in one round trip, skipping expired ones."""
+        try:
+            if not session_ids:
+                return []
+            
+            session_keys = [f"{self.key_prefixes['session']}{session_id}" for session_id in session_ids]
+            
+            return [
+                self._deserialize_session(json.loads(session_data))
+                for session_data in self.redis_client.mget(session_keys)
+                if session_data
+            ]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get sessions {session_ids}: {e}")
+            raise SessionError(f"Session retrieval failed: {e}")
+    
     async def update_session(self, session: UserSession) -> None:
         """Update session data."""
         try:
@@ -186,12 +209,53 @@ class RedisSessionManager:
             # Update session
             await self.update_session(session)
             
+            # Mirror into a capped list so recent messages can be read without the session blob
+            messages_key = f"{self.key_prefixes['session']}{session_id}:messages"
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.rpushx(messages_key, json.dumps(message))
+            pipe.ltrim(messages_key, -self.max_message_history, -1)
+            pipe.expire(messages_key, self.session_ttl)
+            pushed = pipe.execute()[0]
+            
+            if not pushed:
+                # Sessions created before the list existed: seed it with the whole history
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.rpush(messages_key, *[json.dumps(item) for item in session.message_history])
+                pipe.expire(messages_key, self.session_ttl)
+                pipe.execute()
+            
             self.logger.debug(f"Added message to session {session_id}")
             
         except Exception as e:
             self.logger.error(f"Failed to add message to session {session_id}: {e}")
             raise SessionError(f"Message addition failed: {e}")
     
+    async def get_recent_messages(self, session_id: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Get the last `limit` messages of a session, or None if the session does not exist."""
+        try:
+            session_key = f"{self.key_prefixes['session']}{session_id}"
+            
+            # Only the requested tail crosses the wire
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.exists(session_key)
+            pipe.lrange(f"{session_key}:messages", -limit, -1)
+            session_exists, messages = pipe.execute()
+            
+            if not session_exists:
+                return None
+            
+            if not messages:
+                # Sessions without any message since the list was introduced keep their
+                # history only in the session blob
+                session = await self.get_session(session_id)
+                return session.message_history[-limit:] if session else None
+            
+            return [json.loads(message) for message in messages]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get recent messages for session {session_id}: {e}")
+            raise SessionError(f"Message retrieval failed: {e}")
+    
     async def get_user_sessions(self, user_id: str) -> List[str]:
         """Get all session IDs for a user."""
         try:
@@ -212,6 +276,16 @@ class RedisSessionManager:
             self.logger.error(f"Failed to get agent sessions for {agent_id}: {e}")
             raise SessionError(f"Agent sessions retrieval failed: {e}")
     
+    async def get_agent_session_count(self, agent_id: str) -> int:
+        """Count an agent's sessions without transferring their IDs."""
+        try:
+            agent_sessions_key = f"{self.key_prefixes['agent_sessions']}{agent_id}"
+            return self.redis_client.scard(agent_sessions_key)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to count agent sessions for {agent_id}: {e}")
+            raise SessionError(f"Agent session count failed: {e}")
+    
     async def end_session(self, session_id: str) -> None:
         """End a session and clean up."""
         try:
@@ -225,14 +299,16 @@ class RedisSessionManager:
             await self.update_session(session)
             
             # Remove from active sessions
-            self.redis_client.srem(self.key_prefixes["active_sessions"], session_id)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.srem(self.key_prefixes["active_sessions"], session_id)
             
             # Remove from user and agent indices
             user_sessions_key = f"{self.key_prefixes['user_sessions']}{session.user_id}"
             agent_sessions_key = f"{self.key_prefixes['agent_sessions']}{session.agent_id}"
             
-            self.redis_client.srem(user_sessions_key, session_id)
-            self.redis_client.srem(agent_sessions_key, session_id)
+            pipe.srem(user_sessions_key, session_id)
+            pipe.srem(agent_sessions_key, session_id)
+            pipe.execute()
             
             self.logger.info(f"Ended session {session_id}")
             
@@ -252,15 +328,23 @@ class RedisSessionManager:
     async def cleanup_expired_sessions(self) -> int:
         """Clean up expired sessions and return count."""
         try:
-            cleaned_count = 0
             active_sessions = await self.get_active_sessions()
             
+            # Check every session key in one round trip instead of a GET per session
+            pipe = self.redis_client.pipeline(transaction=False)
             for session_id in active_sessions:
-                session = await self.get_session(session_id)
-                if not session:
-                    # Session expired, remove from active list
-                    self.redis_client.srem(self.key_prefixes["active_sessions"], session_id)
-                    cleaned_count += 1
+                pipe.exists(f"{self.key_prefixes['session']}{session_id}")
+            
+            expired_sessions = [
+                session_id
+                for session_id, exists in zip(active_sessions, pipe.execute())
+                if not exists
+            ]
+            
+            # Sessions expired, remove from active list
+            if expired_sessions:
+                self.redis_client.srem(self.key_prefixes["active_sessions"], *expired_sessions)
+            cleaned_count = len(expired_sessions)
             
             self.logger.info(f"Cleaned up {cleaned_count} expired sessions")
             return cleaned_count
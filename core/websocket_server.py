@@ -4,7 +4,6 @@ WebSocket server for real-time agent-user communication.
 import asyncio
 import json
 import logging
-import uuid
 from typing import Dict, Set, Optional
 from datetime import datetime
 import websockets
@@ -13,6 +12,15 @@ from websockets.server import WebSocketServerProtocol
 from core.message_broker import RabbitMQBroker, Message
 from core.session_manager import RedisSessionManager
 from utils.exceptions import WebSocketError
+from utils.ids import uuid4_str
+from utils.logger import get_sampled_logger
+from utils.time_utils import utcnow_iso
+
+# Fixed frames are serialized once instead of per send
+MISSING_USER_ID_FRAME = json.dumps({
+    "type": "error",
+    "message": "Missing user_id in authentication"
+})
 
 
 class WebSocketManager:
@@ -26,12 +34,18 @@ class WebSocketManager:
         self.message_broker = message_broker
         self.session_manager = session_manager
         self.logger = logging.getLogger("websocket_manager")
+        self.request_logger = get_sampled_logger("websocket_manager.requests")  # Per-message success logs
         
         # Connection tracking
         self.active_connections: Dict[str, WebSocketServerProtocol] = {}
         self.user_connections: Dict[str, Set[str]] = {}  # user_id -> connection_ids
         self.agent_connections: Dict[str, Set[str]] = {}  # agent_id -> connection_ids
         
+        # Outbound frames are queued per connection and written by one long-lived task each
+        self.send_queue_size = 256
+        self.send_queues: Dict[str, asyncio.Queue] = {}
+        self.writer_tasks: Dict[str, asyncio.Task] = {}
+        
         # Message handlers
         self.message_handlers = {
             "user_prompt": self._handle_user_prompt,
@@ -48,11 +62,17 @@ class WebSocketManager:
         connection_type: str = "user"
     ) -> str:
         """Register a new WebSocket connection."""
-        connection_id = str(uuid.uuid4())
+        connection_id = uuid4_str()
         
         try:
             self.active_connections[connection_id] = websocket
             
+            send_queue = asyncio.Queue(maxsize=self.send_queue_size)
+            self.send_queues[connection_id] = send_queue
+            self.writer_tasks[connection_id] = asyncio.create_task(
+                self._drain(connection_id, websocket, send_queue)
+            )
+            
             if connection_type == "user":
                 if user_id not in self.user_connections:
                     self.user_connections[user_id] = set()
@@ -68,7 +88,7 @@ class WebSocketManager:
             await self._send_to_connection(connection_id, {
                 "type": "connection_established",
                 "connection_id": connection_id,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             })
             
             return connection_id
@@ -84,6 +104,12 @@ class WebSocketManager:
                 # Remove from active connections
                 del self.active_connections[connection_id]
                 
+                # Stop the connection's writer
+                self.send_queues.pop(connection_id, None)
+                writer_task = self.writer_tasks.pop(connection_id, None)
+                if writer_task and writer_task is not asyncio.current_task():
+                    writer_task.cancel()
+                
                 # Remove from user connections
                 for user_id, conn_ids in self.user_connections.items():
                     if connection_id in conn_ids:
@@ -144,7 +170,7 @@ class WebSocketManager:
             
             # Create message
             message = Message(
-                id=str(uuid.uuid4()),
+                id=uuid4_str(),
                 user_id=message_data["user_id"],
                 agent_id=message_data["agent_id"],
                 content=message_data["content"],
@@ -172,10 +198,10 @@ class WebSocketManager:
             await self._send_to_connection(connection_id, {
                 "type": "message_received",
                 "message_id": message.id,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             })
             
-            self.logger.info(f"Processed user prompt {message.id} from connection {connection_id}")
+            self.request_logger.info("Processed user prompt %s from connection %s", message.id, connection_id)
             
         except Exception as e:
             self.logger.error(f"Error handling user prompt: {e}")
@@ -197,7 +223,7 @@ class WebSocketManager:
             
             # Create message
             message = Message(
-                id=str(uuid.uuid4()),
+                id=uuid4_str(),
                 user_id=message_data["user_id"],
                 agent_id=message_data["agent_id"],
                 content=message_data["content"],
@@ -231,7 +257,7 @@ class WebSocketManager:
                 "session_id": message.session_id
             })
             
-            self.logger.info(f"Processed agent response {message.id} from connection {connection_id}")
+            self.request_logger.info("Processed agent response %s from connection %s", message.id, connection_id)
             
         except Exception as e:
             self.logger.error(f"Error handling agent response: {e}")
@@ -245,7 +271,7 @@ class WebSocketManager:
         """Handle ping message."""
         await self._send_to_connection(connection_id, {
             "type": "pong",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         })
     
     async def _handle_subscribe(
@@ -267,7 +293,7 @@ class WebSocketManager:
         await self._send_to_connection(connection_id, {
             "type": "subscribed",
             "agent_id": agent_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         })
     
     async def _handle_unsubscribe(
@@ -290,7 +316,7 @@ class WebSocketManager:
         await self._send_to_connection(connection_id, {
             "type": "unsubscribed",
             "agent_id": agent_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         })
     
     async def _send_to_connection(
@@ -299,55 +325,69 @@ class WebSocketManager:
         message: Dict
     ) -> None:
         """Send message to specific connection."""
-        if connection_id in self.active_connections:
-            websocket = self.active_connections[connection_id]
+        await self._send_frame(connection_id, json.dumps(message))
+    
+    async def _send_frame(self, connection_id: str, frame: str) -> None:
+        """Send an already serialized frame to a specific connection."""
+        self._enqueue_frame(connection_id, frame)
+    
+    def _enqueue_frame(self, connection_id: str, frame: str) -> None:
+        """Queue a frame for the connection's writer, dropping it if the client has fallen behind."""
+        send_queue = self.send_queues.get(connection_id)
+        if send_queue is None:
+            return
+        try:
+            send_queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.logger.warning(f"Send queue full for connection {connection_id}, dropping frame")
+    
+    async def _drain(self, connection_id: str, websocket: WebSocketServerProtocol, send_queue: asyncio.Queue) -> None:
+        """Write queued frames to one connection in order until it closes."""
+        while True:
+            frame = await send_queue.get()
             try:
-                await websocket.send(json.dumps(message))
+                await websocket.send(frame)
             except websockets.exceptions.ConnectionClosed:
                 await self.unregister_connection(connection_id)
+                return
             except Exception as e:
                 self.logger.error(f"Error sending to connection {connection_id}: {e}")
     
     async def _send_to_user(self, user_id: str, message: Dict) -> None:
         """Send message to all user connections."""
         if user_id in self.user_connections:
-            tasks = []
-            for connection_id in list(self.user_connections[user_id]):
-                tasks.append(self._send_to_connection(connection_id, message))
-            
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+            # Serialize once and share the frame across the user's connections
+            self._send_to_user_raw(user_id, json.dumps(message))
+    
+    def _send_to_user_raw(self, user_id: str, frame: str) -> None:
+        """Queue an already serialized frame for every connection of a user."""
+        for connection_id in list(self.user_connections.get(user_id, ())):
+            self._enqueue_frame(connection_id, frame)
     
     async def _send_to_agent_subscribers(self, agent_id: str, message: Dict) -> None:
         """Send message to all agent subscribers."""
         if agent_id in self.agent_connections:
-            tasks = []
+            frame = json.dumps(message)
             for connection_id in list(self.agent_connections[agent_id]):
-                tasks.append(self._send_to_connection(connection_id, message))
-            
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+                self._enqueue_frame(connection_id, frame)
     
     async def _send_error(self, connection_id: str, error_message: str) -> None:
         """Send error message to connection."""
         await self._send_to_connection(connection_id, {
             "type": "error",
             "message": error_message,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         })
     
     async def broadcast_notification(self, message: Dict) -> None:
         """Broadcast notification to all connections."""
-        tasks = []
+        frame = json.dumps({
+            "type": "notification",
+            **message,
+            "timestamp": utcnow_iso()
+        })
         for connection_id in list(self.active_connections.keys()):
-            tasks.append(self._send_to_connection(connection_id, {
-                "type": "notification",
-                **message,
-                "timestamp": datetime.utcnow().isoformat()
-            }))
-        
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            self._enqueue_frame(connection_id, frame)
 
 
 async def websocket_handler(
@@ -367,10 +407,7 @@ async def websocket_handler(
         connection_type = auth_data.get("type", "user")
         
         if not user_id:
-            await websocket.send(json.dumps({
-                "type": "error",
-                "message": "Missing user_id in authentication"
-            }))
+            await websocket.send(MISSING_USER_ID_FRAME)
             return
         
         # Register connection
@@ -422,7 +459,9 @@ class WebSocketServer:
             self.server = await websockets.serve(
                 lambda ws, path: websocket_handler(ws, path, self.websocket_manager),
                 self.host,
-                self.port
+                self.port,
+                # Frames are shared across connections; per-message deflate would recompress each copy
+                compression=None
             )
             
             self.logger.info(f"WebSocket server started on {self.host}:{self.port}")
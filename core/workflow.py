@@ -143,7 +143,7 @@ class WorkflowEngine:
             self.logger.info(f"Generating response for session {state.session_id}")
             
             # Get personality-specific prompt template
-            prompt_template = self.personality_manager.get_response_template(
+            prompt_template = self.personality_manager.get_response_template_fast(
                 self.agent.personality
             )
             
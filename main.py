@@ -11,6 +11,7 @@ from core.message_broker import RabbitMQBroker
 from core.session_manager import RedisSessionManager
 from core.websocket_server import WebSocketServer
 from utils.logger import setup_logger
+from utils.server_options import run_event_loop, uvicorn_options
 
 async def run_agent(agent_id: str, config: Dict[str, Any]):
     """Run a single agent instance."""
@@ -40,7 +41,8 @@ async def run_api_server():
         app,
         host=settings.API_HOST,
         port=settings.API_PORT,
-        log_level="info"
+        log_level="info",
+        **uvicorn_options()
     )
     
     server = uvicorn.Server(config)
@@ -120,4 +122,4 @@ async def main():
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_event_loop(main())
@@ -25,7 +25,7 @@ class ProductionSecurityMiddleware(BaseHTTPMiddleware):
         current_time = time.time()
         
         # Define public endpoints that don't require authentication
-        public_endpoints = {"/", "/health", "/docs", "/redoc", "/openapi.json", "/agents", "/system/stats"}
+        public_endpoints = {"/", "/health", "/docs", "/redoc", "/openapi.json", "/agents", "/system/stats", "/metrics"}
         path = request.url.path
         
         # Rate limiting (apply to all endpoints)
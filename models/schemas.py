@@ -4,7 +4,7 @@ Pydantic schemas for data validation and serialization.
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 class UserInteraction(BaseModel):
     """Schema for user interaction data."""
@@ -16,22 +16,19 @@ class UserInteraction(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Interaction timestamp")
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional metadata")
     
-    @validator('prompt')
+    @field_validator('prompt')
+    @classmethod
     def prompt_not_empty(cls, v):
         if not v.strip():
             raise ValueError('Prompt cannot be empty')
         return v.strip()
     
-    @validator('user_id', 'session_id', 'agent_id')
+    @field_validator('user_id', 'session_id', 'agent_id')
+    @classmethod
     def ids_not_empty(cls, v):
         if not v.strip():
             raise ValueError('ID fields cannot be empty')
         return v.strip()
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class AgentResponse(BaseModel):
     """Schema for agent response data."""
@@ -43,22 +40,19 @@ class AgentResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Response metadata")
     
-    @validator('content')
+    @field_validator('content')
+    @classmethod
     def content_not_empty(cls, v):
         if not v.strip():
             raise ValueError('Response content cannot be empty')
         return v.strip()
     
-    @validator('agent_id', 'user_id', 'session_id')
+    @field_validator('agent_id', 'user_id', 'session_id')
+    @classmethod
     def ids_not_empty(cls, v):
         if not v.strip():
             raise ValueError('ID fields cannot be empty')
         return v.strip()
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class AgentConfiguration(BaseModel):
     """Schema for agent configuration."""
@@ -71,21 +65,24 @@ class AgentConfiguration(BaseModel):
     is_active: bool = Field(default=True, description="Whether the agent is active")
     configuration: Optional[Dict[str, Any]] = Field(default=None, description="Additional configuration")
     
-    @validator('personality')
+    @field_validator('personality')
+    @classmethod
     def validate_personality(cls, v):
         valid_personalities = ['analytical', 'creative', 'helpful', 'professional']
         if v not in valid_personalities:
             raise ValueError(f'Personality must be one of: {valid_personalities}')
         return v
     
-    @validator('business_rules')
+    @field_validator('business_rules')
+    @classmethod
     def validate_business_rules(cls, v):
         valid_rules = ['financial_advisor', 'content_creator', 'technical_support', 'general_assistant']
         if v not in valid_rules:
             raise ValueError(f'Business rules must be one of: {valid_rules}')
         return v
     
-    @validator('mcp_servers')
+    @field_validator('mcp_servers')
+    @classmethod
     def validate_mcp_servers(cls, v):
         if not isinstance(v, list):
             raise ValueError('MCP servers must be a list')
@@ -105,33 +102,29 @@ class RAGDocument(BaseModel):
     embeddings: Optional[List[float]] = Field(default=None, description="Document embeddings")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
     
-    @validator('content')
+    @field_validator('content')
+    @classmethod
     def content_not_empty(cls, v):
         if not v.strip():
             raise ValueError('Document content cannot be empty')
         return v.strip()
     
-    @validator('document_id')
+    @field_validator('document_id')
+    @classmethod
     def document_id_not_empty(cls, v):
         if not v.strip():
             raise ValueError('Document ID cannot be empty')
         return v.strip()
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class RAGQueryResult(BaseModel):
     """Schema for RAG query results."""
     
+    model_config = ConfigDict(validate_assignment=True)
+    
     document_id: str = Field(..., description="Document identifier")
     content: str = Field(..., description="Document content")
     relevance_score: float = Field(..., ge=0.0, le=1.0, description="Relevance score (0-1)")
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Document metadata")
-    
-    class Config:
-        validate_assignment = True
 
 class MCPToolCall(BaseModel):
     """Schema for MCP tool call data."""
@@ -141,34 +134,30 @@ class MCPToolCall(BaseModel):
     arguments: Dict[str, Any] = Field(default_factory=dict, description="Tool arguments")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Call timestamp")
     
-    @validator('tool_name')
+    @field_validator('tool_name')
+    @classmethod
     def tool_name_not_empty(cls, v):
         if not v.strip():
             raise ValueError('Tool name cannot be empty')
         return v.strip()
     
-    @validator('server_url')
+    @field_validator('server_url')
+    @classmethod
     def validate_server_url(cls, v):
         if not v.startswith(('http://', 'https://')):
             raise ValueError('Server URL must be a valid HTTP/HTTPS URL')
         return v
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class MCPToolResult(BaseModel):
     """Schema for MCP tool call results."""
     
+    model_config = ConfigDict(validate_assignment=True)
+    
     tool_call: MCPToolCall = Field(..., description="Original tool call")
     result: Dict[str, Any] = Field(..., description="Tool execution result")
     success: bool = Field(..., description="Whether the call was successful")
     error_message: Optional[str] = Field(default=None, description="Error message if call failed")
     execution_time: float = Field(..., ge=0.0, description="Execution time in seconds")
-    
-    class Config:
-        validate_assignment = True
 
 class BusinessRuleResult(BaseModel):
     """Schema for business rule processing results."""
@@ -179,7 +168,8 @@ class BusinessRuleResult(BaseModel):
     compliance_info: Optional[Dict[str, Any]] = Field(default=None, description="Compliance information")
     risk_assessment: Optional[str] = Field(default=None, description="Risk assessment level")
     
-    @validator('category')
+    @field_validator('category')
+    @classmethod
     def category_not_empty(cls, v):
         if not v.strip():
             raise ValueError('Category cannot be empty')
@@ -196,16 +186,12 @@ class WorkflowState(BaseModel):
     completed_steps: List[str] = Field(default_factory=list, description="Completed workflow steps")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="State timestamp")
     
-    @validator('session_id', 'user_id', 'agent_id', 'current_step')
+    @field_validator('session_id', 'user_id', 'agent_id', 'current_step')
+    @classmethod
     def ids_not_empty(cls, v):
         if not v.strip():
             raise ValueError('ID and step fields cannot be empty')
         return v.strip()
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class ErrorResponse(BaseModel):
     """Schema for error responses."""
@@ -215,11 +201,6 @@ class ErrorResponse(BaseModel):
     error_code: Optional[str] = Field(default=None, description="Error code")
     details: Optional[Dict[str, Any]] = Field(default=None, description="Additional error details")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 # Utility functions for schema validation
 
@@ -241,7 +222,7 @@ def validate_rag_document(data: Dict[str, Any]) -> RAGDocument:
 
 def serialize_for_database(model: BaseModel) -> Dict[str, Any]:
     """Serialize Pydantic model for database storage."""
-    return model.dict(exclude_none=True)
+    return model.model_dump(exclude_none=True)
 
 def deserialize_from_database(data: Dict[str, Any], model_class: type) -> BaseModel:
     """Deserialize database data to Pydantic model."""
@@ -4,12 +4,13 @@ Fully functional backend with OpenAI integration and REST API endpoints
 """
 import asyncio
 import logging
-from datetime import datetime
+import time
 from typing import Dict, Any
 
 from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
 
 from config.settings import Settings
@@ -19,13 +20,8 @@ from core.security import SecurityManager
 from core.monitoring import MonitoringManager
 from utils.logger import setup_logger
 from utils.exceptions import AgentFactoryError, LLMError
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="AI Agents System",
-    description="Production-ready AI agents with OpenAI integration",
-    version="1.0.0"
-)
+from utils.server_options import GZIP_OPTIONS, lifespan_from, uvicorn_options, uvicorn_workers
+from utils.time_utils import utcnow_iso
 
 # Global managers
 settings = Settings()
@@ -33,16 +29,6 @@ agent_factory = None
 security_manager = None
 monitoring_manager = None
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-@app.on_event("startup")
 async def startup_event():
     """Initialize the AI agents system."""
     global agent_factory, security_manager, monitoring_manager
@@ -60,14 +46,16 @@ async def startup_event():
         security_manager = SecurityManager(settings)
         logger.info("Security manager initialized")
         
-        # Initialize monitoring
+        # Monitoring startup and the factory's OpenAI test call are independent; run them together
         monitoring_manager = MonitoringManager(settings)
-        await monitoring_manager.start_monitoring()
-        logger.info("Monitoring system started")
-        
-        # Initialize agent factory with OpenAI
         agent_factory = AgentFactory(settings)
-        await agent_factory.initialize()
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(monitoring_manager.start_monitoring())
+                tg.create_task(agent_factory.initialize())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        logger.info("Monitoring system started")
         logger.info("Agent factory initialized with OpenAI integration")
         
         # Create default agents
@@ -86,7 +74,6 @@ async def startup_event():
         logger.error(f"Startup failed: {e}")
         raise
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     global agent_factory, monitoring_manager
@@ -105,6 +92,25 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Shutdown error: {e}")
 
+# Initialize FastAPI app
+app = FastAPI(
+    title="AI Agents System",
+    description="Production-ready AI agents with OpenAI integration",
+    version="1.0.0",
+    lifespan=lifespan_from(startup_event, shutdown_event)
+)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # Configure appropriately for production
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.add_middleware(GZipMiddleware, **GZIP_OPTIONS)
+
 # API Endpoints
 
 @app.get("/")
@@ -115,7 +121,7 @@ async def root():
         "status": "running",
         "mode": "standalone",
         "version": "1.0.0",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utcnow_iso(),
         "endpoints": {
             "health": "/health",
             "agents": "/api/agents",
@@ -143,7 +149,7 @@ async def health_check():
         
         return {
             "status": health_status.get("overall_status", "unknown"),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utcnow_iso(),
             "system": health_status,
             "agents": factory_health,
             "mode": "standalone"
@@ -155,7 +161,7 @@ async def health_check():
             content={
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
         )
 
@@ -172,7 +178,7 @@ async def list_agents():
         return {
             "agents": agents,
             "statistics": stats,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
         
     except Exception as e:
@@ -195,7 +201,7 @@ async def chat_with_agent(agent_id: str, request: Request):
             raise HTTPException(status_code=400, detail="Message cannot be empty")
         
         # Record request metrics
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         # Process message through agent
         response = await agent_factory.process_user_message(
@@ -204,7 +210,7 @@ async def chat_with_agent(agent_id: str, request: Request):
         
         # Record metrics
         if monitoring_manager:
-            process_time = (datetime.utcnow() - start_time).total_seconds()
+            process_time = time.perf_counter() - start_time
             monitoring_manager.record_api_request(
                 f"/api/agents/{agent_id}/chat", 
                 process_time, 
@@ -283,7 +289,7 @@ async def get_conversation_summary(agent_id: str, user_id: str):
             "agent_id": agent_id,
             "user_id": user_id,
             "conversation_summary": summary,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
         
     except Exception as e:
@@ -303,7 +309,7 @@ async def clear_conversation(agent_id: str, user_id: str):
             "agent_id": agent_id,
             "user_id": user_id,
             "message": "Conversation cleared" if success else "Agent not found",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
         
     except Exception as e:
@@ -321,7 +327,7 @@ async def get_system_stats():
         if monitoring_manager:
             stats["system"] = await monitoring_manager.get_system_status()
         
-        stats["timestamp"] = datetime.utcnow().isoformat()
+        stats["timestamp"] = utcnow_iso()
         stats["mode"] = "standalone"
         
         return stats
@@ -369,7 +375,7 @@ async def test_agent_demo():
             "demo_status": "completed",
             "tests_run": len(test_results),
             "results": test_results,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
         
     except Exception as e:
@@ -383,7 +389,7 @@ async def llm_error_handler(request: Request, exc: LLMError):
         content={
             "error": "AI service temporarily unavailable",
             "details": str(exc),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
     )
 
@@ -394,7 +400,7 @@ async def agent_error_handler(request: Request, exc: AgentFactoryError):
         content={
             "error": "Agent operation failed",
             "details": str(exc),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
     )
 
@@ -405,5 +411,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=5000,
         reload=False,
-        log_level="info"
+        log_level="info",
+        workers=uvicorn_workers(),
+        **uvicorn_options()
     )
\ No newline at end of file
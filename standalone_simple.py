@@ -4,28 +4,39 @@ Simplified Standalone AI Agents System - Core functionality only
 import asyncio
 import logging
 import json
-from datetime import datetime
 from typing import Dict, Any, Optional
 
+import httpx
 from openai import AsyncOpenAI
 from config.settings import Settings
 from agents.personalities import PersonalityManager
 from agents.business_rules import BusinessRules
 from core.mcp_client import MCPClient
 from core.database_simple import SimpleDatabase
-from utils.logger import setup_logger
+from core.openai_integration import HTTP2_AVAILABLE
+from utils.logger import setup_logger, get_sampled_logger
+from utils.time_utils import utcnow_iso
 
 class SimpleAgent:
     """Simplified AI agent with OpenAI integration and optional MCP support."""
     
-    def __init__(self, agent_id: str, personality_type: str, business_domain: str, openai_key: str, mcp_servers: Optional[list] = None):
+    def __init__(
+        self,
+        agent_id: str,
+        personality_type: str,
+        business_domain: str,
+        openai_key: str,
+        mcp_servers: Optional[list] = None,
+        openai_client: Optional[AsyncOpenAI] = None
+    ):
         self.agent_id = agent_id
         self.personality_type = personality_type
         self.business_domain = business_domain
         self.logger = logging.getLogger(f"agent_{agent_id}")
+        self.request_logger = get_sampled_logger(f"agent_{agent_id}.requests")  # Per-request success logs
         
-        # OpenAI client
-        self.openai_client = AsyncOpenAI(api_key=openai_key)
+        # OpenAI client; the agent system passes its pooled client to every agent
+        self.openai_client = openai_client or AsyncOpenAI(api_key=openai_key)
         
         # MCP client for external tools (optional)
         self.mcp_client = MCPClient(mcp_servers or [])
@@ -40,6 +51,7 @@ class SimpleAgent:
         self.business_rules = BusinessRules()
         
         self.personality = self.personality_manager.get_personality(personality_type)
+        self.system_prompt = self._build_system_prompt()  # Static per agent, built once
     
     async def initialize(self):
         """Initialize agent and MCP connections."""
@@ -80,13 +92,13 @@ Remember: You are a backend AI agent providing intelligent responses for a front
     async def process_message(self, user_id: str, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process user message and generate response with optional MCP tool usage."""
         try:
-            self.logger.info(f"Processing message from user {user_id}")
+            self.request_logger.info("Processing message from user %s", user_id)
             
             # Check if message might require MCP tools
             enhanced_context = await self._enhance_with_mcp_data(message, context)
             
             # Build messages for OpenAI
-            messages = [{"role": "system", "content": self._build_system_prompt()}]
+            messages = [{"role": "system", "content": self.system_prompt}]
             
             # Add conversation history
             if user_id in self.conversations:
@@ -141,7 +153,7 @@ Remember: You are a backend AI agent providing intelligent responses for a front
                 "response": assistant_response,
                 "personality": self.personality_type,
                 "business_domain": self.business_domain,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utcnow_iso(),
                 "tokens_used": response.usage.total_tokens if response.usage else 0,
                 "mcp_tools_used": len(self.mcp_tools) > 0,
                 "mcp_tools_available": len(self.mcp_tools)
@@ -154,7 +166,7 @@ Remember: You are a backend AI agent providing intelligent responses for a front
                 "agent_id": self.agent_id,
                 "user_id": user_id,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utcnow_iso()
             }
     
     async def _enhance_with_mcp_data(self, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -229,6 +241,14 @@ class SimpleAgentSystem:
         
         if not self.settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is required")
+        
+        # One pooled client for all agents so TLS connections stay warm across requests
+        self.http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+        )
+        self.openai_client = AsyncOpenAI(api_key=self.settings.OPENAI_API_KEY, http_client=self.http_client)
     
     async def initialize(self):
         """Initialize the system and create default agents."""
@@ -254,7 +274,8 @@ class SimpleAgentSystem:
                 config["personality"],
                 config["domain"],
                 self.settings.OPENAI_API_KEY,
-                mcp_servers=[]  # Add MCP servers here when available
+                mcp_servers=[],  # Add MCP servers here when available
+                openai_client=self.openai_client
             )
             await agent.initialize()  # Initialize MCP connections
             self.agents[config["agent_id"]] = agent
@@ -264,14 +285,20 @@ class SimpleAgentSystem:
     
     async def chat(self, agent_id: str, user_id: str, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Send message to specific agent."""
-        if agent_id not in self.agents:
+        try:
+            agent = self.agents[agent_id]
+        except KeyError:
             return {
                 "success": False,
                 "error": f"Agent {agent_id} not found",
                 "available_agents": list(self.agents.keys())
             }
         
-        return await self.agents[agent_id].process_message(user_id, message, context)
+        return await agent.process_message(user_id, message, context)
+    
+    async def close(self) -> None:
+        """Close the pooled OpenAI HTTP connections."""
+        await self.openai_client.close()
     
     def list_agents(self) -> Dict[str, Any]:
         """List all available agents."""
@@ -320,7 +347,7 @@ class SimpleAgentSystem:
         
         return {
             "test_completed": True,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utcnow_iso(),
             "results": test_results
         }
 
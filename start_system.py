@@ -8,6 +8,7 @@ from typing import Dict, Any
 from config.settings import Settings
 from agents.agent_factory import AgentFactory
 from utils.logger import setup_logger
+from utils.server_options import run_event_loop, uvicorn_options
 
 async def run_agent(agent_id: str, config: Dict[str, Any]):
     """Run a single agent instance with error handling."""
@@ -112,7 +113,8 @@ async def main():
                     app,
                     host=settings.API_HOST,
                     port=settings.API_PORT,
-                    log_level="info"
+                    log_level="info",
+                    **uvicorn_options()
                 )
                 server = uvicorn.Server(config)
                 await server.serve()
@@ -137,4 +139,4 @@ async def main():
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_event_loop(main())
\ No newline at end of file
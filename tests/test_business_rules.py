@@ -109,4 +109,16 @@ class TestBusinessRules:
         assert result is not None
         assert "user_analysis" in result
         # Context should influence the analysis
-        assert result["user_analysis"]["engagement_level"] == "active"
\ No newline at end of file
+        assert result["user_analysis"]["engagement_level"] == "active"
+    
+    @pytest.mark.asyncio
+    async def test_sports_coaching_detected_topics(self, business_engine):
+        """Test coaching keyword detection, including multi-word keywords."""
+        result = await business_engine.process(
+            business_rule_type="sports_coaching",
+            prompt="My Speed is fine but my mental game falls apart in training",
+            context={},
+            user_id="test_user"
+        )
+        
+        assert result["detected_topics"] == ["training", "speed", "mental game"]
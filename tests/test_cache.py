@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-memory TTL cache.
+"""
+import pytest
+from utils import cache as cache_module
+from utils.cache import BloomFilter, TTLCache
+
+class TestTTLCache:
+    """Test TTL cache behaviour."""
+    
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Patch the cache's monotonic clock with a controllable value."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        return now
+    
+    def test_get_and_set(self):
+        """Test basic storage and missing keys."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("b", "default") == "default"
+        assert "a" in cache
+    
+    def test_entries_expire(self, clock):
+        """Test entries are dropped once their TTL has elapsed."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        
+        clock[0] += 59
+        assert cache.get("a") == 1
+        
+        clock[0] += 1
+        assert cache.get("a") is None
+        assert len(cache) == 0
+    
+    def test_least_recently_used_is_evicted(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+    
+    def test_invalidate_matching_keys(self):
+        """Test only entries whose keys match the predicate are removed."""
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set(("user_1", "a"), 1)
+        cache.set(("user_1", "b"), 2)
+        cache.set(("user_2", "a"), 3)
+        
+        assert cache.invalidate(lambda key: key[0] == "user_1") == 2
+        assert ("user_1", "a") not in cache
+        assert cache.get(("user_2", "a")) == 3
+
+
+class TestBloomFilter:
+    """Test Bloom filter membership."""
+    
+    def test_added_items_are_members(self):
+        """Test there are no false negatives."""
+        bloom = BloomFilter(size_bits=1 << 12, num_hashes=4)
+        items = [f"prompt {i}" for i in range(100)]
+        for item in items:
+            bloom.add(item)
+        
+        assert all(item in bloom for item in items)
+    
+    def test_unseen_items_are_mostly_absent(self):
+        """Test the false positive rate stays low for a lightly loaded filter."""
+        bloom = BloomFilter(size_bits=1 << 16, num_hashes=4)
+        for i in range(100):
+            bloom.add(f"seen {i}")
+        
+        false_positives = sum(f"unseen {i}" in bloom for i in range(1000))
+        assert false_positives < 10
+    
+    def test_resets_after_capacity(self):
+        """Test the filter forgets old items once capacity additions have been made."""
+        bloom = BloomFilter(size_bits=1 << 12, num_hashes=4, capacity=3)
+        for i in range(3):
+            bloom.add(f"old {i}")
+        assert all(f"old {i}" in bloom for i in range(3))
+        
+        bloom.add("new")
+        
+        assert "new" in bloom
+        assert not any(f"old {i}" in bloom for i in range(3))
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Unit tests for identifier helpers.
+"""
+import uuid
+from utils import ids
+
+class TestUuid4Str:
+    """Test pooled UUID generation."""
+    
+    def test_matches_uuid4_format(self):
+        """Test that pooled IDs parse as canonical version-4 UUIDs."""
+        value = ids.uuid4_str()
+        parsed = uuid.UUID(value)
+        
+        assert str(parsed) == value
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+    
+    def test_unique_across_refills(self):
+        """Test that IDs stay unique when the pool is refilled."""
+        values = [ids.uuid4_str() for _ in range(ids._BATCH_SIZE * 2 + 1)]
+        
+        assert len(set(values)) == len(values)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the fast JSON helpers.
+"""
+import json
+import pytest
+from utils import json_fast
+
+class TestTimestampedPrefix:
+    """Test pre-serialized bodies completed with a per-request timestamp."""
+    
+    def test_stamp_appends_timestamp_field(self):
+        """Test that a stamped body decodes to the payload plus its timestamp."""
+        payload = {"service": "AI Agents API", "features": ["MCP", "Persistence"]}
+        prefix = json_fast.timestamped_prefix(payload)
+        
+        body = json_fast.stamp(prefix, "2025-01-01T00:00:00.000001")
+        
+        assert json_fast.loads(body) == {**payload, "timestamp": "2025-01-01T00:00:00.000001"}
+    
+    def test_empty_payload(self):
+        """Test that an empty payload yields a body with only the timestamp."""
+        body = json_fast.stamp(json_fast.timestamped_prefix({}), "2025-01-01T00:00:00")
+        
+        assert json_fast.loads(body) == {"timestamp": "2025-01-01T00:00:00"}
+
+class TestDumps:
+    """Test JSON encoding of payloads and agent contexts."""
+    
+    def test_non_string_keys_match_standard_library(self):
+        """Test that int, float, bool and None keys encode as the standard library does."""
+        context = {1: "a", 2.5: "b", None: "c", False: "d", "name": {3: "e"}}
+        
+        assert json_fast.loads(json_fast.dumps(context)) == json.loads(json.dumps(context))
+        assert json_fast.loads(json_fast.dumps_str(context, indent=True)) == json.loads(json.dumps(context))
+    
+    def test_unsupported_type_raises_type_error(self):
+        """Test that an object JSON cannot represent raises TypeError."""
+        with pytest.raises(TypeError):
+            json_fast.dumps({"value": object()})
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the logging utilities.
+"""
+import logging
+
+from utils.logger import SampledLogFilter, get_sampled_logger
+
+def _record(level: int) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, "message %s", ("arg",), None)
+
+class TestSampledLogFilter:
+    """Test sampling of request-path log records."""
+    
+    def test_warnings_and_errors_always_pass(self):
+        """Test that WARNING and above are never sampled out."""
+        log_filter = SampledLogFilter(rate=0.0)
+        
+        assert log_filter.filter(_record(logging.WARNING))
+        assert log_filter.filter(_record(logging.ERROR))
+        assert not log_filter.filter(_record(logging.INFO))
+    
+    def test_full_rate_passes_info(self):
+        """Test that a rate of 1.0 emits every INFO record."""
+        log_filter = SampledLogFilter(rate=1.0)
+        
+        assert all(log_filter.filter(_record(logging.INFO)) for _ in range(100))
+    
+    def test_sampled_logger_filter_added_once(self):
+        """Test that repeated lookups do not stack sampling filters."""
+        get_sampled_logger("test_sampled.requests")
+        logger = get_sampled_logger("test_sampled.requests")
+        
+        assert sum(isinstance(f, SampledLogFilter) for f in logger.filters) == 1
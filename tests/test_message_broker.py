@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batched telemetry publishing.
+"""
+import pytest
+import asyncio
+from datetime import datetime
+from core.message_broker import AsyncBatchPublisher, Message
+from utils.exceptions import MessageBrokerError
+
+class RecordingBroker:
+    """Broker double that records published message IDs."""
+    
+    def __init__(self, fail_ids=()):
+        self.telemetry = []
+        self.fail_ids = set(fail_ids)
+    
+    def publish_telemetry(self, message):
+        if message.id in self.fail_ids:
+            raise MessageBrokerError("publish failed")
+        self.telemetry.append(message.id)
+
+
+def make_message(message_id: str, message_type: str = "user_prompt") -> Message:
+    return Message(
+        id=message_id,
+        user_id="user_1",
+        agent_id="agent_alpha",
+        content="hello",
+        message_type=message_type,
+        timestamp=datetime.utcnow(),
+        session_id="session_1",
+        metadata={}
+    )
+
+
+class TestAsyncBatchPublisher:
+    """Test coalescing of broker publishes."""
+    
+    @pytest.mark.asyncio
+    async def test_flushes_on_interval(self):
+        """Test that queued messages are published after the flush interval, in order."""
+        broker = RecordingBroker()
+        publisher = AsyncBatchPublisher(broker, max_batch_size=100, flush_interval=0.01)
+        publisher.start()
+        
+        await publisher.enqueue_telemetry(make_message("e1", "error"))
+        await publisher.enqueue_telemetry(make_message("e2", "error"))
+        assert broker.telemetry == []
+        
+        await asyncio.sleep(0.05)
+        assert broker.telemetry == ["e1", "e2"]
+        
+        await publisher.close()
+    
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_before_interval(self):
+        """Test that a full batch is published without waiting for the timer."""
+        broker = RecordingBroker()
+        publisher = AsyncBatchPublisher(broker, max_batch_size=2, flush_interval=60)
+        publisher.start()
+        
+        await publisher.enqueue_telemetry(make_message("e1", "error"))
+        await publisher.enqueue_telemetry(make_message("e2", "error"))
+        await asyncio.sleep(0.01)
+        assert broker.telemetry == ["e1", "e2"]
+        
+        await publisher.close()
+    
+    @pytest.mark.asyncio
+    async def test_idle_publisher_waits_for_messages(self):
+        """Test that the flush task sleeps on the pending event while nothing is queued."""
+        broker = RecordingBroker()
+        publisher = AsyncBatchPublisher(broker, max_batch_size=100, flush_interval=0.001)
+        publisher.start()
+        
+        await asyncio.sleep(0.01)
+        assert not publisher._has_pending.is_set()
+        
+        await publisher.close()
+    
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending(self):
+        """Test that closing publishes messages still waiting for the timer."""
+        broker = RecordingBroker()
+        publisher = AsyncBatchPublisher(broker, max_batch_size=100, flush_interval=60)
+        publisher.start()
+        
+        await publisher.enqueue_telemetry(make_message("e1", "error"))
+        await publisher.close()
+        
+        assert broker.telemetry == ["e1"]
+    
+    @pytest.mark.asyncio
+    async def test_failed_message_does_not_drop_batch(self):
+        """Test that one failing publish does not lose the rest of the batch."""
+        broker = RecordingBroker(fail_ids={"e2"})
+        publisher = AsyncBatchPublisher(broker)
+        
+        for message_id in ("e1", "e2", "e3"):
+            await publisher.enqueue_telemetry(make_message(message_id, "error"))
+        publisher.flush()
+        
+        assert broker.telemetry == ["e1", "e3"]
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Unit tests for micro-batching of concurrent agent requests.
+"""
+import pytest
+import asyncio
+from core.micro_batcher import AgentMicroBatcher
+
+class RecordingAgent:
+    """Agent double that records single and batched calls."""
+    
+    def __init__(self, max_batch_size=8):
+        self.agent_id = "futmatrix_coach"
+        self.max_batch_size = max_batch_size
+        self.single_calls = []
+        self.batch_calls = []
+    
+    async def process_user_message(self, user_id, message, context=None):
+        self.single_calls.append(user_id)
+        return {"success": True, "user_id": user_id, "response": f"single:{message}"}
+    
+    async def process_user_messages_batch(self, entries):
+        self.batch_calls.append([user_id for user_id, _, _ in entries])
+        return [
+            {"success": True, "user_id": user_id, "response": f"batch:{message}"}
+            for user_id, message, _ in entries
+        ]
+
+
+class TestAgentMicroBatcher:
+    """Test grouping of concurrent agent requests."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_batch(self):
+        """Test that requests within the window are answered by one batched call, in order."""
+        agent = RecordingAgent()
+        batcher = AgentMicroBatcher(agent, max_delay=0.01)
+        batcher.start()
+        
+        responses = await asyncio.gather(*[
+            batcher.submit(f"user_{i}", f"message {i}") for i in range(3)
+        ])
+        await batcher.close()
+        
+        assert agent.batch_calls == [["user_0", "user_1", "user_2"]]
+        assert [r["response"] for r in responses] == ["batch:message 0", "batch:message 1", "batch:message 2"]
+    
+    @pytest.mark.asyncio
+    async def test_lone_request_uses_single_path(self):
+        """Test that a request alone in its window keeps the per-user path."""
+        agent = RecordingAgent()
+        batcher = AgentMicroBatcher(agent, max_delay=0.01)
+        batcher.start()
+        
+        response = await batcher.submit("user_1", "hello")
+        await batcher.close()
+        
+        assert agent.single_calls == ["user_1"]
+        assert agent.batch_calls == []
+        assert response["response"] == "single:hello"
+    
+    @pytest.mark.asyncio
+    async def test_full_batch_dispatches_before_window(self):
+        """Test that a full batch is sent without waiting for the window to close."""
+        agent = RecordingAgent(max_batch_size=2)
+        batcher = AgentMicroBatcher(agent, max_delay=60)
+        batcher.start()
+        
+        await asyncio.wait_for(asyncio.gather(
+            batcher.submit("user_1", "a"),
+            batcher.submit("user_2", "b")
+        ), timeout=1)
+        await batcher.close()
+        
+        assert agent.batch_calls == [["user_1", "user_2"]]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the monitoring utilities.
+"""
+from utils.monitoring import APIMetrics, SystemMonitor
+
+class TestSystemMetricsSnapshot:
+    """Test reuse of system metric snapshots between polls."""
+    
+    def test_snapshot_reused_within_ttl(self):
+        """Test that polls inside the TTL return the same snapshot."""
+        monitor = SystemMonitor()
+        
+        assert monitor.get_system_metrics() is monitor.get_system_metrics()
+    
+    def test_snapshot_refreshed_after_ttl(self):
+        """Test that an expired snapshot is collected again."""
+        monitor = SystemMonitor()
+        monitor.metrics_ttl = 0
+        first = monitor.get_system_metrics()
+        monitor.record_request()
+        
+        assert monitor.get_system_metrics()["api"]["total_requests"] == first["api"]["total_requests"] + 1
+
+class TestPrometheusMetrics:
+    """Test the Prometheus text rendering of API metrics."""
+    
+    def test_endpoint_counters(self):
+        """Test that calls, errors and timings are rendered per endpoint."""
+        metrics = APIMetrics()
+        metrics.record_endpoint_call("/agents/agent_alpha/chat", 0.25, 200)
+        metrics.record_endpoint_call("/agents/agent_alpha/chat", 0.75, 500)
+        
+        body = metrics.render_prometheus().decode()
+        
+        assert 'futmatrix_endpoint_requests_total{endpoint="/agents/agent_alpha/chat"} 2' in body
+        assert 'futmatrix_endpoint_errors_total{endpoint="/agents/agent_alpha/chat"} 1' in body
+        assert 'futmatrix_endpoint_response_seconds_sum{endpoint="/agents/agent_alpha/chat"} 1.0' in body
+        assert body.endswith("\n")
+    
+    def test_label_values_escaped(self):
+        """Test that quotes in endpoint names cannot break the exposition format."""
+        metrics = APIMetrics()
+        metrics.record_endpoint_call('/agents/"x"/chat', 0.1, 200)
+        
+        body = metrics.render_prometheus().decode()
+        
+        assert 'endpoint="/agents/\\"x\\"/chat"' in body
+    
+    def test_system_monitor_counters(self):
+        """Test that the monitor's request and error totals are included when given."""
+        monitor = SystemMonitor()
+        monitor.record_request()
+        monitor.record_error()
+        
+        body = APIMetrics().render_prometheus(monitor).decode()
+        
+        assert "futmatrix_requests_total 1" in body
+        assert "futmatrix_errors_total 1" in body
@@ -3,7 +3,7 @@
 Unit tests for personality system.
 """
 import pytest
-from agents.personalities import PersonalityManager
+from agents.personalities import Personality, PersonalityManager, _IVARS
 
 class TestPersonalities:
     """Test personality management functionality."""
@@ -72,4 +72,66 @@ class TestPersonalities:
         for personality_name in ["analytical", "creative", "helpful", "professional"]:
             personality = personality_manager.get_personality(personality_name)
             assert "response_template" in personality
-            assert personality["response_template"] is not None
\ No newline at end of file
+            assert personality["response_template"] is not None
+    
+    def test_response_templates_are_dedented(self, personality_manager):
+        """Test that templates carry no source indentation or surrounding blank lines."""
+        for personality_name in personality_manager.list_personalities():
+            template = personality_manager.get_response_template(personality_name)
+            rendered = template.format(
+                user_prompt="Request",
+                rag_results="Results",
+                user_history="History",
+                business_result="Business"
+            )
+            
+            assert rendered == rendered.strip()
+            assert "Request" in rendered
+            assert not any(line.startswith(" ") for line in rendered.splitlines())
+    
+    def test_response_templates_share_input_variables(self, personality_manager):
+        """Test that every template renders from the same fixed set of inputs."""
+        for personality_name in personality_manager.list_personalities():
+            template = personality_manager.get_response_template(personality_name)
+            assert sorted(template.input_variables) == sorted(_IVARS)
+    
+    def test_split_templates_separate_static_prefix(self, personality_manager):
+        """Test that the system prefix is static and the user template holds every input."""
+        for personality_name in personality_manager.list_personalities():
+            system_prompt = personality_manager.get_system_prompt(personality_name)
+            user_template = personality_manager.get_user_template(personality_name)
+            
+            assert system_prompt
+            assert not any(f"{{{name}}}" in system_prompt for name in _IVARS)
+            assert all(f"{{{name}}}" in user_template for name in _IVARS)
+    
+    def test_fast_template_tolerates_braces_in_inputs(self, personality_manager):
+        """Test that brace-laden inputs such as JSON render without format errors."""
+        template = personality_manager.get_response_template_fast("analytical")
+        rendered = template.format(
+            user_prompt="Compare {these}",
+            rag_results='some {weird} json {"a": 1}',
+            user_history=[],
+            business_result={}
+        )
+        
+        assert "USER REQUEST: Compare {these}" in rendered
+        assert 'some {weird} json {"a": 1}' in rendered
+    
+    def test_processing_notification_bytes_match_text(self, personality_manager):
+        """Test that encoded notifications match the text ones, including the fallback."""
+        for personality_name in personality_manager.list_personalities() + ["unknown"]:
+            text = personality_manager.get_processing_notification(personality_name)
+            assert personality_manager.get_processing_notification_bytes(personality_name) == text.encode("utf-8")
+    
+    def test_personality_record_matches_dict_view(self, personality_manager):
+        """Test that the compact record and the dict-shaped personality agree."""
+        record = personality_manager.get_personality_record("coaching")
+        personality = personality_manager.get_personality("coaching")
+        
+        assert isinstance(record, Personality)
+        assert record.tone == personality["tone"]
+        assert record.traits == personality["traits"]
+        assert record.processing_notification == personality_manager.get_processing_notification("coaching")
+        with pytest.raises(ValueError):
+            personality_manager.get_personality_record("invalid_personality")
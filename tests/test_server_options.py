@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the uvicorn runtime options.
+"""
+import asyncio
+from utils.server_options import lifespan_from, uvicorn_options, uvicorn_workers
+
+class TestUvicornOptions:
+    """Test the options and worker count passed to uvicorn."""
+    
+    def test_shared_options_set_no_connection_limit(self):
+        """Test that WebSocket-serving entry points are not capped by the shared options."""
+        options = uvicorn_options()
+        
+        assert "limit_concurrency" not in options
+        assert "timeout_keep_alive" not in options
+    
+    def test_single_worker_by_default(self, monkeypatch):
+        """Test that one worker runs unless a worker count is configured."""
+        monkeypatch.delenv("UVICORN_WORKERS", raising=False)
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+        
+        assert uvicorn_workers() == 1
+    
+    def test_workers_prefer_uvicorn_workers(self, monkeypatch):
+        """Test that UVICORN_WORKERS takes precedence over WEB_CONCURRENCY."""
+        monkeypatch.setenv("WEB_CONCURRENCY", "2")
+        assert uvicorn_workers() == 2
+        
+        monkeypatch.setenv("UVICORN_WORKERS", "4")
+        assert uvicorn_workers() == 4
+
+
+class TestLifespanFrom:
+    """Test the lifespan built from startup and shutdown coroutines."""
+    
+    def test_runs_startup_before_and_shutdown_after(self):
+        """Test that shutdown still runs when serving ends with an error."""
+        calls = []
+        
+        async def startup():
+            calls.append("startup")
+        
+        async def shutdown():
+            calls.append("shutdown")
+        
+        async def serve():
+            async with lifespan_from(startup, shutdown)(None):
+                calls.append("serving")
+                raise RuntimeError("server stopped")
+        
+        try:
+            asyncio.run(serve())
+        except RuntimeError:
+            pass
+        
+        assert calls == ["startup", "serving", "shutdown"]
@@ -0,0 +1,95 @@
+"""
+In-memory caching utilities for the AI agents system.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed time-to-live."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value, or default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches predicate and return how many were removed."""
+        matched = [key for key in self._entries if predicate(key)]
+        for key in matched:
+            del self._entries[key]
+        return len(matched)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hashable items.
+    
+    Membership tests can return false positives but never false negatives, until
+    the filter resets itself after capacity additions so the false positive rate
+    stays bounded in a long-running process. Item hashes come from the built-in
+    hash(), so results are only valid in-process.
+    """
+    
+    def __init__(self, size_bits: int = 1 << 20, num_hashes: int = 4, capacity: int = 100_000):
+        self.size_bits = size_bits
+        self.num_hashes = num_hashes
+        self.capacity = capacity  # About 1% false positives at the default size
+        self._bits = bytearray((size_bits + 7) // 8)
+        self._count = 0
+    
+    def _positions(self, item: Hashable):
+        """Derive bit positions by double hashing a single hash() value."""
+        h1 = hash(item) & 0xFFFFFFFFFFFFFFFF
+        h2 = (h1 >> 32) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size_bits
+    
+    def add(self, item: Hashable) -> None:
+        """Record an item, first resetting the filter if it already holds capacity items."""
+        if self._count >= self.capacity:
+            self.clear()
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+    
+    def clear(self) -> None:
+        """Forget every item."""
+        self._bits = bytearray(len(self._bits))
+        self._count = 0
+    
+    def __contains__(self, item: Hashable) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
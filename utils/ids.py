@@ -0,0 +1,29 @@
+"""
+Identifier helpers for the AI agents system.
+"""
+import os
+import uuid
+from collections import deque
+
+# Random UUIDs drawn per os.urandom() call when the pool runs dry
+_BATCH_SIZE = 1024
+
+_pool: "deque[str]" = deque()
+
+
+def _refill() -> None:
+    """Generate a batch of version-4 UUID strings from a single urandom read."""
+    raw = os.urandom(16 * _BATCH_SIZE)
+    _pool.extend(
+        str(uuid.UUID(bytes=raw[offset:offset + 16], version=4))
+        for offset in range(0, len(raw), 16)
+    )
+
+
+def uuid4_str() -> str:
+    """Return a random UUID string formatted like str(uuid.uuid4())."""
+    try:
+        return _pool.popleft()
+    except IndexError:
+        _refill()
+        return _pool.popleft()
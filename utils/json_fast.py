@@ -0,0 +1,64 @@
+"""
+Fast JSON helpers for the AI agents system.
+
+Uses orjson when it is installed and falls back to the standard library otherwise;
+both produce compact, UTF-8 output for JSON-native values. orjson also encodes
+datetime, UUID, dataclass and enum values natively, which the standard library
+fallback rejects with TypeError, so convert those before serializing.
+"""
+import json
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    # Response class for the API servers; stdlib-backed JSONResponse without orjson
+    FastJSONResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+except ImportError:  # FastAPI is only needed by the API servers
+    FastJSONResponse = None
+
+
+def _default(obj: Any) -> Any:
+    """Raise the standard library's TypeError for objects orjson cannot encode."""
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes (two-space indented if requested).
+    
+    Non-string dict keys are converted to strings, as the standard library does.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def dumps_str(obj: Any, indent: bool = False) -> str:
+    """Serialize obj to a JSON string."""
+    return dumps(obj, indent).decode()
+
+
+def timestamped_prefix(payload: Dict[str, Any]) -> bytes:
+    """Serialize payload up to an open trailing "timestamp" value, for stamp()."""
+    body = dumps(payload)[:-1]
+    return body + (b',"timestamp":"' if payload else b'"timestamp":"')
+
+
+def stamp(prefix: bytes, timestamp: str) -> bytes:
+    """Complete a timestamped_prefix() body with the given timestamp."""
+    return prefix + timestamp.encode() + b'"}'
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Deserialize JSON from a string or bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,18 +1,43 @@
 """
 Logging utilities for the AI agents system.
 """
+import atexit
 import logging
+import queue
+import random
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from datetime import datetime
 import os
 
+# Fraction of sampled request-path INFO/DEBUG records that are emitted
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+
+# Background listener writing root log records to the console, see setup_logger
+_root_listener: Optional[QueueListener] = None
+
+class SampledLogFilter(logging.Filter):
+    """Pass every WARNING and above, and a random fraction of lower-level records."""
+    
+    def __init__(self, rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
 def setup_logger(
     name: Optional[str] = None,
     level: str = "INFO",
     format_string: Optional[str] = None
 ) -> logging.Logger:
-    """Setup logger with consistent formatting."""
+    """Setup logger with consistent formatting.
+    
+    The root logger (name=None) writes through a QueueHandler; a background
+    QueueListener does the console I/O so logging never blocks the event loop.
+    """
+    global _root_listener
     
     if not format_string:
         format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -37,7 +62,15 @@ def setup_logger(
     console_handler.setFormatter(formatter)
     
     # Add handler to logger
-    logger.addHandler(console_handler)
+    if name is None:
+        if _root_listener is not None:
+            _root_listener.stop()
+        log_queue = queue.SimpleQueue()
+        _root_listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+        _root_listener.start()
+        logger.addHandler(QueueHandler(log_queue))
+    else:
+        logger.addHandler(console_handler)
     
     # Prevent propagation to avoid duplicate logs
     logger.propagate = False
@@ -48,6 +81,23 @@ def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the specified name."""
     return logging.getLogger(name)
 
+def get_sampled_logger(name: str, rate: float = LOG_SAMPLE_RATE) -> logging.Logger:
+    """Get a logger for per-request success messages that emits only a sample of them.
+    
+    Warnings and errors logged through it are never dropped.
+    """
+    logger = logging.getLogger(name)
+    if not any(isinstance(f, SampledLogFilter) for f in logger.filters):
+        logger.addFilter(SampledLogFilter(rate))
+    return logger
+
+def _stop_root_listener() -> None:
+    """Flush queued records to the console at interpreter exit."""
+    if _root_listener is not None:
+        _root_listener.stop()
+
+atexit.register(_stop_root_listener)
+
 class AgentLogger:
     """Specialized logger for agent operations."""
     
@@ -3,9 +3,9 @@ Production Monitoring and Metrics for AI Agents System
 """
 import time
 import psutil
-from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
+from utils.time_utils import utcnow_iso
 
 class SystemMonitor:
     """Monitor system resources and API performance."""
@@ -15,6 +15,14 @@ class SystemMonitor:
         self.request_count = 0
         self.error_count = 0
         self.logger = logging.getLogger("system_monitor")
+        
+        # Health checks and stats polls share one snapshot per metrics_ttl seconds
+        self.metrics_ttl = 1.0
+        self._metrics_snapshot: Optional[Dict[str, Any]] = None
+        self._metrics_taken_at = float("-inf")  # time.monotonic() of the last snapshot
+        
+        # Non-blocking cpu_percent reports usage since the previous call; prime it here
+        psutil.cpu_percent(interval=None)
     
     def record_request(self) -> None:
         """Record a successful API request."""
@@ -25,7 +33,15 @@ class SystemMonitor:
         self.error_count += 1
     
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics."""
+        """Get system metrics, reusing the last snapshot if it is under metrics_ttl old."""
+        now = time.monotonic()
+        if now - self._metrics_taken_at >= self.metrics_ttl:
+            self._metrics_snapshot = self._collect_system_metrics()
+            self._metrics_taken_at = now
+        return self._metrics_snapshot
+    
+    def _collect_system_metrics(self) -> Dict[str, Any]:
+        """Read current system metrics from psutil."""
         current_time = time.time()
         uptime = current_time - self.start_time
         
@@ -33,7 +49,7 @@ class SystemMonitor:
             "system": {
                 "uptime_seconds": uptime,
                 "uptime_formatted": self._format_uptime(uptime),
-                "cpu_percent": psutil.cpu_percent(interval=1),
+                "cpu_percent": psutil.cpu_percent(interval=None),
                 "memory_percent": psutil.virtual_memory().percent,
                 "disk_percent": psutil.disk_usage('/').percent
             },
@@ -43,7 +59,7 @@ class SystemMonitor:
                 "error_rate": (self.error_count / max(self.request_count, 1)) * 100,
                 "requests_per_second": self.request_count / max(uptime, 1)
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utcnow_iso()
         }
     
     def _format_uptime(self, uptime_seconds: float) -> str:
@@ -108,5 +124,59 @@ class APIMetrics:
         """Get performance metrics for all endpoints."""
         return {
             "endpoints": self.endpoint_stats,
-            "timestamp": datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+            "timestamp": utcnow_iso()
+        }
+    
+    def render_prometheus(self, monitor: Optional[SystemMonitor] = None) -> bytes:
+        """Render counters in the Prometheus text exposition format.
+        
+        Lines are written straight from endpoint_stats; no intermediate dict is built.
+        """
+        lines = [
+            "# HELP futmatrix_endpoint_requests_total Requests handled per endpoint.",
+            "# TYPE futmatrix_endpoint_requests_total counter"
+        ]
+        lines.extend(
+            f'futmatrix_endpoint_requests_total{{endpoint="{_label(endpoint)}"}} {stats["total_calls"]}'
+            for endpoint, stats in self.endpoint_stats.items()
+        )
+        lines += [
+            "# HELP futmatrix_endpoint_errors_total Responses with status >= 400 per endpoint.",
+            "# TYPE futmatrix_endpoint_errors_total counter"
+        ]
+        lines.extend(
+            f'futmatrix_endpoint_errors_total{{endpoint="{_label(endpoint)}"}} {stats["error_count"]}'
+            for endpoint, stats in self.endpoint_stats.items()
+        )
+        lines += [
+            "# HELP futmatrix_endpoint_response_seconds Endpoint response time.",
+            "# TYPE futmatrix_endpoint_response_seconds summary"
+        ]
+        for endpoint, stats in self.endpoint_stats.items():
+            label = _label(endpoint)
+            lines.append(f'futmatrix_endpoint_response_seconds_sum{{endpoint="{label}"}} {stats["total_time"]}')
+            lines.append(f'futmatrix_endpoint_response_seconds_count{{endpoint="{label}"}} {stats["total_calls"]}')
+        
+        if monitor is not None:
+            lines += [
+                "# HELP futmatrix_requests_total Requests recorded by the system monitor.",
+                "# TYPE futmatrix_requests_total counter",
+                f"futmatrix_requests_total {monitor.request_count}",
+                "# HELP futmatrix_errors_total Errors recorded by the system monitor.",
+                "# TYPE futmatrix_errors_total counter",
+                f"futmatrix_errors_total {monitor.error_count}",
+                "# HELP futmatrix_uptime_seconds Seconds since the monitor started.",
+                "# TYPE futmatrix_uptime_seconds gauge",
+                f"futmatrix_uptime_seconds {time.time() - monitor.start_time}"
+            ]
+        
+        lines.append("")
+        return "\n".join(lines).encode()
+
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
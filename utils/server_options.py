@@ -0,0 +1,81 @@
+"""
+Uvicorn runtime options and shared app wiring for the AI agents API servers.
+"""
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, Awaitable, Callable, Coroutine, Dict
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
+
+# GZipMiddleware settings: compress JSON bodies over 500 bytes at a level that keeps
+# the per-response CPU cost low
+GZIP_OPTIONS = {"minimum_size": 500, "compresslevel": 5}
+
+
+def lifespan_from(
+    startup: Callable[[], Awaitable[Any]],
+    shutdown: Callable[[], Awaitable[Any]]
+) -> Callable[[Any], AsyncContextManager[None]]:
+    """Build a FastAPI lifespan that awaits startup before serving requests and shutdown after."""
+    @asynccontextmanager
+    async def lifespan(app: Any):
+        await startup()
+        try:
+            yield
+        finally:
+            await shutdown()
+    return lifespan
+
+
+def uvicorn_options() -> Dict[str, Any]:
+    """Select the libuv event loop and httptools parser when installed, else the pure-Python defaults.
+    
+    A fallback is logged as a warning so a deployment missing uvicorn[standard]
+    is visible instead of silently running the slower stack.
+    """
+    if not (UVLOOP_AVAILABLE and HTTPTOOLS_AVAILABLE):
+        missing = [name for name, available in (("uvloop", UVLOOP_AVAILABLE), ("httptools", HTTPTOOLS_AVAILABLE)) if not available]
+        logging.getLogger("server_options").warning(
+            "%s not installed; install uvicorn[standard] for the accelerated server", ", ".join(missing)
+        )
+    return {
+        "loop": "uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        "http": "httptools" if HTTPTOOLS_AVAILABLE else "h11",
+        "lifespan": "on",
+        # WebSocket frames are serialized once per message; deflate would recompress them per connection
+        "ws_per_message_deflate": False
+    }
+
+
+def uvicorn_workers() -> int:
+    """Number of uvicorn worker processes from UVICORN_WORKERS or WEB_CONCURRENCY.
+    
+    Defaults to 1: conversation history and monitoring counters live in process
+    memory, so each extra worker keeps its own copy. Raise it only behind a
+    proxy that pins a user to one worker.
+    """
+    return int(os.getenv("UVICORN_WORKERS", os.getenv("WEB_CONCURRENCY", "1")))
+
+
+def run_event_loop(main: Coroutine[Any, Any, Any]) -> Any:
+    """Run an entry-point coroutine on uvloop when installed, else on the default asyncio loop.
+    
+    Servers started with uvicorn.Server.serve() inside this loop inherit it, so
+    the loop option from uvicorn_options() only applies to uvicorn.run().
+    """
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(main)
+    return asyncio.run(main)
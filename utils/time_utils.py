@@ -0,0 +1,27 @@
+"""
+Time helpers for the AI agents system.
+"""
+import time
+from typing import Tuple
+
+# (whole second, "YYYY-MM-DDTHH:MM:SS" prefix) from the last call
+_second_cache: Tuple[int, str] = (-1, "")
+
+
+def utcnow_iso() -> str:
+    """Return the current UTC time formatted like datetime.utcnow().isoformat().
+    
+    The date/time prefix is formatted at most once per second; within the same
+    second only the microseconds are appended.
+    """
+    global _second_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _second_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _second_cache = (second, prefix)
+    microsecond = int((now - second) * 1_000_000)
+    if microsecond:
+        return f"{prefix}.{microsecond:06d}"
+    return prefix